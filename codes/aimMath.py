@@ -0,0 +1,81 @@
+import math
+import numpy as np
+
+# 旋转角度表的分度数，一圈分为3600份（0.1度）
+ANGLE_TABLE_SIZE = 3600
+
+def createRotationTable(size):
+    """
+        创建旋转矩阵表，第k项为旋转k/size圈的矩阵
+
+        Parameters
+        ----------
+        size : int
+            一圈的分度数
+    """
+    theta = 2 * np.pi * np.arange(size) / size
+    c = np.cos(theta)
+    s = np.sin(theta)
+    return np.stack([np.stack([c, s], axis=1), np.stack([-s, c], axis=1)], axis=1)
+
+# 预先算好的旋转矩阵表，行向量右乘即得旋转后的向量
+rotationTable = createRotationTable(ANGLE_TABLE_SIZE)
+
+def rotationMatrix(turn):
+    """
+        从角度表中查出旋转矩阵
+
+        Parameters
+        ----------
+        turn : float
+            旋转的圈数，正方向与角度增大的方向一致（屏幕坐标系中为顺时针）
+
+        Returns
+        -------
+        matrix : float[2][2]
+            旋转矩阵，velocity @ matrix 即为旋转后的速度
+    """
+    return rotationTable[int(round(turn * ANGLE_TABLE_SIZE)) % ANGLE_TABLE_SIZE]
+
+def aimDirection(origin, target):
+    """
+        单个点指向目标的单位向量，两点重合时返回零向量
+
+        Parameters
+        ----------
+        origin : float[2]
+            起点
+        target : float[2]
+            目标
+
+        Returns
+        -------
+        (ux, uy) : (float, float)
+            单位方向向量
+    """
+    dX = float(target[0]) - float(origin[0])
+    dY = float(target[1]) - float(origin[1])
+    L = math.sqrt(dX * dX + dY * dY)
+    if(L == 0):
+        return (0.0, 0.0)
+    return (dX / L, dY / L)
+
+def aimDirections(origin, target):
+    """
+        一批点指向同一目标的单位向量，整块数组计算，与目标重合的点得到零向量
+
+        Parameters
+        ----------
+        origin : float[n][2]
+            各起点
+        target : float[2]
+            目标
+
+        Returns
+        -------
+        direction : float[n][2]
+            单位方向向量
+    """
+    delta = np.asarray(target, dtype=float) - origin
+    L = np.sqrt(np.einsum("ij,ij->i", delta, delta))[:, None]
+    return np.divide(delta, L, out=np.zeros_like(delta), where=L > 0)
@@ -0,0 +1,60 @@
+import random
+
+class AliasTable:
+    """
+        别名表（Vose alias method），按权重抽取下标，建表O(n)，每次抽取O(1)且只消耗一个随机数
+
+        表中每一格对应一个下标，格内以概率prob[i]取i本身，否则取alias[i]
+
+        Attributes
+        ----------
+        weights : float[]
+            各下标的权重
+        prob : float[]
+            各格取本身的概率
+        alias : int[]
+            各格的别名
+    """
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        if(n == 0 or total <= 0):
+            raise ValueError("alias table needs at least one positive weight")
+        self.weights = list(weights)
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+        # 把权重缩放到平均值为1，小于1的格子用大于1的格子补满
+        scaled = [eachWeight * n / total for eachWeight in weights]
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while(small and large):
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+            if(scaled[l] < 1):
+                small.append(l)
+            else:
+                large.append(l)
+        # 剩下的格子（包括浮点误差造成的）均取本身
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng=random) -> int:
+        """
+            按权重抽取一个下标
+
+            Parameters
+            ----------
+            rng : random.Random
+                随机数生成器
+        """
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        if(u - i < self.prob[i]):
+            return i
+        return self.alias[i]
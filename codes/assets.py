@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import time
+from bullet import bulletTypeRegistry
+from player import Player
+from surfaceCache import SurfaceCache
+from atlas import ATLAS_PATH, SpriteAtlas
+from enemy import *
+
+# 所有敌人类，显示时按类读取图像
+enemyClassList = [OneHpEnemy, DoubleWarrior, TripleShooter, BulletRainShooter, Sticker, Tracker, Windmiller, TieVader, StarDestroyer, Tie, DeathStar]
+
+def assetKeyList(itemClassList) -> list:
+    """
+        列出游戏中用到的全部图像，包括各子弹的爆炸序列
+
+        Parameters
+        ----------
+        itemClassList : class[]
+            会出现的道具类
+
+        Returns
+        -------
+        keyList : (string, float)[]
+            (素材路径, 拉伸比例)，与绘制时向图像缓存请求的参数保持一致
+    """
+    keyList = [(Player.srcImg, Player.scale)]
+    for eachType in bulletTypeRegistry:
+        keyList += [(eachImgSrc, eachType.scale) for eachImgSrc in eachType.explosionImgSeq]
+    keyList += [(eachClass.srcImg, eachClass.scale) for eachClass in enemyClassList]
+    keyList += [(eachClass.srcImg, 1) for eachClass in itemClassList]
+    # 信息面板中的血条和玩家图标
+    keyList += [("img/hpBar.png", (1.2, 1)), (Player.srcImg, 2)]
+    # 去掉重复项，保持顺序
+    return list(dict.fromkeys(keyList))
+
+class AssetLoader:
+    """
+        启动时预先读取全部图像，放入图像缓存
+        优先从预先打包的图集中取出，图集中没有或已过期的图像再读取PNG：
+        解码和缩放在线程池中并行进行，像素格式转换需要窗口，在主线程中逐个进行
+
+        Attributes
+        ----------
+        surfaceCache : SurfaceCache
+            读取好的图像放入的缓存
+        maxWorkers : int
+            线程池的线程数
+        atlasPath : string
+            图集文件，为None或文件不存在时全部读取PNG
+        atlas : SpriteAtlas
+            已映射的图集，取出的图像引用它的内存，需要一直保留
+        totalTime : float
+            上一次预读取的总耗时，单位：ms
+        atlasCount : int
+            上一次预读取中来自图集的图像数量
+    """
+    def __init__(self, surfaceCache, maxWorkers=None, atlasPath=ATLAS_PATH):
+        self.surfaceCache = surfaceCache
+        self.maxWorkers = maxWorkers if maxWorkers is not None else min(8, (os.cpu_count() or 1) + 4)
+        self.atlasPath = atlasPath
+        self.atlas = None
+        self.totalTime = 0
+        self.atlasCount = 0
+
+    @staticmethod
+    def decode(key):
+        """
+            在工作线程中解码并缩放一张图像
+
+            Parameters
+            ----------
+            key : (string, float)
+                (素材路径, 拉伸比例)
+
+            Returns
+            -------
+            (img, decodeTime) : (Surface, float)
+                缩放后的图像和解码耗时，单位：ms
+        """
+        startTime = time.perf_counter()
+        img = SurfaceCache.decode(key[0], key[1])
+        return (img, (time.perf_counter() - startTime) * 1e3)
+
+    def preload(self, keyList) -> dict:
+        """
+            并行读取图像并转换为窗口的像素格式，已在缓存中的图像跳过
+
+            Parameters
+            ----------
+            keyList : (string, float)[]
+                (素材路径, 拉伸比例)
+
+            Returns
+            -------
+            loadTimes : dict
+                {(素材路径, 拉伸比例) : 读取耗时}，单位：ms，包括解码、缩放和像素格式转换
+        """
+        startTime = time.perf_counter()
+        keyList = [eachKey for eachKey in keyList if eachKey not in self.surfaceCache.surfaces]
+        loadTimes = {}
+        # 先从图集中取
+        if(self.atlas is None and self.atlasPath is not None and os.path.exists(self.atlasPath)):
+            self.atlas = SpriteAtlas(self.atlasPath)
+        self.atlasCount = 0
+        if(self.atlas is not None):
+            for eachKey in [eachKey for eachKey in keyList if eachKey in self.atlas]:
+                eachStartTime = time.perf_counter()
+                self.surfaceCache.put(eachKey, self.atlas.get(eachKey))
+                loadTimes[eachKey] = (time.perf_counter() - eachStartTime) * 1e3
+                self.atlasCount += 1
+            keyList = [eachKey for eachKey in keyList if eachKey not in loadTimes]
+        # 其余的读取PNG
+        with ThreadPoolExecutor(self.maxWorkers) as executor:
+            for (eachKey, (eachImg, eachDecodeTime)) in zip(keyList, executor.map(AssetLoader.decode, keyList)):
+                convertStartTime = time.perf_counter()
+                eachImg = SurfaceCache.convert(eachImg)
+                loadTimes[eachKey] = eachDecodeTime + (time.perf_counter() - convertStartTime) * 1e3
+                self.surfaceCache.put(eachKey, eachImg)
+        self.surfaceCache.loadTimes.update(loadTimes)
+        self.totalTime = (time.perf_counter() - startTime) * 1e3
+        return loadTimes
+
+    def report(self, loadTimes) -> str:
+        """
+            按耗时从高到低列出各图像的读取耗时
+
+            Parameters
+            ----------
+            loadTimes : dict
+                preload的返回值
+        """
+        lineList = ["%d assets loaded in %.1f ms (%d from atlas, %d threads)" % (len(loadTimes), self.totalTime, self.atlasCount, self.maxWorkers)]
+        for (eachKey, eachTime) in sorted(loadTimes.items(), key=lambda x: -x[1]):
+            lineList.append("%8.2f ms  %s x%s" % (eachTime, eachKey[0], eachKey[1]))
+        return "\n".join(lineList)
@@ -0,0 +1,180 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+import pygame
+from surfaceCache import SurfaceCache
+
+# 图集文件的默认路径，由本模块离线生成
+ATLAS_PATH = "./img/atlas.bin"
+# 文件头：标识和索引长度
+ATLAS_MAGIC = b"SKYATLS1"
+ATLAS_HEADER = struct.Struct("<8sI")
+# 像素按字节顺序B、G、R、A存放，与常见的32位窗口格式一致，贴图时无需转换
+ATLAS_PIXEL_FORMAT = "BGRA"
+ATLAS_MASKS = (0xff0000, 0xff00, 0xff, 0xff000000)
+
+def sourceStamp(imgSrc) -> list:
+    """
+        素材文件的修改时间和大小，用于判断图集中的图像是否过期
+
+        Parameters
+        ----------
+        imgSrc : string
+            素材图像名
+    """
+    stat = os.stat(imgSrc)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def packShelves(sizeList, width) -> list:
+    """
+        按行（货架）排布矩形，先放高的，每行放满后另起一行
+
+        Parameters
+        ----------
+        sizeList : int[2][]
+            各矩形的宽高
+        width : int
+            图集宽度，不小于最宽的矩形
+
+        Returns
+        -------
+        posList : int[2][]
+            各矩形左上角的位置，与sizeList的顺序一致
+        height : int
+            图集高度
+    """
+    posList = [None] * len(sizeList)
+    (x, y, shelfHeight) = (0, 0, 0)
+    for i in sorted(range(len(sizeList)), key=lambda i: -sizeList[i][1]):
+        (w, h) = sizeList[i]
+        if(x + w > width):
+            (x, y, shelfHeight) = (0, y + shelfHeight, 0)
+        posList[i] = (x, y)
+        x += w
+        shelfHeight = max(shelfHeight, h)
+    return (posList, y + shelfHeight)
+
+def buildAtlas(keyList, path=ATLAS_PATH, width=1024) -> dict:
+    """
+        把各图像缩放好后拼成一张图集，连同索引写入文件
+
+        文件格式：ATLAS_HEADER（标识、索引长度），JSON索引，补齐到4字节，
+        然后是整张图集的原始像素（ATLAS_PIXEL_FORMAT，逐行无间隔）
+
+        Parameters
+        ----------
+        keyList : (string, float)[]
+            (素材路径, 拉伸比例)
+        path : string
+            输出文件
+        width : int
+            图集宽度，遇到更宽的图像时自动加宽
+
+        Returns
+        -------
+        index : dict
+            写入文件的索引
+    """
+    imgList = [SurfaceCache.decode(eachSrc, eachScale) for (eachSrc, eachScale) in keyList]
+    sizeList = [eachImg.get_size() for eachImg in imgList]
+    width = max([width] + [eachSize[0] for eachSize in sizeList])
+    (posList, height) = packShelves(sizeList, width)
+    sheet = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+    sheet.fill((0, 0, 0, 0))
+    entryList = []
+    for ((eachSrc, eachScale), eachImg, eachPos, eachSize) in zip(keyList, imgList, posList, sizeList):
+        sheet.blit(eachImg, eachPos)
+        entryList.append({"src" : eachSrc, "scale" : eachScale, "rect" : list(eachPos) + list(eachSize), "source" : sourceStamp(eachSrc)})
+    index = {"width" : width, "height" : height, "pixelFormat" : ATLAS_PIXEL_FORMAT, "entries" : entryList}
+    indexBytes = json.dumps(index).encode()
+    indexBytes += b" " * (-(ATLAS_HEADER.size + len(indexBytes)) % 4)
+    with open(path, "wb") as f:
+        f.write(ATLAS_HEADER.pack(ATLAS_MAGIC, len(indexBytes)))
+        f.write(indexBytes)
+        f.write(pygame.image.tobytes(sheet, ATLAS_PIXEL_FORMAT))
+    return index
+
+class SpriteAtlas:
+    """
+        内存映射的图集文件，各图像是整张图集的子图，按需从磁盘分页读入，不需要解码
+
+        Attributes
+        ----------
+        path : string
+            图集文件
+        file : file
+            打开的图集文件
+        buffer : mmap
+            整个文件的只读映射
+        sheet : Surface
+            直接引用映射内存的整张图集
+        rectDict : dict
+            {(素材路径, 拉伸比例) : 在图集中的区域}，只包含素材文件未修改过的图像
+        needConvert : bool
+            窗口像素格式与图集不一致时，取出的子图需要再转换一次
+    """
+    def __init__(self, path=ATLAS_PATH):
+        self.path = path
+        self.file = open(path, "rb")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, indexLength) = ATLAS_HEADER.unpack_from(self.buffer)
+        if(magic != ATLAS_MAGIC):
+            self.close()
+            raise ValueError("%s不是图集文件" % path)
+        index = json.loads(bytes(self.buffer[ATLAS_HEADER.size : ATLAS_HEADER.size + indexLength]))
+        offset = ATLAS_HEADER.size + indexLength
+        self.sheet = pygame.image.frombuffer(memoryview(self.buffer)[offset:], (index["width"], index["height"]), index["pixelFormat"])
+        self.rectDict = {}
+        for eachEntry in index["entries"]:
+            if(not os.path.exists(eachEntry["src"]) or sourceStamp(eachEntry["src"]) != eachEntry["source"]):
+                continue
+            eachScale = tuple(eachEntry["scale"]) if isinstance(eachEntry["scale"], list) else eachEntry["scale"]
+            self.rectDict[(eachEntry["src"], eachScale)] = pygame.Rect(eachEntry["rect"])
+        display = pygame.display.get_surface()
+        self.needConvert = display is not None and display.get_masks()[:3] != ATLAS_MASKS[:3]
+
+    def __contains__(self, key):
+        return key in self.rectDict
+
+    def get(self, key):
+        """
+            取出图像
+
+            Parameters
+            ----------
+            key : (string, float)
+                (素材路径, 拉伸比例)
+
+            Returns
+            -------
+            img : Surface
+                图集的子图，与图集共享像素，不可修改
+        """
+        img = self.sheet.subsurface(self.rectDict[key])
+        if(self.needConvert):
+            img = SurfaceCache.convert(img)
+        return img
+
+    def close(self):
+        """
+            关闭文件，之后不能再使用取出的图像
+        """
+        self.sheet = None
+        self.buffer.close()
+        self.file.close()
+
+if __name__ == "__main__":
+    from assets import assetKeyList
+    from stage import Stage
+
+    parser = argparse.ArgumentParser(description="把全部图像缩放后打包成一个图集文件，游戏启动时直接映射读取")
+    parser.add_argument("--output", default=ATLAS_PATH, help="输出的图集文件，默认%s" % ATLAS_PATH)
+    parser.add_argument("--width", type=int, default=1024, help="图集宽度")
+    args = parser.parse_args()
+
+    startTime = time.perf_counter()
+    index = buildAtlas(assetKeyList(Stage().itemClassList), args.output, args.width)
+    print("%d images packed into %dx%d, %s (%.0f KiB) in %.1f ms" % (len(index["entries"]), index["width"], index["height"], args.output, os.path.getsize(args.output) / 1024, (time.perf_counter() - startTime) * 1e3))
@@ -0,0 +1,154 @@
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+import numpy as np
+from stage import Stage, BalanceConfig
+from headless import HeadlessRunner, AutoPilot, STEP_SCALE_CHOICES
+
+def runGame(job) -> dict:
+    """
+        无窗口运行一局游戏，在子进程中执行
+
+        Parameters
+        ----------
+        job : (dict, int, float, int)
+            (数值平衡参数, 随机数种子, 最长游戏时间（分钟）, 时间步长放大的倍数)
+
+        Returns
+        -------
+        row : dict
+            这一局的统计结果
+    """
+    (params, seed, minutes, stepScale) = job
+    stage = Stage(seed, BalanceConfig(**params))
+    stage.frameInterv *= stepScale
+    result = HeadlessRunner(stage, AutoPilot()).run(minutes * 60e3)
+    return {
+        "params" : params,
+        "seed" : seed,
+        "survivalTime" : result["gameTime"] / 1e3,
+        "isGameOver" : result["isGameOver"],
+        "score" : result["score"],
+        "level" : result["level"],
+        "bossKills" : [(bossName, gameTime / 1e3, fightTime / 1e3) for (bossName, gameTime, fightTime) in stage.bossKillList],
+        "pickups" : dict(stage.itemPickupCount),
+    }
+
+def runBatch(paramSetList, seedList, minutes, processes=None, stepScale=1) -> list:
+    """
+        在进程池中并行运行每个参数组合和每个种子的游戏
+
+        Parameters
+        ----------
+        paramSetList : dict[]
+            数值平衡参数的各个组合
+        seedList : int[]
+            随机数种子
+        minutes : float
+            每局最长的游戏时间，单位：分钟
+        processes : int
+            进程数，为None时使用全部CPU核
+        stepScale : int
+            时间步长放大的倍数，步长越大模拟越快，只能取STEP_SCALE_CHOICES中的值
+
+        Returns
+        -------
+        rowList : dict[]
+            每一局的统计结果，按参数组合和种子的顺序排列
+    """
+    if(stepScale not in STEP_SCALE_CHOICES):
+        raise ValueError("stepScale must be one of %s, got %r" % (STEP_SCALE_CHOICES, stepScale))
+    jobList = [(params, seed, minutes, stepScale) for params in paramSetList for seed in seedList]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(runGame, jobList, chunksize=1)
+
+def aggregate(rowList) -> list:
+    """
+        按参数组合汇总各局的统计结果
+
+        Parameters
+        ----------
+        rowList : dict[]
+            runBatch的结果
+
+        Returns
+        -------
+        table : dict[]
+            每个参数组合一行：局数、存活率、平均存活时间、平均得分、平均level、各BOSS的平均击败时间和击败率、各道具的平均拾取次数
+    """
+    groupDict = {}
+    for eachRow in rowList:
+        key = json.dumps(eachRow["params"], sort_keys=True)
+        groupDict.setdefault(key, []).append(eachRow)
+    bossNameList = sorted({bossName for eachRow in rowList for (bossName, gameTime, fightTime) in eachRow["bossKills"]})
+    itemNameList = sorted({itemName for eachRow in rowList for itemName in eachRow["pickups"]})
+    table = []
+    for groupRowList in groupDict.values():
+        n = len(groupRowList)
+        line = dict(groupRowList[0]["params"])
+        line["games"] = n
+        line["survivalRate"] = sum([not eachRow["isGameOver"] for eachRow in groupRowList]) / n
+        line["meanSurvivalTime"] = float(np.mean([eachRow["survivalTime"] for eachRow in groupRowList]))
+        line["meanScore"] = float(np.mean([eachRow["score"] for eachRow in groupRowList]))
+        line["meanLevel"] = float(np.mean([eachRow["level"] for eachRow in groupRowList]))
+        for bossName in bossNameList:
+            killTimeList = [gameTime for eachRow in groupRowList for (eachBossName, gameTime, fightTime) in eachRow["bossKills"] if eachBossName == bossName]
+            line[bossName + "KillRate"] = len(killTimeList) / n
+            line[bossName + "KillTime"] = float(np.mean(killTimeList)) if killTimeList else None
+        for itemName in itemNameList:
+            line[itemName + "Pickups"] = float(np.mean([eachRow["pickups"].get(itemName, 0) for eachRow in groupRowList]))
+        table.append(line)
+    return table
+
+def parseSweep(paramArgList) -> list:
+    """
+        把命令行中的name=v1,v2,...解析为所有参数组合（笛卡尔积）
+
+        Parameters
+        ----------
+        paramArgList : string[]
+            命令行参数
+    """
+    nameList = []
+    valueListList = []
+    for eachArg in paramArgList:
+        (name, valueStr) = eachArg.split("=", 1)
+        BalanceConfig(**{name : float(valueStr.split(",")[0])}) # 检查参数名
+        nameList.append(name)
+        valueListList.append([float(eachValue) for eachValue in valueStr.split(",")])
+    return [dict(zip(nameList, valueList)) for valueList in itertools.product(*valueListList)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="多进程批量模拟，用于调整数值平衡参数")
+    parser.add_argument("--param", action="append", default=[], help="要扫描的参数，格式为name=v1,v2,...，可以多次指定，道具出现权重以道具类名为参数名")
+    parser.add_argument("--seeds", type=int, default=8, help="每个参数组合运行的局数（种子为0到seeds-1）")
+    parser.add_argument("--minutes", type=float, default=10, help="每局最长的游戏时间，单位：分钟")
+    parser.add_argument("--processes", type=int, default=None, help="进程数，默认使用全部CPU核")
+    parser.add_argument("--output", default=None, help="汇总表写入的CSV文件，默认输出到标准输出")
+    parser.add_argument("--raw", default=None, help="每一局的原始结果写入的JSON文件")
+    parser.add_argument("--stepScale", type=int, default=1, choices=STEP_SCALE_CHOICES, help="时间步长放大的倍数，耗时相应减少；子弹碰撞按相对运动的轨迹判定，开火和玩家移动仍按60Hz逐帧计算")
+    args = parser.parse_args()
+
+    paramSetList = parseSweep(args.param)
+    startTime = time.perf_counter()
+    rowList = runBatch(paramSetList, list(range(args.seeds)), args.minutes, args.processes, args.stepScale)
+    wallTime = time.perf_counter() - startTime
+    table = aggregate(rowList)
+    if(args.raw is not None):
+        with open(args.raw, "w") as f:
+            json.dump(rowList, f, indent=4)
+    fieldList = list(table[0].keys())
+    if(args.output is None):
+        writer = csv.DictWriter(sys.stdout, fieldList)
+        writer.writeheader()
+        writer.writerows(table)
+    else:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldList)
+            writer.writeheader()
+            writer.writerows(table)
+    print("%d games in %.1f s" % (len(rowList), wallTime), file=sys.stderr)
@@ -0,0 +1,187 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from stage import Stage
+from enemy import *
+from headless import AutoPilot
+from profiler import FrameProfiler
+from snapshot import loadSnapshotFile
+
+class Scenario:
+    """
+        基准测试场景，描述从什么状态开始、跑多少帧
+
+        Attributes
+        ----------
+        name : string
+            场景名
+        description : string
+            场景说明
+        startTime : float
+            开始时的游戏时间戳，单位：ms
+        ticks : int
+            默认模拟的帧数
+        bossClass : class
+            开始时直接放上场的BOSS，为None时按正常流程刷怪
+        bossPos : float[2]
+            BOSS的出场位置，与enemySpanConfig.json保持一致
+        level : int
+            开始时的level
+        playerUpgrade : bool
+            玩家是否已经拿到三炮口和爆能束（后期BOSS战的正常状态）
+        snapshotPath : string
+            从该存档开始，此时忽略上面的起始状态
+    """
+    def __init__(self, name, description, startTime, ticks, bossClass=None, bossPos=None, level=0, playerUpgrade=False, snapshotPath=None):
+        self.name = name
+        self.description = description
+        self.startTime = startTime
+        self.ticks = ticks
+        self.bossClass = bossClass
+        self.bossPos = bossPos
+        self.level = level
+        self.playerUpgrade = playerUpgrade
+        self.snapshotPath = snapshotPath
+
+    def createStage(self, seed=None) -> Stage:
+        """
+            创建处于场景起始状态的Stage，玩家无敌以保证能跑满帧数
+
+            Parameters
+            ----------
+            seed : int
+                随机数种子，从存档开始时使用存档中的随机数状态
+        """
+        if(self.snapshotPath is not None):
+            return loadSnapshotFile(self.snapshotPath)
+        stage = Stage(seed)
+        stage.timeStamp = self.startTime
+        stage.lastTimeStamp = self.startTime
+        stage.level = self.level
+        stage.player.hp = stage.player.hpMax = 1e12
+        if(self.playerUpgrade):
+            stage.player.addFirePos()
+            stage.player.addFirePos()
+            stage.player.hasBlaster = True
+        if(self.bossClass is not None):
+            stage.addEnemy(self.bossClass(list(self.bossPos), stage.rng))
+        return stage
+
+# 所有场景
+scenarioList = [
+    Scenario("earlyWaves", "开局的普通敌人波次", 0, 3000),
+    Scenario("windmillerSpiral", "风车的旋转弹幕", 240e3, 3000, Windmiller, [280, 100], level=4, playerUpgrade=True),
+    Scenario("starDestroyerTies", "歼星舰不断放出钛战机", 360e3, 3000, StarDestroyer, [200, 150], level=5, playerUpgrade=True),
+    Scenario("deathStarFight", "死星最终BOSS战", 420e3, 6000, DeathStar, [150, -150], level=6, playerUpgrade=True),
+]
+
+def runScenario(scenario, ticks=None, seed=0, trackMemory=False) -> dict:
+    """
+        运行一个场景，分阶段计时
+
+        Parameters
+        ----------
+        scenario : Scenario
+            场景
+        ticks : int
+            模拟的帧数，为None时使用场景的默认值
+        seed : int
+            随机数种子
+        trackMemory : bool
+            是否用tracemalloc统计内存峰值，并统计垃圾回收次数，开启后帧率会明显下降
+
+        Returns
+        -------
+        result : dict
+            帧率、各阶段耗时和实体数量
+    """
+    stage = scenario.createStage(seed)
+    if(trackMemory):
+        gc.collect()
+        gcCountBefore = [eachGen["collections"] for eachGen in gc.get_stats()]
+        tracemalloc.start()
+    inputPolicy = AutoPilot()
+    ticks = scenario.ticks if ticks is None else ticks
+    profiler = FrameProfiler(Stage.phaseList, capacity=ticks)
+    stage.profiler = profiler
+    clock = time.perf_counter
+    startTime = clock()
+    for i in range(ticks):
+        profiler.startFrame()
+        stage.tick(inputPolicy(stage))
+        profiler.endFrame(len(stage.bulletContainer), len(stage.enemyContainer), len(stage.itemContainer))
+    wallTime = clock() - startTime
+    if(trackMemory):
+        (memoryNow, memoryPeak) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        gcCount = [eachGen["collections"] - eachCount for (eachGen, eachCount) in zip(gc.get_stats(), gcCountBefore)]
+    phaseTime = profiler.times.sum(axis=0)
+    counts = profiler.counts
+    summary = profiler.summary()
+    result = {
+        "description" : scenario.description,
+        "seed" : seed,
+        "ticks" : ticks,
+        "wallTime" : wallTime,
+        "ticksPerSec" : ticks / wallTime,
+        "phases" : {name : {"total" : phaseTime[i], "perTickUs" : phaseTime[i] / ticks * 1e6, "share" : phaseTime[i] / phaseTime.sum(), "p50Us" : summary["phases"][name]["p50"] * 1e3, "p99Us" : summary["phases"][name]["p99"] * 1e3} for (i, name) in enumerate(Stage.phaseList)},
+        "entities" : {"maxBullets" : int(counts[:, 0].max()), "meanBullets" : float(counts[:, 0].mean()), "maxEnemies" : int(counts[:, 1].max()), "meanEnemies" : float(counts[:, 1].mean()), "maxItems" : int(counts[:, 2].max())},
+        "score" : float(stage.score),
+    }
+    if(trackMemory):
+        result["memory"] = {"peakKiB" : memoryPeak / 1024, "endKiB" : memoryNow / 1024, "gcCollections" : gcCount, "itemsCreated" : stage.itemFreeList.created, "itemsReused" : stage.itemFreeList.reused}
+    return result
+
+def runAll(names=None, ticks=None, seed=0, trackMemory=False) -> dict:
+    """
+        运行多个场景并汇总
+
+        Parameters
+        ----------
+        names : string[]
+            要运行的场景名，为None时运行全部
+        ticks : int
+            每个场景模拟的帧数，为None时使用各自的默认值
+        seed : int
+            随机数种子
+        trackMemory : bool
+            是否统计内存峰值和垃圾回收次数
+    """
+    report = {
+        "python" : platform.python_version(),
+        "numpy" : np.__version__,
+        "platform" : platform.platform(),
+        "scenarios" : {},
+    }
+    for eachScenario in scenarioList:
+        if(names is not None and eachScenario.name not in names):
+            continue
+        report["scenarios"][eachScenario.name] = runScenario(eachScenario, ticks, seed, trackMemory)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage模拟性能基准测试，结果以JSON输出")
+    parser.add_argument("scenario", nargs="*", help="要运行的场景：%s，默认全部" % ", ".join([eachScenario.name for eachScenario in scenarioList]))
+    parser.add_argument("--ticks", type=int, default=None, help="每个场景模拟的帧数")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    parser.add_argument("--output", default=None, help="结果写入的文件，默认输出到标准输出")
+    parser.add_argument("--snapshot", default=None, help="从存档开始运行，代替内置场景")
+    parser.add_argument("--memory", action="store_true", help="统计内存峰值和垃圾回收次数（帧率会明显下降）")
+    args = parser.parse_args()
+
+    if(args.snapshot is not None):
+        scenarioList = [Scenario("snapshot", "从存档%s开始" % args.snapshot, 0, 3000, snapshotPath=args.snapshot)]
+    report = runAll(args.scenario if args.scenario else None, args.ticks, args.seed, args.memory)
+    if(args.output is None):
+        json.dump(report, sys.stdout, indent=4)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+        for (name, result) in report["scenarios"].items():
+            print("%-20s %8.0f ticks/s" % (name, result["ticksPerSec"]))
@@ -1,18 +1,25 @@
 import os.path
 import os
+import numpy as np
 
 class BaseBullet:
     """
         子弹基类
 
+        子弹加入BulletPool后，其数值状态全部存放在子弹池的数组中，对象本身只是对应行的视图
+
         Attributes
         ----------
         pos : float[2]
             子弹当前位置
         velocity : float[2]
             子弹发射速度
+        typeId : int
+            子弹类型，为bulletTypeRegistry中的下标，图像、拉伸比例、发射人和爆炸动画序列均由类型决定
         srcImg : string
             图像素材所在路径
+        currentImg : string
+            当前帧应显示的图像路径
         scale : float
             拉伸比例
         atk : float
@@ -21,35 +28,154 @@ class BaseBullet:
             子弹发射人。P：玩家，E：敌人
         isExplosion : bool = False
             是否爆炸
-        explosionImgSeq : string[]
+        explosionImgSeq : string(tuple)
             子弹爆炸的动画序列
+        explosionFrame : int
+            当前所处的爆炸动画帧，0表示未爆炸
+        pool : BulletPool
+            子弹所在的子弹池，未加入时为None
+        handle : int
+            子弹在子弹池中的句柄，子弹池紧凑排列后不变
+        idx : int
+            子弹当前在子弹池中的行号，由句柄查得，已被删除时为-1
     """
-    def __init__(self, pos, velocity, srcImg):
-        self.pos = pos
-        self.velocity = velocity
-        self.srcImg = None
-        self.atk = 0
-        self.bulletOwner = None
-        self.isExplosion = False
-        self.explosionImgSeq = None
 
-    def move(self):
+    __slots__ = ("pool", "handle", "_pos", "_velocity", "_atk", "_explosionFrame")
+
+    typeId = None
+    bulletOwner = None
+
+    def __init__(self, pos, velocity):
+        self.pool = None
+        self.handle = None
+        self._pos = pos
+        self._velocity = velocity
+        self._atk = 0
+        self._explosionFrame = 0
+
+    @classmethod
+    def view(cls, pool, idx):
+        """
+            创建子弹池中某一行的视图，不经过构造函数
+
+            Parameters
+            ----------
+            pool : BulletPool
+                子弹池
+            idx : int
+                行号
+        """
+        bullet = cls.__new__(cls)
+        bullet.pool = pool
+        bullet.handle = int(pool.handle[idx])
+        return bullet
+
+    @property
+    def idx(self) -> int:
+        return self.pool.getRow(self.handle)
+
+    @property
+    def bulletType(self):
+        return bulletTypeRegistry[self.typeId]
+
+    @property
+    def explosionImgSeq(self):
+        return bulletTypeRegistry[self.typeId].explosionImgSeq
+
+    @property
+    def pos(self):
+        if(self.pool is None):
+            return self._pos
+        return self.pool.pos[self.idx]
+
+    @pos.setter
+    def pos(self, value):
+        if(self.pool is None):
+            self._pos = value
+        else:
+            self.pool.pos[self.idx] = value
+
+    @property
+    def velocity(self):
+        if(self.pool is None):
+            return self._velocity
+        return self.pool.velocity[self.idx]
+
+    @velocity.setter
+    def velocity(self, value):
+        if(self.pool is None):
+            self._velocity = value
+        else:
+            self.pool.velocity[self.idx] = value
+
+    @property
+    def atk(self):
+        if(self.pool is None):
+            return self._atk
+        return self.pool.atk[self.idx]
+
+    @atk.setter
+    def atk(self, value):
+        if(self.pool is None):
+            self._atk = value
+        else:
+            self.pool.atk[self.idx] = value
+
+    @property
+    def explosionFrame(self):
+        if(self.pool is None):
+            return self._explosionFrame
+        return int(self.pool.explosionFrame[self.idx])
+
+    @explosionFrame.setter
+    def explosionFrame(self, value):
+        if(self.pool is None):
+            self._explosionFrame = value
+        else:
+            self.pool.explosionFrame[self.idx] = value
+
+    @property
+    def isExplosion(self) -> bool:
+        return self.explosionFrame > 0
+
+    @property
+    def currentImg(self):
+        """
+            当前应显示的图像路径（未爆炸时为子弹本身的图像，爆炸时为对应的爆炸帧）
+        """
+        return self.explosionImgSeq[self.explosionFrame]
+
+    def move(self, dt):
         """
             子弹移动
+
+            Parameters
+            ----------
+            dt : float
+                时间步长，单位：s
         """
-        self.pos[0] += self.velocity[0]
-        self.pos[1] += self.velocity[1]
+        self.pos[0] += self.velocity[0] * dt
+        self.pos[1] += self.velocity[1] * dt
+
+    def explode(self):
+        """
+            子弹命中后进入爆炸状态，停止移动并切换到第一帧爆炸动画
+        """
+        if(self.pool is None):
+            self._velocity = [0, 0]
+            self._explosionFrame = 1
+        else:
+            self.pool.explode(self.idx)
 
     def nextExplosion(self) -> bool:
         """
             切换子弹爆炸的动画到下一个帧，如果未播放完，返回True，否则返回False
         """
-        imgIndex = self.explosionImgSeq.index(self.srcImg)
-        imgIndex += 1
+        imgIndex = self.explosionFrame + 1
         if(imgIndex == len(self.explosionImgSeq)):
             return False
         # 如果未播放完，则切换到下一帧
-        self.srcImg = self.explosionImgSeq[imgIndex]
+        self.explosionFrame = imgIndex
         return True
 
 class PlayerBullet(BaseBullet):
@@ -60,21 +186,13 @@ class PlayerBullet(BaseBullet):
         ----------
     """
 
+    __slots__ = ()
+
     srcImg = "img/playerBullet.png"
+    bulletOwner = 'P'
     scale = 1
     explosionImgSeqRoot = "img/playerBulletExplosionSeq"
 
-    def __init__(self, pos, velocity):
-        BaseBullet.__init__(self, pos, velocity, PlayerBullet.srcImg)
-        self.bulletOwner = 'P'
-        # 初始化子弹爆炸动画序列
-        self.explosionImgSeq = [self.srcImg]
-        explosionImgSeqList = os.listdir(PlayerBullet.explosionImgSeqRoot)
-        explosionImgSeqList.sort()
-        for eachImgName in explosionImgSeqList:
-            eachImgPath = os.path.join(PlayerBullet.explosionImgSeqRoot, eachImgName)
-            self.explosionImgSeq.append(eachImgPath)
-
 class NormalEnemyBullet(BaseBullet):
     """
         普通敌人发射的子弹
@@ -83,21 +201,13 @@ class NormalEnemyBullet(BaseBullet):
         ----------
     """
 
+    __slots__ = ()
+
     srcImg = "img/normalEnemyBullet.png"
+    bulletOwner = 'E'
     scale = 1
     explosionImgSeqRoot = "img/enemyBulletExplosionSeq"
 
-    def __init__(self, pos, velocity):
-        BaseBullet.__init__(self, pos, velocity, NormalEnemyBullet.srcImg)
-        self.bulletOwner = 'E'
-        # 初始化子弹爆炸动画序列
-        self.explosionImgSeq = [self.srcImg]
-        explosionImgSeqList = os.listdir(NormalEnemyBullet.explosionImgSeqRoot)
-        explosionImgSeqList.sort()
-        for eachImgName in explosionImgSeqList:
-            eachImgPath = os.path.join(NormalEnemyBullet.explosionImgSeqRoot, eachImgName)
-            self.explosionImgSeq.append(eachImgPath)
-
 class EnemyBlasterBullet(BaseBullet):
     """
         敌人发射的爆能束
@@ -106,21 +216,13 @@ class EnemyBlasterBullet(BaseBullet):
         ----------
     """
 
+    __slots__ = ()
+
     srcImg = "img/enemyBlasterBullet.png"
+    bulletOwner = 'E'
     scale = 2
     explosionImgSeqRoot = "img/enemyBlasterExplosionSeq"
 
-    def __init__(self, pos, velocity):
-        BaseBullet.__init__(self, pos, velocity, EnemyBlasterBullet.srcImg)
-        self.bulletOwner = 'E'
-        # 初始化子弹爆炸动画序列
-        self.explosionImgSeq = [self.srcImg]
-        explosionImgSeqList = os.listdir(EnemyBlasterBullet.explosionImgSeqRoot)
-        explosionImgSeqList.sort()
-        for eachImgName in explosionImgSeqList:
-            eachImgPath = os.path.join(EnemyBlasterBullet.explosionImgSeqRoot, eachImgName)
-            self.explosionImgSeq.append(eachImgPath)
-
 class PlayerBlasterBullet(BaseBullet):
     """
         玩家发射的爆能束
@@ -129,21 +231,13 @@ class PlayerBlasterBullet(BaseBullet):
         ----------
     """
 
+    __slots__ = ()
+
     srcImg = "img/playerBlasterBullet.png"
+    bulletOwner = 'P'
     scale = 2
     explosionImgSeqRoot = "img/playerBlasterExplosionSeq"
 
-    def __init__(self, pos, velocity):
-        BaseBullet.__init__(self, pos, velocity, PlayerBlasterBullet.srcImg)
-        self.bulletOwner = 'P'
-        # 初始化子弹爆炸动画序列
-        self.explosionImgSeq = [self.srcImg]
-        explosionImgSeqList = os.listdir(PlayerBlasterBullet.explosionImgSeqRoot)
-        explosionImgSeqList.sort()
-        for eachImgName in explosionImgSeqList:
-            eachImgPath = os.path.join(PlayerBlasterBullet.explosionImgSeqRoot, eachImgName)
-            self.explosionImgSeq.append(eachImgPath)
-
 class DeathStarBeamBullet(BaseBullet):
     """
         玩家发射的爆能束
@@ -152,17 +246,340 @@ class DeathStarBeamBullet(BaseBullet):
         ----------
     """
 
+    __slots__ = ()
+
     srcImg = "img/deathStarBeamBullet.png"
+    bulletOwner = 'E'
     scale = 2
     explosionImgSeqRoot = "img/deathStarBeamExplosionSeq"
 
-    def __init__(self, pos, velocity):
-        BaseBullet.__init__(self, pos, velocity, DeathStarBeamBullet.srcImg)
-        self.bulletOwner = 'E'
-        # 初始化子弹爆炸动画序列
-        self.explosionImgSeq = [self.srcImg]
-        explosionImgSeqList = os.listdir(DeathStarBeamBullet.explosionImgSeqRoot)
+class BulletType:
+    """
+        子弹类型，保存同一类型子弹共享的信息，每个类型只在启动时创建一次
+
+        Attributes
+        ----------
+        typeId : int
+            类型编号，即在bulletTypeRegistry中的下标
+        bulletClass : class
+            对应的子弹类
+        srcImg : string
+            图像素材所在路径
+        scale : float
+            拉伸比例
+        bulletOwner : char
+            子弹发射人。P：玩家，E：敌人
+        ownerId : int
+            发射人在BulletPool.ownerName中的下标
+        explosionImgSeq : string(tuple)
+            爆炸动画序列，第0帧为子弹本身的图像
+    """
+    def __init__(self, typeId, bulletClass):
+        self.typeId = typeId
+        self.bulletClass = bulletClass
+        self.srcImg = bulletClass.srcImg
+        self.scale = bulletClass.scale
+        self.bulletOwner = bulletClass.bulletOwner
+        self.ownerId = BulletPool.ownerName.index(bulletClass.bulletOwner)
+        # 初始化子弹爆炸动画序列，只在这里读取一次目录
+        explosionImgSeqList = os.listdir(bulletClass.explosionImgSeqRoot)
         explosionImgSeqList.sort()
-        for eachImgName in explosionImgSeqList:
-            eachImgPath = os.path.join(DeathStarBeamBullet.explosionImgSeqRoot, eachImgName)
-            self.explosionImgSeq.append(eachImgPath)
+        self.explosionImgSeq = tuple([bulletClass.srcImg] + [os.path.join(bulletClass.explosionImgSeqRoot, eachImgName) for eachImgName in explosionImgSeqList])
+
+def registerBulletType(bulletClass):
+    """
+        注册子弹类型，并将类型编号写回子弹类
+
+        Parameters
+        ----------
+        bulletClass : class
+            子弹类
+    """
+    bulletClass.typeId = len(bulletTypeRegistry)
+    bulletTypeRegistry.append(BulletType(bulletClass.typeId, bulletClass))
+
+
+class BulletPool:
+    """
+        子弹池，以结构数组（struct-of-arrays）的形式存放场景中的所有子弹
+        移动、出界剔除、爆炸动画推进均以整块数组运算完成，遍历时按行生成子弹视图
+        增删接口与EntityContainer相同：加入时分配句柄，删除只做标记，在update中与出界剔除一起紧凑排列
+
+        Attributes
+        ----------
+        size : int
+            当前占用的行数，包括已被标记删除、尚未紧凑排列的子弹
+        pos : float[n][2]
+            子弹位置
+        prevPos : float[n][2]
+            上一次update移动前的位置，与pos连成本步的移动轨迹，用于扫掠碰撞判定；之后加入的子弹为发射点，不做扫掠判定时不更新
+        velocity : float[n][2]
+            子弹速度，单位：像素/秒
+        atk : float[n]
+            子弹攻击力
+        owner : int[n]
+            子弹发射人，为ownerName中的下标
+        typeId : int[n]
+            子弹类型，为bulletTypeRegistry中的下标
+        explosionFrame : int[n]
+            爆炸动画帧，0表示未爆炸
+        handle : int[n]
+            子弹的句柄，按行号递增，紧凑排列时保持顺序，因此可以二分查找
+        alive : bool[n]
+            子弹是否未被删除
+        nextHandle : int
+            下一个分配的句柄
+        removedCount : int
+            已被标记删除、尚未紧凑排列的子弹数量
+        typeSeqLen : int[]
+            各子弹类型的爆炸动画序列长度
+        version : int
+            版本号，子弹增删或移动后加一，用于判断空间索引是否过期
+    """
+
+    ownerName = ['P', 'E']
+
+    def __init__(self, capacity=256):
+        self.size = 0
+        self.pos = np.zeros((capacity, 2))
+        self.prevPos = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.atk = np.zeros(capacity)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+        self.typeId = np.zeros(capacity, dtype=np.int8)
+        self.explosionFrame = np.zeros(capacity, dtype=np.int16)
+        self.handle = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.nextHandle = 0
+        self.removedCount = 0
+        self.typeSeqLen = np.array([len(eachType.explosionImgSeq) for eachType in bulletTypeRegistry], dtype=np.int16)
+        self.version = 0
+
+    def __len__(self):
+        return self.size - self.removedCount
+
+    def __iter__(self):
+        for idx in range(self.size):
+            if(self.alive[idx]):
+                yield bulletTypeRegistry[self.typeId[idx]].bulletClass.view(self, idx)
+
+    def append(self, bullet) -> int:
+        """
+            将子弹写入子弹池，之后该子弹对象成为对应行的视图
+
+            Parameters
+            ----------
+            bullet : BaseBullet
+                新生成的子弹
+
+            Returns
+            -------
+            handle : int
+                子弹的句柄
+        """
+        if(self.size == len(self.atk)):
+            self.grow()
+        idx = self.size
+        self.pos[idx] = bullet.pos
+        self.prevPos[idx] = self.pos[idx]
+        self.velocity[idx] = bullet.velocity
+        self.atk[idx] = bullet.atk
+        self.owner[idx] = bullet.bulletType.ownerId
+        self.typeId[idx] = bullet.typeId
+        self.explosionFrame[idx] = bullet.explosionFrame
+        handle = self.nextHandle
+        self.handle[idx] = handle
+        self.alive[idx] = True
+        self.nextHandle += 1
+        self.size += 1
+        self.version += 1
+        bullet.pool = self
+        bullet.handle = handle
+        return handle
+
+    def extend(self, bulletClass, pos, velocity, atk, age=0):
+        """
+            将一批同类型的子弹整块写入子弹池，不构造子弹对象，用于一次发射大量子弹的弹幕
+
+            Parameters
+            ----------
+            bulletClass : class
+                子弹类
+            pos : float[n][2]
+                各子弹的初始位置
+            velocity : float[n][2] / float[2]
+                各子弹的速度，单位：像素/秒，只给一个速度时整批相同
+            atk : float
+                攻击力，整批相同
+            age : float
+                子弹在本步中已经飞行的时间，单位：s，大步长中途发射的子弹从发射点前进这么久，发射点记为移动前的位置
+
+            Returns
+            -------
+            handle : int[n]
+                各子弹的句柄
+        """
+        n = len(pos)
+        if(n == 0):
+            return self.handle[:0].copy()
+        while(self.size + n > len(self.atk)):
+            self.grow()
+        rows = slice(self.size, self.size + n)
+        self.pos[rows] = pos
+        self.prevPos[rows] = self.pos[rows]
+        self.velocity[rows] = velocity
+        if(age > 0):
+            self.pos[rows] += self.velocity[rows] * age
+        self.atk[rows] = atk
+        self.owner[rows] = bulletTypeRegistry[bulletClass.typeId].ownerId
+        self.typeId[rows] = bulletClass.typeId
+        self.explosionFrame[rows] = 0
+        self.handle[rows] = np.arange(self.nextHandle, self.nextHandle + n)
+        self.alive[rows] = True
+        self.nextHandle += n
+        self.size += n
+        self.version += 1
+        return self.handle[rows].copy()
+
+    def grow(self):
+        """
+            容量翻倍
+        """
+        for name in ("pos", "prevPos", "velocity", "atk", "owner", "typeId", "explosionFrame", "handle", "alive"):
+            arr = getattr(self, name)
+            newArr = np.zeros((len(arr) * 2,) + arr.shape[1:], dtype=arr.dtype)
+            newArr[:self.size] = arr[:self.size]
+            setattr(self, name, newArr)
+
+    def update(self, screenSize, dt, isSwept=True):
+        """
+            所有子弹向前移动一步，推进爆炸动画，并删除已经到达界外、爆炸结束或被标记删除的子弹
+
+            Parameters
+            ----------
+            screenSize : int[2]
+                场景大小
+            dt : float
+                时间步长，单位：s
+            isSwept : bool
+                碰撞是否按轨迹做扫掠判定，是则记录移动前的位置，并且整条轨迹都在界外时才删除：
+                刚飞出界的子弹保留一步，使出界前的这段轨迹仍参与碰撞判定
+        """
+        n = self.size
+        pos = self.pos[:n]
+        if(isSwept):
+            prevPos = self.prevPos[:n]
+            prevPos[:] = pos
+            pos += self.velocity[:n] * dt
+            isRemoved = ((np.maximum(pos, prevPos) < 0) | (np.minimum(pos, prevPos) >= screenSize)).any(axis=1)
+        else:
+            pos += self.velocity[:n] * dt
+            isRemoved = (pos[:, 0] < 0) | (pos[:, 0] >= screenSize[0]) | (pos[:, 1] < 0) | (pos[:, 1] >= screenSize[1])
+        # 爆炸动画推进，播放完毕的子弹标记删除，只处理正在爆炸的少数子弹
+        frame = self.explosionFrame[:n]
+        exploding = np.flatnonzero(frame)
+        if(len(exploding) > 0):
+            finished = frame[exploding] + 1 >= self.typeSeqLen[self.typeId[exploding]]
+            frame[exploding[~finished]] += 1
+            isRemoved[exploding[finished]] = True
+        # 没有被标记删除的子弹时不需要再看alive
+        if(self.removedCount > 0):
+            isRemoved |= ~self.alive[:n]
+        self.version += 1
+        if(isRemoved.any()):
+            self.compact(~isRemoved)
+        else:
+            self.removedCount = 0
+
+    def getRow(self, handle) -> int:
+        """
+            根据句柄查找子弹当前的行号
+
+            Parameters
+            ----------
+            handle : int
+                子弹的句柄
+
+            Returns
+            -------
+            idx : int
+                行号，子弹已被删除时返回-1
+        """
+        idx = int(np.searchsorted(self.handle[:self.size], handle))
+        if(idx < self.size and self.handle[idx] == handle and self.alive[idx]):
+            return idx
+        return -1
+
+    def get(self, handle):
+        """
+            根据句柄获取子弹视图，已被删除时返回None
+
+            Parameters
+            ----------
+            handle : int
+                子弹的句柄
+        """
+        idx = self.getRow(handle)
+        if(idx < 0):
+            return None
+        return bulletTypeRegistry[self.typeId[idx]].bulletClass.view(self, idx)
+
+    def remove(self, handle) -> bool:
+        """
+            标记删除子弹，在下一次update时移除
+
+            Parameters
+            ----------
+            handle : int
+                子弹的句柄
+
+            Returns
+            -------
+            True / False
+                本次删除成功 / 子弹已经被删除过
+        """
+        idx = self.getRow(handle)
+        if(idx < 0):
+            return False
+        self.alive[idx] = False
+        self.removedCount += 1
+        self.version += 1
+        return True
+
+    def explode(self, idx):
+        """
+            第idx个子弹命中后进入爆炸状态，停止移动并切换到第一帧爆炸动画
+
+            Parameters
+            ----------
+            idx : int
+                子弹的行号
+        """
+        self.velocity[idx] = 0
+        self.explosionFrame[idx] = 1
+
+    def compact(self, keep=None):
+        """
+            保留keep为True的子弹，按原有顺序紧凑排列
+
+            Parameters
+            ----------
+            keep : bool[n]
+                每个子弹是否保留，为None时只移除被标记删除的子弹
+        """
+        if(keep is None):
+            keep = self.alive[:self.size]
+        self.removedCount = 0
+        if(keep.all()):
+            return
+        keepIdx = np.flatnonzero(keep)
+        m = len(keepIdx)
+        for arr in (self.pos, self.prevPos, self.velocity, self.atk, self.owner, self.typeId, self.explosionFrame, self.handle, self.alive):
+            arr[:m] = arr[keepIdx]
+        self.size = m
+        self.version += 1
+
+# 子弹类型注册表，启动时创建，下标即为typeId
+bulletTypeRegistry = []
+for eachBulletClass in [PlayerBullet, NormalEnemyBullet, EnemyBlasterBullet, PlayerBlasterBullet, DeathStarBeamBullet]:
+    registerBulletType(eachBulletClass)
@@ -0,0 +1,192 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from aimMath import rotationMatrix
+
+class BulletPattern(ABC):
+    """
+        弹幕模式抽象基类，描述一次发射中每个炮口射出的子弹，子类需要实现getVelocity
+        一次发射的所有子弹以数组的形式整批算出，再由BulletPool.extend一次写入子弹池，不逐个构造子弹对象
+        角度均以度为单位，0度为向右，90度为向下（屏幕坐标系）
+    """
+    @abstractmethod
+    def getVelocity(self, enemy, stage, fireTime):
+        """
+            每个炮口本次发射的各子弹速度
+
+            Parameters
+            ----------
+            enemy : BaseEnemy
+                发射子弹的敌人
+            stage : Stage
+                敌人所在的场景
+            fireTime : float
+                发射时刻，大步长时可能早于场景的当前时间戳
+
+            Returns
+            -------
+            velocity : float[k][2]
+                子弹速度，单位：像素/秒
+        """
+
+    def emit(self, enemy, stage, origin, fireTime):
+        """
+            计算一次发射的所有子弹：每个炮口都射出getVelocity给出的全部子弹
+
+            Parameters
+            ----------
+            enemy : BaseEnemy
+                发射子弹的敌人
+            stage : Stage
+                敌人所在的场景
+            origin : float[m][2]
+                各炮口的绝对位置
+            fireTime : float
+                发射时刻
+
+            Returns
+            -------
+            pos : float[m*k][2]
+                各子弹的初始位置，按炮口依次排列
+            velocity : float[m*k][2]
+                各子弹的速度
+        """
+        velocity = self.getVelocity(enemy, stage, fireTime)
+        origin = np.asarray(origin, dtype=float)
+        # 一次发射通常只有一个炮口、几颗子弹，只有一个炮口时直接使用速度数组，不再复制
+        if(len(origin) == 1):
+            return (origin.repeat(len(velocity), axis=0), velocity)
+        return (origin.repeat(len(velocity), axis=0), np.concatenate((velocity,) * len(origin)))
+
+def directionVelocity(angle, speed):
+    """
+        按角度和速率生成速度
+
+        Parameters
+        ----------
+        angle : float[k]
+            方向角，单位：度
+        speed : float
+            速率，单位：像素/秒
+    """
+    theta = np.radians(angle)
+    return np.stack([speed * np.cos(theta), speed * np.sin(theta)], axis=1)
+
+class Volley(BulletPattern):
+    """
+        固定速度的齐射，每个炮口射出的子弹速度固定不变
+
+        Attributes
+        ----------
+        velocity : float[k][2]
+            各子弹的速度，单位：像素/秒
+    """
+    def __init__(self, velocityList):
+        self.velocity = np.array(velocityList, dtype=float)
+
+    def getVelocity(self, enemy, stage, fireTime):
+        return self.velocity
+
+class Ring(BulletPattern):
+    """
+        环形弹幕，向一圈均匀分布的方向发射
+
+        Attributes
+        ----------
+        count : int
+            一圈的子弹数
+        speed : float
+            子弹速率，单位：像素/秒
+        phase : float
+            第一颗子弹的方向角，单位：度
+    """
+    def __init__(self, count, speed, phase=0):
+        self.count = count
+        self.speed = speed
+        self.phase = phase
+        self.velocity = directionVelocity(phase + 360 * np.arange(count) / count, speed)
+
+    def getVelocity(self, enemy, stage, fireTime):
+        return self.velocity
+
+def fanOffset(count, spread):
+    """
+        扇形内各子弹相对中心方向的偏转角，单位：度
+    """
+    if(count == 1):
+        return np.zeros(1)
+    return np.linspace(-spread / 2, spread / 2, count)
+
+class Aimed(BulletPattern):
+    """
+        自机狙，对着玩家发射，count大于1时在玩家方向两侧展开成扇形
+        指向玩家的方向由enemy.getAim给出，aimsAtPlayer为True的敌人每帧由敌人容器整块算出，与玩家重合时速度为零
+
+        Attributes
+        ----------
+        speed : float
+            子弹速率，单位：像素/秒
+        count : int
+            子弹数
+        spread : float
+            扇形张角，单位：度
+        rotation : float[k][2]
+            各子弹相对瞄准方向的旋转(cos, sin)，预先算好
+    """
+    def __init__(self, speed, count=1, spread=0):
+        self.speed = speed
+        self.count = count
+        self.spread = spread
+        theta = np.radians(fanOffset(count, spread))
+        self.rotation = np.stack([np.cos(theta), np.sin(theta)], axis=1)
+
+    def getVelocity(self, enemy, stage, fireTime):
+        aim = enemy.getAim(stage)
+        ux = aim[0] * self.speed
+        uy = aim[1] * self.speed
+        c = self.rotation[:, 0]
+        s = self.rotation[:, 1]
+        return np.stack([ux * c - uy * s, ux * s + uy * c], axis=1)
+
+class Rotating(BulletPattern):
+    """
+        旋转弹幕，把内层模式的所有子弹方向随时间匀速旋转，旋转矩阵从预先算好的角度表中查出
+
+        Attributes
+        ----------
+        pattern : BulletPattern
+            内层模式
+        period : float
+            旋转一圈所需时间，单位：秒，为负时反向旋转
+    """
+    def __init__(self, pattern, period):
+        self.pattern = pattern
+        self.period = period
+
+    def getVelocity(self, enemy, stage, fireTime):
+        second = fireTime / 1e3
+        return self.pattern.getVelocity(enemy, stage, fireTime) @ rotationMatrix(-(second % abs(self.period)) / self.period)
+
+class RandomOrigin(BulletPattern):
+    """
+        随机位置发射，不使用敌人的炮口，而是在场景顶端随机取count个位置，各自射出内层模式的子弹
+
+        Attributes
+        ----------
+        pattern : BulletPattern
+            内层模式
+        count : int
+            发射位置个数
+        y : float
+            发射位置的纵坐标
+    """
+    def __init__(self, pattern, count, y=0):
+        self.pattern = pattern
+        self.count = count
+        self.y = y
+
+    def getVelocity(self, enemy, stage, fireTime):
+        return self.pattern.getVelocity(enemy, stage, fireTime)
+
+    def emit(self, enemy, stage, origin, fireTime):
+        origin = [[stage.rng.random() * stage.screenSize[0], self.y] for i in range(self.count)]
+        return self.pattern.emit(enemy, stage, origin, fireTime)
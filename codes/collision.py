@@ -0,0 +1,53 @@
+import numpy as np
+
+def segmentsHitBox(start, end, xMin, yMin, xMax, yMax):
+    """
+        一批线段是否与矩形相交（扫掠碰撞），线段退化为点时即为点是否在矩形内，边界算作相交
+        矩形可以是所有线段共用的一个，也可以每条线段各一个
+        先用线段的外接矩形粗筛，斜向移动的线段再用分离轴（slab）法精确判定
+
+        Parameters
+        ----------
+        start : float[n][2]
+            各线段的起点（上一步的位置）
+        end : float[n][2]
+            各线段的终点（当前位置）
+        xMin, yMin, xMax, yMax : float / float[n]
+            矩形的边界
+
+        Returns
+        -------
+        isHit : bool[n]
+            各线段是否与矩形相交
+    """
+    lo = np.minimum(start, end)
+    hi = np.maximum(start, end)
+    isHit = (lo[:, 0] <= xMax) & (hi[:, 0] >= xMin) & (lo[:, 1] <= yMax) & (hi[:, 1] >= yMin)
+    # 外接矩形相交时，水平、竖直移动或静止的线段一定与矩形相交，只有斜向移动的需要精确判定
+    delta = end - start
+    diagonal = np.flatnonzero(isHit & (delta[:, 0] != 0) & (delta[:, 1] != 0))
+    if(len(diagonal) == 0):
+        return isHit
+    p = start[diagonal]
+    d = delta[diagonal]
+    t0 = (np.broadcast_to(np.stack([xMin, yMin], axis=-1), start.shape)[diagonal] - p) / d
+    t1 = (np.broadcast_to(np.stack([xMax, yMax], axis=-1), start.shape)[diagonal] - p) / d
+    tEnter = np.minimum(t0, t1).max(axis=1)
+    tExit = np.maximum(t0, t1).min(axis=1)
+    isHit[diagonal] = (tEnter <= tExit) & (tEnter <= 1) & (tExit >= 0)
+    return isHit
+
+def segmentHitsBox(start, end, xMin, yMin, xMax, yMax) -> bool:
+    """
+        单条线段是否与矩形相交，同segmentsHitBox
+
+        Parameters
+        ----------
+        start : float[2]
+            线段起点
+        end : float[2]
+            线段终点
+        xMin, yMin, xMax, yMax : float
+            矩形的边界
+    """
+    return bool(segmentsHitBox(np.array([start], dtype=float), np.array([end], dtype=float), xMin, yMin, xMax, yMax)[0])
@@ -0,0 +1,282 @@
+import numpy as np
+from aimMath import aimDirections
+
+class EntityContainer:
+    """
+        实体容器，用于存放场景中的敌人和道具，与BulletPool提供相同的增删接口
+
+        加入时为实体分配一个不会复用的句柄，之后通过句柄删除
+        删除只做标记（O(1)），被标记的实体在遍历时跳过，由compact一次性按原有顺序紧凑排列
+        同一个句柄只能删除一次，重复删除返回False
+
+        遍历过程中可以加入新实体（新实体也会被遍历到）或删除实体，但不能调用compact
+
+        Attributes
+        ----------
+        entities : object[]
+            按加入顺序排列的实体，其中可能有已被标记删除的实体
+        alive : bool[]
+            各实体是否未被删除
+        rowOf : dict
+            {句柄 : 行号}，只包含未被删除的实体
+        nextHandle : int
+            下一个分配的句柄
+        freeList : FreeList
+            被移除的实体在compact时回收到这里，为None时不回收
+    """
+    def __init__(self, freeList=None):
+        self.entities = []
+        self.alive = []
+        self.rowOf = {}
+        self.nextHandle = 0
+        self.freeList = freeList
+
+    def __len__(self):
+        return len(self.rowOf)
+
+    def __iter__(self):
+        entities = self.entities
+        alive = self.alive
+        idx = 0
+        # 按下标遍历，遍历过程中加入的实体也会被遍历到
+        while(idx < len(entities)):
+            if(alive[idx]):
+                yield entities[idx]
+            idx += 1
+
+    def append(self, entity) -> int:
+        """
+            加入实体，并将分配的句柄写入entity.handle
+
+            Parameters
+            ----------
+            entity : object
+                新的实体
+
+            Returns
+            -------
+            handle : int
+                实体的句柄
+        """
+        handle = self.nextHandle
+        self.nextHandle += 1
+        self.rowOf[handle] = len(self.entities)
+        self.entities.append(entity)
+        self.alive.append(True)
+        entity.handle = handle
+        return handle
+
+    def get(self, handle):
+        """
+            根据句柄获取实体，已被删除时返回None
+
+            Parameters
+            ----------
+            handle : int
+                实体的句柄
+        """
+        row = self.rowOf.get(handle)
+        if(row is None):
+            return None
+        return self.entities[row]
+
+    def remove(self, handle) -> bool:
+        """
+            标记删除实体
+
+            Parameters
+            ----------
+            handle : int
+                实体的句柄
+
+            Returns
+            -------
+            True / False
+                本次删除成功 / 实体已经被删除过
+        """
+        row = self.rowOf.pop(handle, None)
+        if(row is None):
+            return False
+        self.alive[row] = False
+        return True
+
+    def compact(self):
+        """
+            移除所有被标记删除的实体，按原有顺序紧凑排列，设置了freeList时回收被移除的实体
+        """
+        if(len(self.rowOf) == len(self.entities)):
+            return
+        if(self.freeList is not None):
+            for (eachEntity, isAlive) in zip(self.entities, self.alive):
+                if(not isAlive):
+                    self.freeList.release(eachEntity)
+        self.entities = [eachEntity for (eachEntity, isAlive) in zip(self.entities, self.alive) if isAlive]
+        self.alive = [True] * len(self.entities)
+        self.rowOf = {eachEntity.handle : row for (row, eachEntity) in enumerate(self.entities)}
+
+class KinematicContainer(EntityContainer):
+    """
+        带运动学数组的实体容器，用于存放敌人
+        实体的位置、速度和碰撞箱存放在与entities逐行对应的连续数组中，实体加入后其pos、velocity、crashBox成为对应行的视图，
+        直线运动和横向反弹可以整块数组一次完成
+
+        Attributes
+        ----------
+        pos : float[n][2]
+            实体位置
+        prevPos : float[n][2]
+            实体本帧移动前的位置，由savePrevPos记录，本帧加入的实体为加入时的位置
+        velocity : float[n][2]
+            实体速度，单位：像素/秒
+        crashBox : float[n][2]
+            碰撞箱，在x/y方向上距中心的距离
+        linear : bool[n]
+            是否由容器批量完成直线运动和横向反弹（实体的isLinearMover）
+        perObject : bool[n]
+            是否需要逐个处理：运动方式特殊，或者批量运动之后还需要调用afterMove（实体的hasMoveHook）
+        aiming : bool[n]
+            是否瞄准玩家（实体的aimsAtPlayer）
+        aim : float[n][2]
+            瞄准玩家的实体指向玩家的单位向量，由updateAim整块更新
+    """
+    def __init__(self, capacity=64):
+        EntityContainer.__init__(self)
+        self.pos = np.zeros((capacity, 2))
+        self.prevPos = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.crashBox = np.zeros((capacity, 2))
+        self.linear = np.zeros(capacity, dtype=bool)
+        self.perObject = np.zeros(capacity, dtype=bool)
+        self.aiming = np.zeros(capacity, dtype=bool)
+        self.aim = np.zeros((capacity, 2))
+
+    def append(self, entity) -> int:
+        """
+            加入实体，把其位置、速度和碰撞箱写入数组，之后实体的这些属性成为对应行的视图
+
+            Parameters
+            ----------
+            entity : BaseEnemy
+                新的实体
+
+            Returns
+            -------
+            handle : int
+                实体的句柄
+        """
+        row = len(self.entities)
+        if(row == len(self.linear)):
+            self.grow()
+        self.pos[row] = entity.pos
+        self.prevPos[row] = self.pos[row]
+        self.velocity[row] = entity.velocity
+        self.crashBox[row] = entity.crashBox
+        self.linear[row] = entity.isLinearMover
+        self.perObject[row] = (not entity.isLinearMover) or entity.hasMoveHook
+        self.aiming[row] = entity.aimsAtPlayer
+        self.aim[row] = 0
+        handle = EntityContainer.append(self, entity)
+        entity.container = self
+        entity.row = row
+        return handle
+
+    def grow(self):
+        """
+            容量翻倍
+        """
+        for name in ("pos", "prevPos", "velocity", "crashBox", "linear", "perObject", "aiming", "aim"):
+            arr = getattr(self, name)
+            newArr = np.zeros((len(arr) * 2,) + arr.shape[1:], dtype=arr.dtype)
+            newArr[:len(self.entities)] = arr[:len(self.entities)]
+            setattr(self, name, newArr)
+
+    def moveLinear(self, start, end, screenSize, dt):
+        """
+            对第start到end-1行中直线运动的实体，先把下一步即将横向出界的实体水平速度反向，再整体移动一步
+
+            Parameters
+            ----------
+            start : int
+                起始行
+            end : int
+                结束行（不含）
+            screenSize : int[2]
+                场景大小
+            dt : float
+                时间步长，单位：s
+        """
+        pos = self.pos[start:end]
+        velocity = self.velocity[start:end]
+        linear = self.linear[start:end]
+        vx = velocity[:, 0]
+        newX = pos[:, 0] + vx * dt
+        bounce = (newX < 0) | (newX >= screenSize[0])
+        if(np.count_nonzero(bounce) > 0):
+            bounce &= linear
+            vx[bounce] = -vx[bounce]
+        # 没有特殊运动方式的敌人时（绝大多数帧）直接整块相加
+        if(np.count_nonzero(linear) == end - start):
+            pos += velocity * dt
+        else:
+            np.add(pos, velocity * dt, out=pos, where=linear[:, None])
+
+    def updateAim(self, start, end, target):
+        """
+            对第start到end-1行中瞄准玩家的实体，一次算出指向目标的单位向量
+
+            Parameters
+            ----------
+            start : int
+                起始行
+            end : int
+                结束行（不含）
+            target : float[2]
+                目标（玩家）的位置
+        """
+        aiming = self.aiming[start:end]
+        if(np.count_nonzero(aiming) == 0):
+            return
+        rows = start + np.flatnonzero(aiming)
+        self.aim[rows] = aimDirections(self.pos[rows], target)
+
+    def savePrevPos(self):
+        """
+            记录所有实体移动前的位置
+        """
+        n = len(self.entities)
+        self.prevPos[:n] = self.pos[:n]
+
+    def getCrashBoxes(self):
+        """
+            所有实体的碰撞箱边界和本帧的位移，按行排列，供整块碰撞判定使用
+
+            Returns
+            -------
+            boxes : float[n][4]
+                每一行的碰撞箱(xMin, yMin, xMax, yMax)
+            steps : float[n][2]
+                每一行本帧的位移
+        """
+        n = len(self.entities)
+        pos = self.pos[:n]
+        crashBox = self.crashBox[:n]
+        return (np.concatenate((pos - crashBox, pos + crashBox), axis=1), pos - self.prevPos[:n])
+
+    def compact(self):
+        """
+            移除所有被标记删除的实体，按原有顺序紧凑排列
+            被移除的实体与容器解绑，取回自己的位置、速度和碰撞箱，之后仍可以读取
+        """
+        n = len(self.entities)
+        if(len(self.rowOf) == n):
+            return
+        keepIdx = np.flatnonzero(self.alive)
+        for (eachEntity, isAlive) in zip(self.entities, self.alive):
+            if(not isAlive):
+                eachEntity.unbind()
+        m = len(keepIdx)
+        for arr in (self.pos, self.prevPos, self.velocity, self.crashBox, self.linear, self.perObject, self.aiming, self.aim):
+            arr[:m] = arr[keepIdx]
+        EntityContainer.compact(self)
+        for (row, eachEntity) in enumerate(self.entities):
+            eachEntity.row = row
@@ -1,6 +1,14 @@
-from bullet import DeathStarBeamBullet, EnemyBlasterBullet, NormalEnemyBullet, PlayerBlasterBullet, PlayerBullet
+from bullet import bulletTypeRegistry
 from player import Player
-from stage import Stage
+from stage import Stage, PlayerInput
+from surfaceCache import SurfaceCache
+from assets import AssetLoader, assetKeyList
+from profiler import FrameProfiler
+from hud import Hud
+from replay import ReplayRecorder
+from snapshot import saveSnapshotFile, loadSnapshotFile
+import argparse
+import os
 import pygame
 from enemy import *
 
@@ -10,6 +18,9 @@ class DisplayConfig:
     """
     doShowCrashBox = False # 是否显示碰撞箱
     doShowHpText = True # 是否显示血量数值
+    doShowProfiler = False # 是否显示各阶段耗时
+    doUseDirtyRect = False # 是否只更新发生变化的区域（脏矩形），否则每帧重绘并更新整个窗口
+    doReportAssetLoad = False # 启动时是否输出各图像的读取耗时
 
 class Display:
     """
@@ -19,9 +30,46 @@ class Display:
         ----------
         stage : Stage
             要被展示出来的界面类
+        surfaceCache : SurfaceCache
+            图像缓存，所有绘制都从这里取图
+        assetLoader : AssetLoader
+            启动时并行预读取全部图像到图像缓存
+        profiler : FrameProfiler
+            逐帧分阶段计时器，包括模拟的各阶段、帧间隔和绘制
+        hud : Hud
+            信息面板，在窗口初始化后创建
+        recorder : ReplayRecorder
+            输入录制器，不录制时为None
+        prevRectList : Rect[]
+            脏矩形模式下，上一帧绘制过的区域，本帧需要先擦除
+        currRectList : Rect[]
+            本帧绘制过的区域
+        needFullRedraw : bool
+            下一帧是否需要整屏重绘（切换显示选项、暂停等情形）
     """
-    def __init__(self):
-        self.stage = Stage()
+
+    # 耗时面板每隔多少帧刷新一次
+    PROFILER_REFRESH_INTERV = 30
+    # 绘制帧率上限
+    MAX_FPS = 60
+    # 每次绘制前最多追赶的模拟步数，超出时丢弃积压的时间，避免越追越慢
+    MAX_CATCH_UP_STEPS = 5
+    # 脏矩形模式下，需要更新的面积超过窗口面积的该比例时，改为整屏更新
+    DIRTY_RECT_MAX_RATIO = 0.5
+    # 快速存档的文件路径
+    SNAPSHOT_PATH = "./snapshot.bin"
+
+    def __init__(self, seed=None, recordPath=None):
+        self.stage = Stage(seed)
+        self.recorder = ReplayRecorder(recordPath, self.stage) if recordPath is not None else None
+        self.surfaceCache = SurfaceCache()
+        self.assetLoader = AssetLoader(self.surfaceCache)
+        self.profiler = FrameProfiler(Stage.phaseList + ["wait", "draw"])
+        self.stage.profiler = self.profiler
+        self.profilerImgList = [] # 耗时面板的文字图像
+        self.prevRectList = []
+        self.currRectList = []
+        self.needFullRedraw = True
 
     def loop(self):
         """
@@ -32,14 +80,16 @@ class Display:
         self.hpInfoHeight = 50 # 血条信息所占的高度
         screenSize = (self.stage.screenSize[0], self.stage.screenSize[1]+self.hpInfoHeight)
         self.screen = pygame.display.set_mode(screenSize)
+        self.hud = Hud(self.stage.screenSize, self.hpInfoHeight, self.surfaceCache)
+
+        # 并行预读取全部图像并转换像素格式，之后的初始化和绘制都直接命中缓存
+        loadTimes = self.assetLoader.preload(assetKeyList(self.stage.itemClassList))
+        if(DisplayConfig.doReportAssetLoad):
+            print(self.assetLoader.report(loadTimes))
 
         # 各图像素材初始化
         self.playerImg, self.playerImgRect = self.initImgSrc(Player.srcImg, scale=Player.scale) # 玩家信息初始化
-        self.playerBulletImg, self.playerBulletImgRect = self.initImgSrc(PlayerBullet.srcImg, scale=PlayerBullet.scale) # 玩家子弹信息初始化
-        self.normalEnemyBulletImg, self.normalEnemyBulletImgRect = self.initImgSrc(NormalEnemyBullet.srcImg, scale=NormalEnemyBullet.scale) # 普通敌人子弹初始化
-        self.enemyBlasterBulletImg, self.enemyBlasterBulletImgRect = self.initImgSrc(EnemyBlasterBullet.srcImg, scale=EnemyBlasterBullet.scale) # 敌人爆能束子弹初始化
-        self.playerBlasterBulletImg, self.playerBlasterBulletImgRect = self.initImgSrc(PlayerBlasterBullet.srcImg, scale=PlayerBlasterBullet.scale) # 玩家爆能束子弹初始化
-        self.deathStarBeamBulletImg, self.deathStarBeamBulletImgRect = self.initImgSrc(DeathStarBeamBullet.srcImg, scale=DeathStarBeamBullet.scale) # 死星光束初始化
+        self.bulletImgList = [self.initImgSrc(eachType.srcImg, scale=eachType.scale)[0] for eachType in bulletTypeRegistry] # 各类型子弹初始化，下标即为typeId
         OneHpEnemy.img, OneHpEnemy.imgRect = self.initImgSrc(OneHpEnemy.srcImg, scale=OneHpEnemy.scale) # 1血敌人初始化
         DoubleWarrior.img, DoubleWarrior.imgRect = self.initImgSrc(DoubleWarrior.srcImg, scale=DoubleWarrior.scale) # 双排敌人初始化
         TripleShooter.img, TripleShooter.imgRect = self.initImgSrc(TripleShooter.srcImg, scale=TripleShooter.scale) # 三线敌人初始化
@@ -53,12 +103,19 @@ class Display:
         DeathStar.img, DeathStar.imgRect = self.initImgSrc(DeathStar.srcImg, scale=DeathStar.scale) # 死星初始化
         # 进入主循环
         running = True
+        clock = pygame.time.Clock()
+        clock.tick()
+        accumulator = 0 # 尚未模拟的实际时间，单位：ms
         while(True):
             # 事件判定
             for event in pygame.event.get():
                 if(event.type == pygame.QUIT):
+                    if(self.recorder is not None):
+                        self.recorder.close()
                     exit(0)
                 if(event.type == pygame.KEYDOWN):
+                    # 显示选项可能改变，下一帧整屏重绘
+                    self.needFullRedraw = True
                     # 碰撞箱快捷键
                     if(pygame.key.get_pressed()[pygame.K_b]):
                         DisplayConfig.doShowCrashBox = not DisplayConfig.doShowCrashBox
@@ -66,164 +123,196 @@ class Display:
                     if(pygame.key.get_pressed()[pygame.K_p]):
                         running = not running
                         # 暂停文字显示
-                        font = pygame.font.SysFont(None, 32)
-                        img = font.render('PAUSE', True, (255, 0, 0))
-                        self.screen.blit(img, (0.05 * self.stage.screenSize[0], 45))
+                        self.screen.blit(self.hud.pauseImg, (0.05 * self.stage.screenSize[0], 45))
                         pygame.display.update()
                     # 血量数值快捷键
                     if(pygame.key.get_pressed()[pygame.K_h]):
                         DisplayConfig.doShowHpText = not DisplayConfig.doShowHpText
+                    # 耗时面板快捷键
+                    if(pygame.key.get_pressed()[pygame.K_t]):
+                        DisplayConfig.doShowProfiler = not DisplayConfig.doShowProfiler
+                    # 脏矩形模式快捷键
+                    if(pygame.key.get_pressed()[pygame.K_r]):
+                        DisplayConfig.doUseDirtyRect = not DisplayConfig.doUseDirtyRect
+                    # 快速存档快捷键
+                    if(pygame.key.get_pressed()[pygame.K_F5]):
+                        saveSnapshotFile(self.stage, Display.SNAPSHOT_PATH)
+                    # 快速读档快捷键
+                    if(pygame.key.get_pressed()[pygame.K_F9] and os.path.exists(Display.SNAPSHOT_PATH)):
+                        self.setStage(loadSnapshotFile(Display.SNAPSHOT_PATH))
 
             if(not running):
+                # 暂停期间照常计时，恢复后不追赶暂停的时间
+                clock.tick(Display.MAX_FPS)
                 continue
-            # 根据按键作出响应
-            self.playerMove() # 玩家移动
-            self.playerFire() # 玩家子弹发射判定
+            self.profiler.startFrame()
+            # 帧间隔，累计实际经过的时间
+            accumulator += clock.tick(Display.MAX_FPS)
+            self.profiler.lap("wait")
 
-            # 随着时间流逝，进行每一帧的刷新
-            self.bulletMove() # 子弹向前推移
-            self.epUpdate() # 敌人和玩家更新
-
-            # 更新时间戳
-            self.updateTimeStamp()
+            # 以固定步长推进模拟，追上实际经过的时间（模拟的各阶段在stage内部计时）
+            playerInput = self.getPlayerInput()
+            wasGameOver = self.stage.isGameOver
+            steps = 0
+            while(accumulator >= self.stage.frameInterv and steps < Display.MAX_CATCH_UP_STEPS):
+                self.stage.tick(playerInput)
+                if(self.recorder is not None):
+                    self.recorder.record(playerInput)
+                accumulator -= self.stage.frameInterv
+                steps += 1
+            if(steps == Display.MAX_CATCH_UP_STEPS):
+                accumulator = min(accumulator, self.stage.frameInterv)
+            # 模拟核心不输出，游戏结束时由窗口提示
+            if(self.stage.isGameOver and not wasGameOver):
+                print("Game Over! Score : %d" % int(self.stage.score))
 
             # 绘制并更新图像
             self.draw()
-            pygame.display.update()
+            self.present()
+            self.profiler.lap("draw")
+            self.profiler.endFrame(len(self.stage.bulletContainer), len(self.stage.enemyContainer), len(self.stage.itemContainer))
+
+    def setStage(self, stage):
+        """
+            切换到另一个场景（例如读档后），录制中的回放无法从中途的状态继续，因此停止录制
+
+            Parameters
+            ----------
+            stage : Stage
+                新的场景
+        """
+        self.stage = stage
+        self.stage.profiler = self.profiler
+        if(self.recorder is not None):
+            self.recorder.close()
+            self.recorder = None
 
     def draw(self) -> None:
         """
             绘制图像
+            脏矩形模式下只擦除上一帧绘制过的区域，否则整屏清空
         """
         # 初始化-黑屏
-        self.screen.fill((0,0,0))
+        if(DisplayConfig.doUseDirtyRect and not self.needFullRedraw):
+            for eachRect in self.prevRectList:
+                self.screen.fill((0,0,0), eachRect)
+        else:
+            self.screen.fill((0,0,0))
+        self.currRectList = []
         # 敌人飞机显示
         for eachEnemy in self.stage.enemyContainer:
             eachEnemyImg = eachEnemy.img
             eachEnemyImgRect = eachEnemyImg.get_rect()
             eachEnemyImgRect.centerx = eachEnemy.pos[0]
             eachEnemyImgRect.centery = eachEnemy.pos[1]
-            self.screen.blit(eachEnemyImg, eachEnemyImgRect)
+            self.blit(eachEnemyImg, eachEnemyImgRect)
         # 玩家飞机显示
         self.playerImgRect.centerx = self.stage.player.pos[0]
         self.playerImgRect.centery = self.stage.player.pos[1]
-        self.screen.blit(self.playerImg, self.playerImgRect)
+        self.blit(self.playerImg, self.playerImgRect)
         # 碰撞箱显示
         if(DisplayConfig.doShowCrashBox):
             self.showCrashBox()
-        # 子弹显示
-        for eachBullet in self.stage.bulletContainer:
-            # 玩家子弹情形
-            if(eachBullet.__class__.__name__ == "PlayerBullet"):
-                # 未爆炸时，显示正常图像
-                if(not eachBullet.isExplosion):
-                    eachBulletImg = self.playerBulletImg
-                    eachBulletImgRect = eachBulletImg.get_rect()
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-                # 爆炸时，每帧都要单独考虑显示爆炸图像
-                else:
-                    eachBulletImg, eachBulletImgRect = self.initImgSrc(eachBullet.srcImg, scale=PlayerBullet.scale)
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-            # 玩家爆能束子弹情形
-            elif(eachBullet.__class__.__name__ == "PlayerBlasterBullet"):
-                # 未爆炸时，显示正常图像
-                if(not eachBullet.isExplosion):
-                    eachBulletImg = self.playerBlasterBulletImg
-                    eachBulletImgRect = eachBulletImg.get_rect()
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-                # 爆炸时，每帧都要单独考虑显示爆炸图像
-                else:
-                    eachBulletImg, eachBulletImgRect = self.initImgSrc(eachBullet.srcImg, scale=EnemyBlasterBullet.scale)
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-            # 普通敌人子弹情形
-            elif(eachBullet.__class__.__name__ == "NormalEnemyBullet"):
-                # 未爆炸时，显示正常图像
-                if(not eachBullet.isExplosion):
-                    eachBulletImg = self.normalEnemyBulletImg
-                    eachBulletImgRect = eachBulletImg.get_rect()
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-                # 爆炸时，每帧都要单独考虑显示爆炸图像
-                else:
-                    eachBulletImg, eachBulletImgRect = self.initImgSrc(eachBullet.srcImg, scale=NormalEnemyBullet.scale)
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-            # 敌人爆能束子弹情形
-            elif(eachBullet.__class__.__name__ == "EnemyBlasterBullet"):
-                # 未爆炸时，显示正常图像
-                if(not eachBullet.isExplosion):
-                    eachBulletImg = self.enemyBlasterBulletImg
-                    eachBulletImgRect = eachBulletImg.get_rect()
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-                # 爆炸时，每帧都要单独考虑显示爆炸图像
-                else:
-                    eachBulletImg, eachBulletImgRect = self.initImgSrc(eachBullet.srcImg, scale=EnemyBlasterBullet.scale)
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-            # 死星光束情形
-            elif(eachBullet.__class__.__name__ == "DeathStarBeamBullet"):
-                # 未爆炸时，显示正常图像
-                if(not eachBullet.isExplosion):
-                    eachBulletImg = self.deathStarBeamBulletImg
-                    eachBulletImgRect = eachBulletImg.get_rect()
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-                # 爆炸时，每帧都要单独考虑显示爆炸图像
-                else:
-                    eachBulletImg, eachBulletImgRect = self.initImgSrc(eachBullet.srcImg, scale=DeathStarBeamBullet.scale)
-                    eachBulletImgRect.centerx = eachBullet.pos[0]
-                    eachBulletImgRect.centery = eachBullet.pos[1]
-            self.screen.blit(eachBulletImg, eachBulletImgRect)
+        # 子弹显示，按子弹类型编号查表
+        bulletPool = self.stage.bulletContainer
+        n = bulletPool.size
+        for (eachBulletPos, eachTypeId, eachFrame, isAlive) in zip(bulletPool.pos[:n].tolist(), bulletPool.typeId[:n].tolist(), bulletPool.explosionFrame[:n].tolist(), bulletPool.alive[:n].tolist()):
+            if(not isAlive):
+                continue
+            # 未爆炸时，显示正常图像
+            if(eachFrame == 0):
+                eachBulletImg = self.bulletImgList[eachTypeId]
+                eachBulletImgRect = eachBulletImg.get_rect()
+            # 爆炸时，每帧都要单独考虑显示爆炸图像
+            else:
+                eachBulletType = bulletTypeRegistry[eachTypeId]
+                eachBulletImg, eachBulletImgRect = self.initImgSrc(eachBulletType.explosionImgSeq[eachFrame], scale=eachBulletType.scale)
+            eachBulletImgRect.centerx = eachBulletPos[0]
+            eachBulletImgRect.centery = eachBulletPos[1]
+            self.blit(eachBulletImg, eachBulletImgRect)
         # 道具显示
         for eachItem in self.stage.itemContainer:
             eachItemImg, eachItemImgRect = self.initImgSrc(eachItem.srcImg, scale=1)
             eachItemImgRect.centerx = eachItem.pos[0]
             eachItemImgRect.centery = eachItem.pos[1]
-            self.screen.blit(eachItemImg, eachItemImgRect)
+            self.blit(eachItemImg, eachItemImgRect)
         # 血条显示
         self.showPlayerHp()
         if(self.stage.isBossOnstage()):
             self.showBossHp()
+        # 耗时面板显示
+        if(DisplayConfig.doShowProfiler):
+            self.showProfiler()
         return
 
-    def playerMove(self) -> None:
+    def blit(self, img, rect):
         """
-            在每一帧的循环中，更新玩家移动信息
+            将图像贴到窗口上，并记录绘制的区域
+
+            Parameters
+            ----------
+            img : Surface
+                图像
+            rect : Rect / float[2]
+                图像的位置
         """
-        if(pygame.key.get_pressed()[pygame.K_w]):
-            self.stage.playerMove(0)
-        if(pygame.key.get_pressed()[pygame.K_a]):
-            self.stage.playerMove(1)
-        if(pygame.key.get_pressed()[pygame.K_s]):
-            self.stage.playerMove(2)
-        if(pygame.key.get_pressed()[pygame.K_d]):
-            self.stage.playerMove(3)
+        self.currRectList.append(self.screen.blit(img, rect))
 
-    def playerFire(self) -> None:
+    def drawRect(self, color, rect, width=0):
         """
-            在每一帧的循环中，判断玩家是否发射子弹
+            在窗口上画矩形，并记录绘制的区域
+
+            Parameters
+            ----------
+            color : int[3]
+                颜色
+            rect : Rect
+                矩形
+            width : int
+                边框宽度，为0时填充
         """
-        if(pygame.key.get_pressed()[pygame.K_k]):
-            self.stage.playerFire()
+        self.currRectList.append(pygame.draw.rect(self.screen, color, rect, width=width))
 
-    def bulletMove(self) -> None:
+    def present(self):
         """
-            随着每一帧的更新，刷新子弹的位置
+            将本帧绘制的内容更新到窗口
+            脏矩形模式下只更新上一帧和本帧绘制过的区域，面积过大时改为整屏更新
         """
-        self.stage.updateFire()
+        if(not DisplayConfig.doUseDirtyRect or self.needFullRedraw):
+            pygame.display.update()
+        else:
+            dirtyRectList = self.prevRectList + self.currRectList
+            dirtyArea = sum([eachRect.width * eachRect.height for eachRect in dirtyRectList])
+            screenArea = self.screen.get_width() * self.screen.get_height()
+            if(dirtyArea > Display.DIRTY_RECT_MAX_RATIO * screenArea):
+                pygame.display.update()
+            else:
+                pygame.display.update(dirtyRectList)
+        self.prevRectList = self.currRectList
+        self.needFullRedraw = False
 
-    def updateTimeStamp(self) -> None:
+    def getPlayerInput(self) -> int:
         """
-            更新时间戳
+            在每一帧的循环中，读取玩家的按键状态
+
+            Returns
+            -------
+            playerInput : int
+                由PlayerInput中的各位组合而成的按键状态
         """
-        FRAME_INTERV = 17
-        pygame.time.delay(FRAME_INTERV)
-        self.stage.timeStamp += FRAME_INTERV
+        pressed = pygame.key.get_pressed()
+        playerInput = 0
+        if(pressed[pygame.K_w]):
+            playerInput |= PlayerInput.UP
+        if(pressed[pygame.K_a]):
+            playerInput |= PlayerInput.LEFT
+        if(pressed[pygame.K_s]):
+            playerInput |= PlayerInput.DOWN
+        if(pressed[pygame.K_d]):
+            playerInput |= PlayerInput.RIGHT
+        if(pressed[pygame.K_k]):
+            playerInput |= PlayerInput.FIRE
+        return playerInput
 
     def initImgSrc(self, imgSrc, scale):
         """
@@ -233,99 +322,47 @@ class Display:
             ----------
             imgSrc : string
                 素材图像名
-            scale : float
+            scale : float / float[2]
                 素材拉伸比例
 
             Returns
             -------
             img : Surface
-                素材图像
+                素材图像，来自图像缓存，不可修改
             rect : pygame.Rect
-                图像边框
+                图像边框，每次调用都是新的对象
         """
-        img = pygame.image.load(imgSrc)
-        rect_org = img.get_rect()
-        img = pygame.transform.scale(img, (rect_org.size[0] * scale, rect_org.size[1] * scale))
+        img = self.surfaceCache.get(imgSrc, scale)
         rect = img.get_rect()
         return [img, rect]
 
-    def epUpdate(self):
-        """
-            更新敌人和玩家状态（包括物品，物品实在是不想再单独搞个方法了……）
-        """
-        self.stage.enemySpan() # 敌人生成
-        self.stage.enemyFire() # 敌人发射子弹
-        self.stage.enemyStateUpdate() # 敌人状态更新
-        self.stage.playerStateUpdate() # 玩家状态更新
-        self.stage.itemMove() # 物品移动
-
     def showPlayerHp(self):
         """
             显示玩家血条
         """
-        # 底板绘制
-        pygame.draw.rect(self.screen, (0, 0, 0), pygame.Rect(0, self.stage.screenSize[1], self.stage.screenSize[0], self.hpInfoHeight))
-        # 边框绘制
-        pygame.draw.rect(self.screen, (255, 255, 255), pygame.Rect(0, self.stage.screenSize[1], self.stage.screenSize[0], self.hpInfoHeight), width=1)
-        # 血条贴出
-        scaleX = 1.2
-        scaleY = 1
-        hpBarImg = pygame.image.load("img/hpBar.png")
-        hpBarImgRect = hpBarImg.get_rect()
-        hpBarImg = pygame.transform.scale(hpBarImg, (round(hpBarImgRect.size[0] * scaleX), round(hpBarImgRect.size[1] * scaleY)))
-        hpBarImgRect = hpBarImg.get_rect()
-        hpBarImgRect.centerx = self.stage.screenSize[0] / 2 + 36
-        hpBarImgRect.centery = self.stage.screenSize[1] + self.hpInfoHeight / 2
-        self.screen.blit(hpBarImg, hpBarImgRect)
-        # 按扣血量百分比遮住血条的相应部分
-        imgX = [hpBarImgRect.centerx - hpBarImgRect.size[0] / 2, hpBarImgRect.centerx + hpBarImgRect.size[0] / 2]
-        imgY = [hpBarImgRect.centery - hpBarImgRect.size[1] / 2, hpBarImgRect.centery + hpBarImgRect.size[1] / 2]
-        hpRemainRatio = self.stage.player.hp / self.stage.player.hpMax
-        maskX = [imgX[0] + (imgX[1] - imgX[0]) * hpRemainRatio, imgX[1]]
-        maskY = [imgY[0], imgY[1]]
-        maskRect = pygame.Rect(maskX[0], maskY[0], maskX[1]-maskX[0], maskY[1]-maskY[0])
-        pygame.draw.rect(self.screen, (0, 0, 0), maskRect)
-        # 在血条左侧显示玩家的图标
-        playerIcon, playerIconRect = self.initImgSrc(Player.srcImg, scale=2)
-        playerIconRect.centerx = 40
-        playerIconRect.centery = 625
-        self.screen.blit(playerIcon, playerIconRect)
-        # 血量文字显示
-        if(DisplayConfig.doShowHpText):
-            font = pygame.font.SysFont(None, 32)
-            if(self.stage.player.hpMax >= 1e8):
-                img = font.render('%.3e / %.3e' % (self.stage.player.hp, self.stage.player.hpMax), True, (255, 255, 255))
-            else:
-                img = font.render('%d / %d' % (self.stage.player.hp, self.stage.player.hpMax), True, (255, 255, 255))
-            self.screen.blit(img, (0.25 * self.stage.screenSize[0], 615))
+        self.blit(self.hud.getPlayerPanel(self.stage.player, DisplayConfig.doShowHpText), (0, self.stage.screenSize[1]))
 
     def showBossHp(self):
         """
             显示BOSS的血条（如果正在进行BOSS战）
         """
-        # 搜索BOSS
-        for eachEnemy in self.stage.enemyContainer:
-            if(eachEnemy.__class__.__name__ in self.stage.bossName):
-                boss = eachEnemy
-                break
-        # 血量百分比计算
-        bossHpRatio = boss.hp / boss.maxHp
-        # 血条内容绘制
-        pygame.draw.rect(self.screen, (255, 0, 0), pygame.Rect(0.25 * self.stage.screenSize[0], 15, bossHpRatio * 0.7 * self.stage.screenSize[0], 20), width=0)
-        # 血条边框绘制
-        pygame.draw.rect(self.screen, (255, 255, 255), pygame.Rect(0.25 * self.stage.screenSize[0], 15, 0.7 * self.stage.screenSize[0], 20), width=1)        
-        # BOSS文字显示
-        font = pygame.font.SysFont(None, 32)
-        img = font.render('BOSS', True, (255, 255, 255))
-        self.screen.blit(img, (0.05 * self.stage.screenSize[0], 15))
-        # 血量文字显示
-        if(DisplayConfig.doShowHpText):
-            font = pygame.font.SysFont(None, 32)
-            if(boss.maxHp >= 1e8):
-                img = font.render('%.3e / %.3e' % (boss.hp, boss.maxHp), True, (255, 255, 255))
-            else:
-                img = font.render('%d / %d' % (boss.hp, boss.maxHp), True, (255, 255, 255))
-            self.screen.blit(img, (0.3 * self.stage.screenSize[0], 15))
+        self.blit(self.hud.getBossBar(self.stage.boss, DisplayConfig.doShowHpText), (0, 15))
+
+    def showProfiler(self):
+        """
+            显示各阶段耗时的p50/p99以及实体数量，每隔PROFILER_REFRESH_INTERV帧重新统计一次
+        """
+        if(len(self.profilerImgList) == 0 or self.profiler.frameCount % Display.PROFILER_REFRESH_INTERV == 0):
+            summary = self.profiler.summary()
+            font = self.hud.smallFont
+            lineList = ["%-18s %6s %6s" % ("ms", "p50", "p99")]
+            for (phaseName, phaseTime) in summary["phases"].items():
+                lineList.append("%-18s %6.2f %6.2f" % (phaseName, phaseTime["p50"], phaseTime["p99"]))
+            lineList.append("%-18s %6.2f %6.2f" % ("frame", summary["frame"]["p50"], summary["frame"]["p99"]))
+            lineList.append("  ".join(["%s %d" % (name, count["last"]) for (name, count) in summary["counts"].items()]))
+            self.profilerImgList = [font.render(eachLine, True, (0, 255, 0)) for eachLine in lineList]
+        for (i, eachImg) in enumerate(self.profilerImgList):
+            self.blit(eachImg, (5, 45 + 14 * i))
 
     def showCrashBox(self):
         """
@@ -333,10 +370,17 @@ class Display:
         """
         # 显示敌人的碰撞箱
         for eachEnemy in self.stage.enemyContainer:
-            pygame.draw.rect(self.screen, (255, 255, 255), pygame.Rect(eachEnemy.pos[0]-eachEnemy.crashBox[0], eachEnemy.pos[1]-eachEnemy.crashBox[1], 2*eachEnemy.crashBox[0]+1, 2*eachEnemy.crashBox[1]+1), width=1)
+            self.drawRect((255, 255, 255), pygame.Rect(eachEnemy.pos[0]-eachEnemy.crashBox[0], eachEnemy.pos[1]-eachEnemy.crashBox[1], 2*eachEnemy.crashBox[0]+1, 2*eachEnemy.crashBox[1]+1), width=1)
         # 显示玩家的碰撞箱
-        pygame.draw.rect(self.screen, (255, 255, 255), pygame.Rect(self.stage.player.pos[0]-self.stage.player.crashBox[0], self.stage.player.pos[1]-self.stage.player.crashBox[1], 2*self.stage.player.crashBox[0]+1, 2*self.stage.player.crashBox[1]+1), width=1)
+        self.drawRect((255, 255, 255), pygame.Rect(self.stage.player.pos[0]-self.stage.player.crashBox[0], self.stage.player.pos[1]-self.stage.player.crashBox[1], 2*self.stage.player.crashBox[0]+1, 2*self.stage.player.crashBox[1]+1), width=1)
 
 if __name__ == "__main__":
-    display = Display()
+    parser = argparse.ArgumentParser(description="SkyWars")
+    parser.add_argument("--seed", type=int, default=None, help="随机数种子，默认随机")
+    parser.add_argument("--record", default=None, help="把每一帧的按键录制到该回放文件，可以用replay.py重放")
+    parser.add_argument("--assetTime", action="store_true", help="启动时输出各图像的读取耗时")
+    args = parser.parse_args()
+
+    DisplayConfig.doReportAssetLoad = args.assetTime
+    display = Display(args.seed, args.record)
     display.loop()
@@ -1,14 +1,51 @@
 import random
 import numpy as np
-from pygame.constants import SYSTEM_CURSOR_HAND
+from bullet import NormalEnemyBullet, EnemyBlasterBullet, DeathStarBeamBullet
+from bulletPattern import Volley, Ring, Aimed, Rotating, RandomOrigin
+from aimMath import aimDirection
+
+def isPhaseCrossed(timeStamp, frameInterv, period, phase=0):
+    """
+        本帧(timeStamp-frameInterv, timeStamp]内是否跨过了周期中的phase时刻，步长较大时也不会漏掉
+
+        Parameters
+        ----------
+        timeStamp : float
+            时间戳，单位：ms
+        frameInterv : float
+            本帧推进的时间，单位：ms
+        period : float
+            周期，单位：秒
+        phase : float
+            周期内的时刻，单位：秒
+    """
+    return ((timeStamp - frameInterv) / 1e3 - phase) % period > (timeStamp / 1e3 - phase) % period
 
 class BaseEnemy:
 
+    # maxHp只有BOSS才有
+    __slots__ = ("hp", "atk", "defen", "_crashBox", "_velocity", "_pos", "crashBoxScale", "lastTimeFired", "handle", "firePos", "fireInterv", "maxHp", "container", "row")
+
     img = None
     imgRect = None
 
+    # 是否为BOSS，BOSS在场时不生成新的敌人
+    isBoss = False
+
+    # 运动方式：为True时直线运动和横向反弹由敌人容器批量完成，为False时整个运动由updateMove逐个处理
+    isLinearMover = True
+    # 批量运动之后是否还需要调用afterMove（切换运动模式、放出敌人等）
+    hasMoveHook = False
+    # 是否瞄准玩家，为True时指向玩家的方向由敌人容器每帧整块算出，通过getAim读取
+    aimsAtPlayer = False
+
+    # 发射的子弹类型，以及每个炮口一次发射的弹幕模式，子类可以覆盖
+    bulletClass = NormalEnemyBullet
+    bulletPattern = Volley([[0, 300]])
+
     """
         敌人基类
+        子类的构造函数均为(pos, rng)，rng为随机数生成器，由Stage传入，保证同一种子下可复现
 
         Attributes
         ----------
@@ -19,13 +56,15 @@ class BaseEnemy:
         defen : float
             防御力
         srcImg : string
-            素材图片路径
+            素材图片路径（类属性）
         crashBox : float[2]
             敌人的碰撞箱，数组两个元素分别代表在x/y方向上距中心的距离
         velocity : float[2]
-            x和y方向移动速度，速度可以被stage修改
+            x和y方向移动速度，单位：像素/秒，速度可以被stage修改
         scale : float
-            图像拉伸比例
+            图像拉伸比例（类属性）
+        crashBoxScale : float
+            碰撞箱的放大比例，由构造函数的scale参数给出
         pos : float[2]
             当前所处位置
         firePos : float[2][]
@@ -38,29 +77,202 @@ class BaseEnemy:
             贴图
         imgRect : Rect
             贴图的矩形
+        handle : int
+            在敌人容器中的句柄，加入容器前为None
+        container : KinematicContainer
+            所在的敌人容器，加入后pos、velocity、crashBox均为容器数组中对应行的视图，未加入或已被移除时为None
+        row : int
+            在敌人容器数组中的行号
     """
     def __init__(self, hp, atk, defen, srcImg, crashBox, velocity, scale, pos):
+        self.container = None
+        self.row = None
         self.hp = hp
         self.atk = atk
         self.defen = defen
-        self.srcImg = srcImg
         self.crashBox = crashBox
         self.velocity = velocity
         self.pos = pos
-        self.scale = scale
+        self.crashBoxScale = scale
         self.lastTimeFired = 0 # 初始化最近发射时间戳
+        self.handle = None
         self.firePos = None
         self.fireInterv = None
-        
-    def move(self):
+
+    @property
+    def pos(self):
+        if(self.container is None):
+            return self._pos
+        return self.container.pos[self.row]
+
+    @pos.setter
+    def pos(self, value):
+        if(self.container is None):
+            self._pos = value
+        else:
+            self.container.pos[self.row] = value
+
+    @property
+    def velocity(self):
+        if(self.container is None):
+            return self._velocity
+        return self.container.velocity[self.row]
+
+    @velocity.setter
+    def velocity(self, value):
+        if(self.container is None):
+            self._velocity = value
+        else:
+            self.container.velocity[self.row] = value
+
+    @property
+    def crashBox(self):
+        if(self.container is None):
+            return self._crashBox
+        return self.container.crashBox[self.row]
+
+    @crashBox.setter
+    def crashBox(self, value):
+        if(self.container is None):
+            self._crashBox = value
+        else:
+            self.container.crashBox[self.row] = value
+
+    def getAim(self, stage):
+        """
+            指向玩家的单位向量，与玩家重合时为零向量
+
+            Parameters
+            ----------
+            stage : Stage
+                敌人所在的场景
+        """
+        if(self.aimsAtPlayer and self.container is not None):
+            return self.container.aim[self.row]
+        return aimDirection(self.pos, stage.player.pos)
+
+    def unbind(self):
+        """
+            从敌人容器中移除后，取回自己的位置、速度和碰撞箱
+        """
+        self._pos = self.container.pos[self.row].tolist()
+        self._velocity = self.container.velocity[self.row].tolist()
+        self._crashBox = self.container.crashBox[self.row].tolist()
+        self.container = None
+        self.row = None
+
+    def move(self, dt):
         """
             敌人最基本的移动方式，左右来回，稳步前进
+
+            Parameters
+            ----------
+            dt : float
+                时间步长，单位：s
         """
         vx = self.velocity[0] # 水平方向上的速度
         vy = self.velocity[1] # 竖直方向上的速度
         # 更新位置
-        self.pos[0] += vx
-        self.pos[1] += vy
+        self.pos[0] += vx * dt
+        self.pos[1] += vy * dt
+
+    def bounce(self, stage, dt):
+        """
+            如果下一步即将横向出界，则立刻切换水平方向
+
+            Parameters
+            ----------
+            stage : Stage
+                敌人所在的场景
+            dt : float
+                时间步长，单位：s
+        """
+        newPos = [self.pos[0]+self.velocity[0]*dt, self.pos[1]+self.velocity[1]*dt]
+        if(stage.isOutside(newPos)):
+            if(newPos[0] < 0 or newPos[0] >= stage.screenSize[0]): # 横向出界
+                self.velocity[0] = -self.velocity[0]
+
+    def updateMove(self, stage, dt):
+        """
+            每一帧的运动：即将越界时先切换方向，再移动，与敌人容器的批量运动相同
+            isLinearMover为False（运动方式特殊）的敌人覆盖此方法，由Stage逐个调用
+
+            Parameters
+            ----------
+            stage : Stage
+                敌人所在的场景
+            dt : float
+                时间步长，单位：s
+        """
+        self.bounce(stage, dt)
+        self.move(dt)
+        self.afterMove(stage, dt)
+
+    def afterMove(self, stage, dt):
+        """
+            批量运动之后的处理（切换运动模式、放出敌人等），hasMoveHook为True的敌人覆盖此方法
+
+            Parameters
+            ----------
+            stage : Stage
+                敌人所在的场景
+            dt : float
+                时间步长，单位：s
+        """
+        pass
+
+    def fire(self, stage):
+        """
+            发射子弹：间隔时间足够时，按bulletPattern算出本次所有炮口的全部子弹，整批加入场景的子弹容器
+
+            Parameters
+            ----------
+            stage : Stage
+                敌人所在的场景
+        """
+        # 本帧内间隔时间足够的每个时刻各发射一次，间隔时间不够则不发射子弹
+        for fireTime in stage.getFireTimeList(self.lastTimeFired, self.fireInterv):
+            origin = np.add(self.firePos, self.pos)
+            # 敌人在本帧移动之前开火，大步长中途发射时按当前速度推算炮口在发射时刻的位置
+            lead = (fireTime - stage.timeStamp + stage.frameInterv - stage.baseFrameInterv) / 1e3
+            if(lead > 0):
+                origin += np.multiply(self.velocity, lead)
+            self.emit(stage, self.bulletPattern, self.bulletClass, origin, fireTime)
+            # 发射子弹后，更新敌人最近发射时间
+            self.lastTimeFired = fireTime
+
+    def emit(self, stage, pattern, bulletClass, origin, fireTime):
+        """
+            按弹幕模式整批发射一轮子弹
+
+            Parameters
+            ----------
+            stage : Stage
+                敌人所在的场景
+            pattern : BulletPattern
+                弹幕模式
+            bulletClass : class
+                子弹类
+            origin : float[m][2]
+                各炮口的绝对位置
+            fireTime : float
+                发射时刻，早于当前时间戳时子弹已经飞行了这段时间
+        """
+        (pos, velocity) = pattern.emit(self, stage, origin, fireTime)
+        stage.bulletContainer.extend(bulletClass, pos, velocity, self.atk, (stage.timeStamp - fireTime) / 1e3)
+
+    def isReleaseTime(self, stage, period=3):
+        """
+            本帧是否刚好跨过了一个放出敌人的周期
+
+            Parameters
+            ----------
+            stage : Stage
+                敌人所在的场景
+            period : float
+                放出敌人的周期，单位：秒
+        """
+        return isPhaseCrossed(stage.timeStamp, stage.frameInterv, period)
 
     def crashBoxRescale(self):
         """
@@ -69,8 +281,8 @@ class BaseEnemy:
             Parameters
             ----------
         """
-        self.crashBox[0] *= self.scale
-        self.crashBox[1] *= self.scale
+        self.crashBox[0] *= self.crashBoxScale
+        self.crashBox[1] *= self.crashBoxScale
 
     def death(self):
         """
@@ -83,39 +295,43 @@ class OneHpEnemy(BaseEnemy):
         1血敌人类，被打一下就没了
     """
     
+    __slots__ = ()
+
     srcImg = "img/oneHpEnemy.png"
     scale = 5
 
-    def __init__(self, pos):
+    def __init__(self, pos, rng=random):
         hp = 1
         atk = 5
         defen = 0
         crashBox = [4, 3]
-        velocity = [0, 3]
+        velocity = [0, 180]
         BaseEnemy.__init__(self, hp, atk, defen, OneHpEnemy.srcImg, crashBox, velocity, OneHpEnemy.scale, pos=pos)
         self.crashBoxRescale()
         self.firePos = [[0,35]] # 炮口位置
         # 开火间隔，加上一定的高斯误差，看起来更多样
         mu = 800
         std = 33
-        self.fireInterv = random.gauss(mu, std)
+        self.fireInterv = rng.gauss(mu, std)
         while(self.fireInterv <= 0):
-            self.fireInterv = random.gauss(mu, std)
+            self.fireInterv = rng.gauss(mu, std)
 
 class DoubleWarrior(BaseEnemy):
     """
         双排战士，血量中，一次连排发射两个子弹，径直纵向移动，移动速度低，射击速度中等，防御力中
     """
 
+    __slots__ = ()
+
     srcImg = "img/DoubleWarrior.png"
     scale = 5
 
-    def __init__(self, pos):
+    def __init__(self, pos, rng=random):
         hp = 25
         atk = 10
         defen = 5
         crashBox = [4, 3]
-        velocity = [0, 1.5]
+        velocity = [0, 90]
         BaseEnemy.__init__(self, hp, atk, defen, OneHpEnemy.srcImg, crashBox, velocity, OneHpEnemy.scale, pos=pos)
         self.crashBoxRescale()
         self.firePos = [[-28,9], [28,9]] # 炮口位置
@@ -126,15 +342,19 @@ class TripleShooter(BaseEnemy):
         三线射手，血量低，一次向三个方向发射子弹，径直纵向移动，移动速度中等，射击速度低
     """
 
+    __slots__ = ()
+
     srcImg = "img/TripleShooter.png"
     scale = 5
 
-    def __init__(self, pos):
+    bulletPattern = Volley([[0, 300], [-60, 300], [60, 300]])
+
+    def __init__(self, pos, rng=random):
         hp = 15
         atk = 8
         defen = 5
         crashBox = [4, 3]
-        velocity = [0, 2]
+        velocity = [0, 120]
         BaseEnemy.__init__(self, hp, atk, defen, OneHpEnemy.srcImg, crashBox, velocity, OneHpEnemy.scale, pos=pos)
         self.crashBoxRescale()
         self.firePos = [[0,30]] # 炮口位置
@@ -145,15 +365,20 @@ class BulletRainShooter(BaseEnemy):
         弹幕敌人，会往一圈方向发射多个子弹，形成环状区域的弹幕攻击，属于小BOSS级别
     """
 
+    __slots__ = ()
+
     srcImg = "img/BulletRainShooter.png"
     scale = 5
+    isBoss = True
+
+    bulletPattern = Volley([[300, 0], [212.13, 212.13], [0, 300], [-212.13, 212.13], [-300, 0], [-212.13, -212.13], [0, -300], [212.13, -212.13]])
 
-    def __init__(self, pos):
+    def __init__(self, pos, rng=random):
         hp = 250
         atk = 15
         defen = 5
         crashBox = [8, 2]
-        velocity = [1, 0]
+        velocity = [60, 0]
         BaseEnemy.__init__(self, hp, atk, defen, OneHpEnemy.srcImg, crashBox, velocity, OneHpEnemy.scale, pos=pos)
         self.crashBoxRescale()
         self.firePos = [[0,40]] # 炮口位置
@@ -165,22 +390,34 @@ class Sticker(BaseEnemy):
         冲锋者，发射5连并排霰弹，5秒随机横向移动模式+3秒向前突刺模式+2秒复位模式，BOSS
     """
 
+    __slots__ = ()
+
     srcImg = "img/Sticker.png"
     scale = 5
+    isBoss = True
+    hasMoveHook = True
 
-    def __init__(self, pos):
+    bulletPattern = Volley([[-40.2, 300], [-19.8, 300], [0, 300], [19.8, 300], [40.2, 300]])
+
+    def __init__(self, pos, rng=random):
         hp = 300
         atk = 5
         defen = 5
         crashBox = [10, 2]
-        velocity = [3, 0]
+        velocity = [180, 0]
         BaseEnemy.__init__(self, hp, atk, defen, OneHpEnemy.srcImg, crashBox, velocity, OneHpEnemy.scale, pos=pos)
         self.crashBoxRescale()
         self.firePos = [[0,40]] # 炮口位置
         self.fireInterv = 400
         self.maxHp = 300 # BOSS特有的血量上限
 
-    def modeSwitch(self, timeStamp):
+    def afterMove(self, stage, dt):
+        """
+            移动后切换运动模式
+        """
+        self.modeSwitch(stage.timeStamp, stage.frameInterv)
+
+    def modeSwitch(self, timeStamp, frameInterv):
         """
             模式切换，体现为速度更改
 
@@ -188,65 +425,87 @@ class Sticker(BaseEnemy):
             ----------
             timeStamp : float
                 时间戳
+            frameInterv : float
+                本帧推进的时间，单位：ms
         """
         second = timeStamp / 1e3
-        # 复位后
-        if(0 <= second % 10 < 0.1):
-            self.velocity = [3, 0]
+        # 复位后，只在跨过周期起点的一帧设置速度
+        if(isPhaseCrossed(timeStamp, frameInterv, 10)):
+            self.velocity = [180, 0]
         # 普通模式
-        elif(0.1 <= second % 10 < 5):
+        elif(second % 10 < 5):
             pass
         # 冲刺模式
         elif(5 <= second % 10 < 8):
-            self.velocity = [0, 2]
+            self.velocity = [0, 120]
         # 复位模式
         else:
-            self.velocity = [0, -3]
+            self.velocity = [0, -180]
 
 class Tracker(BaseEnemy):
     """
         跟踪者，位置上不断接近玩家，子弹对着玩家射
     """
 
+    __slots__ = ()
+
     srcImg = "img/Tracker.png"
     scale = 5
+    isBoss = True
+    isLinearMover = False
+    aimsAtPlayer = True
+
+    bulletPattern = Aimed(300)
 
-    def __init__(self, pos):
+    def __init__(self, pos, rng=random):
         hp = 300
         atk = 15
         defen = 5
         crashBox = [8, 8]
-        velocity = [3, 0]
+        velocity = [180, 0]
         BaseEnemy.__init__(self, hp, atk, defen, OneHpEnemy.srcImg, crashBox, velocity, OneHpEnemy.scale, pos=pos)
         self.crashBoxRescale()
         self.firePos = [[0,0]] # 炮口位置
         self.fireInterv = 200
         self.maxHp = 300 # BOSS特有的血量上限
 
-    def move(self, playerPos):
+    def updateMove(self, stage, dt):
+        """
+            位置上不断接近玩家
+        """
+        self.bounce(stage, dt)
+        self.move(dt, self.getAim(stage))
+
+    def move(self, dt, aim):
         """
             移动方法，覆盖本身自带的
 
             Parameters
             ----------
-            playerPos : float[2]
-                玩家的位置
+            dt : float
+                时间步长，单位：s
+            aim : float[2]
+                指向玩家的单位向量
         """
-        dX = playerPos[0] - self.pos[0]
-        dY = playerPos[1] - self.pos[1]
-        L = (dX**2 + dY**2)**0.5
-        self.pos[0] += dX / L * 2
-        self.pos[1] += dY / L * 2
+        self.pos[0] += aim[0] * 120 * dt
+        self.pos[1] += aim[1] * 120 * dt
 
 class Windmiller(BaseEnemy):
     """
         风车，在中心矩形路线移动，并旋转着向四个方向发射子弹
     """
 
+    __slots__ = ()
+
     srcImg = "img/Windmiller.png"
     scale = 7
+    isBoss = True
+    hasMoveHook = True
 
-    def __init__(self, pos):
+    # 旋转着向四个方向发射子弹，5秒转一圈
+    bulletPattern = Rotating(Ring(4, 300), 5)
+
+    def __init__(self, pos, rng=random):
         hp = 350
         atk = 7
         defen = 5
@@ -258,6 +517,12 @@ class Windmiller(BaseEnemy):
         self.fireInterv = 100
         self.maxHp = 350 # BOSS特有的血量上限
 
+    def afterMove(self, stage, dt):
+        """
+            移动后切换运动模式
+        """
+        self.modeSwitch(stage.timeStamp)
+
     def modeSwitch(self, timeStamp):
         """
             模式切换，体现为速度更改
@@ -270,45 +535,33 @@ class Windmiller(BaseEnemy):
         second = timeStamp / 1e3
         # 左
         if(0 <= second % 10 < 2.5):
-            self.velocity = [-1, 0]
+            self.velocity = [-60, 0]
         # 下
         elif(2.5 <= second % 10 < 5):
-            self.velocity = [0, 1]
+            self.velocity = [0, 60]
         # 右
         elif(5 <= second % 10 < 7.5):
-            self.velocity = [1, 0]
+            self.velocity = [60, 0]
         # 上
         else:
-            self.velocity = [0, -1]
-
-    def getBulletVelocity(self, timeStamp):
-        """
-            根据时间戳，获取子弹的速度（方向）
-
-            Returns
-            -------
-            vList : list
-                四个方向的子弹的速度
-        """
-        second = timeStamp / 1e3
-        period = 5 # 子弹发射方向旋转一圈所需时间，单位：秒
-        theta = -2 * np.pi * (second % period) / period
-        v1 = [5 * np.cos(theta), 5 * np.sin(theta)]
-        v2 = [5 * -np.sin(theta), 5 * np.cos(theta)]
-        v3 = [5 * -np.cos(theta), 5 * -np.sin(theta)]
-        v4 = [5 * np.sin(theta), 5 * -np.cos(theta)]
-        vList = [v1, v2, v3, v4]
-        return vList
+            self.velocity = [0, -60]
 
 class TieVader(BaseEnemy):
     """
         钛战机（Vader），8秒横向移动，2秒追踪玩家
     """
 
+    __slots__ = ()
+
     srcImg = "img/TieVader.png"
     scale = 5
+    isBoss = True
+    hasMoveHook = True
+    aimsAtPlayer = True
 
-    def __init__(self, pos):
+    bulletClass = EnemyBlasterBullet
+
+    def __init__(self, pos, rng=random):
         hp = 400
         atk = 10
         defen = 5
@@ -320,7 +573,13 @@ class TieVader(BaseEnemy):
         self.fireInterv = 400
         self.maxHp = 400 # BOSS特有的血量上限
 
-    def modeSwitch(self, timeStamp, playerPos):
+    def afterMove(self, stage, dt):
+        """
+            移动后切换运动模式
+        """
+        self.modeSwitch(stage.timeStamp, stage.frameInterv, self.getAim(stage))
+
+    def modeSwitch(self, timeStamp, frameInterv, aim):
         """
             模式切换，体现为速度更改
 
@@ -328,19 +587,18 @@ class TieVader(BaseEnemy):
             ----------
             timeStamp : float
                 时间戳
-            playerPos : float[2]
-                玩家位置
+            frameInterv : float
+                本帧推进的时间，单位：ms
+            aim : float[2]
+                指向玩家的单位向量
         """
         second = timeStamp / 1e3
         # 2秒追击
         if(8 <= second % 10 < 10):
-            dX = playerPos[0] - self.pos[0]
-            dY = playerPos[1] - self.pos[1]
-            L = (dX**2 + dY**2)**0.5
-            self.velocity = [5 * dX / L, 5 * dY / L]
-        # 8秒横向移动
-        elif(0 <= second % 10 < 0.1):
-            self.velocity = [3, 0]
+            self.velocity = [300 * aim[0], 300 * aim[1]]
+        # 8秒横向移动，只在跨过周期起点的一帧设置速度
+        elif(isPhaseCrossed(timeStamp, frameInterv, 10)):
+            self.velocity = [180, 0]
         else:
             pass
 
@@ -349,38 +607,56 @@ class StarDestroyer(BaseEnemy):
         歼星舰，本体只能左右移动，但却可以不断地放出普通钛战机对玩家进行攻击。本体也能发射爆能束，且攻击力极高
     """
 
+    __slots__ = ()
+
     srcImg = "img/StarDestroyer.png"
     scale = 5
+    isBoss = True
+    hasMoveHook = True
+
+    bulletClass = EnemyBlasterBullet
+    bulletPattern = Volley([[0, 450]])
 
-    def __init__(self, pos):
+    def __init__(self, pos, rng=random):
         hp = 600
         atk = 25
         defen = 5
         crashBox = [8, 10]
-        velocity = [3, 0]
+        velocity = [180, 0]
         BaseEnemy.__init__(self, hp, atk, defen, OneHpEnemy.srcImg, crashBox, velocity, OneHpEnemy.scale, pos=pos)
         self.crashBoxRescale()
         self.firePos = [[0,40]] # 炮口位置
         self.fireInterv = 300
         self.maxHp = 600 # BOSS特有的血量上限
 
+    def afterMove(self, stage, dt):
+        """
+            左右移动，每3秒放出一架钛战机
+        """
+        if(self.isReleaseTime(stage)):
+            stage.addEnemy(Tie([self.pos[0], self.pos[1]], stage.rng))
+
 class Tie(BaseEnemy):
     """
         普通钛战机，斜着飞行，发射爆能束，攻击力中偏高，血量中，速度快，射速高~~（命中低）~~
     """
     
+    __slots__ = ()
+
     srcImg = "img/Tie.png"
     scale = 3
 
-    def __init__(self, pos):
+    bulletClass = EnemyBlasterBullet
+
+    def __init__(self, pos, rng=random):
         hp = 30
         atk = 15
         defen = 5
         crashBox = [6, 3]
-        if(random.random() > 0.5):
-            velocity = [1, 2]
+        if(rng.random() > 0.5):
+            velocity = [60, 120]
         else:
-            velocity = [1, 2]
+            velocity = [60, 120]
         BaseEnemy.__init__(self, hp, atk, defen, OneHpEnemy.srcImg, crashBox, velocity, OneHpEnemy.scale, pos=pos)
         self.crashBoxRescale()
         self.firePos = [[-24,24], [24,24]] # 炮口位置
@@ -392,10 +668,18 @@ class DeathStar(BaseEnemy):
         有两种爆能束可以发射，一种是普通的红色，另一种是能够摧毁行星的绿色
     """
 
+    __slots__ = ("fireInterv_beam", "fireInterv_blaster", "lastTimeFired_beam", "lastTimeFired_blaster", "firePos_beam", "firePos_blaster")
+
     srcImg = "img/DeathStar.png"
     scale = 1
+    isBoss = True
+    hasMoveHook = True
+
+    # 普通爆能束从场景顶端三个随机位置发射，光束从固定位置发射
+    blasterPattern = RandomOrigin(Volley([[0, 600]]), 3)
+    beamPattern = Volley([[0, 600]])
 
-    def __init__(self, pos):
+    def __init__(self, pos, rng=random):
         hp = 2000
         atk = 30
         defen = 5
@@ -412,7 +696,33 @@ class DeathStar(BaseEnemy):
         self.firePos_blaster = [[-50,40], [50, 40], [100, 40]]
         self.maxHp = 2000 # BOSS特有的血量上限
 
-    def modeSwitch(self, timeStamp):
+    def afterMove(self, stage, dt):
+        """
+            切换炮弹位置，每3秒随机放出3架敌机
+        """
+        # 炮弹位置切换
+        self.modeSwitch(stage.timeStamp, stage.frameInterv, stage.rng)
+        # 放出敌人
+        if(self.isReleaseTime(stage)):
+            enemyTable = [OneHpEnemy, DoubleWarrior, TripleShooter, Tie]
+            for i in range(3):
+                enemyClass = enemyTable[int(stage.rng.random() * len(enemyTable))]
+                stage.addEnemy(enemyClass([stage.rng.random() * stage.screenSize[0], 0], stage.rng))
+
+    def fire(self, stage):
+        """
+            最终BOSS有两种子弹：随机位置发射的普通爆能束，以及固定位置发射的光束，各自计算发射间隔
+        """
+        # 普通爆能束，随机生成三个位置发射
+        for fireTime in stage.getFireTimeList(self.lastTimeFired_blaster, self.fireInterv_blaster):
+            self.emit(stage, self.blasterPattern, EnemyBlasterBullet, None, fireTime)
+            self.lastTimeFired_blaster = fireTime
+        # 光束
+        for fireTime in stage.getFireTimeList(self.lastTimeFired_beam, self.fireInterv_beam):
+            self.emit(stage, self.beamPattern, DeathStarBeamBullet, [[293, 87]] * len(self.firePos_beam), fireTime)
+            self.lastTimeFired_beam = fireTime
+
+    def modeSwitch(self, timeStamp, frameInterv, rng=random):
         """
             子弹模式的切换
 
@@ -420,11 +730,18 @@ class DeathStar(BaseEnemy):
             ----------
             timeStamp : float
                 时间戳
+            frameInterv : float
+                本帧推进的时间，单位：ms
+            rng : random.Random
+                随机数生成器
         """
         second = timeStamp / 1e3
-        # 10秒发射一次光束，一次持续2秒
-        if(0 < second % 10 <= 2):
-            self.fireInterv_beam = 30
-        elif(2 < second % 10 <= 2.1):
+        # 10秒发射一次光束，一次持续2秒，光束结束时（跨过第2秒的一帧）换一个炮口位置
+        if(isPhaseCrossed(timeStamp, frameInterv, 10, 2)):
             self.fireInterv_beam = 1e4
-            self.firePos_beam = [[random.random() * 400 - 200, 40]]
+            self.firePos_beam = [[rng.random() * 400 - 200, 40]]
+        elif(0 < second % 10 <= 2):
+            self.fireInterv_beam = 30
+
+# 所有敌人类，按类名索引
+enemyClassDict = {eachClass.__name__ : eachClass for eachClass in [OneHpEnemy, DoubleWarrior, TripleShooter, BulletRainShooter, Sticker, Tracker, Windmiller, TieVader, StarDestroyer, Tie, DeathStar]}
@@ -0,0 +1,54 @@
+class FreeList:
+    """
+        按类型分别保存已回收的实体，需要新实体时优先取出回收的实体重新初始化，减少反复分配和垃圾回收
+        实体类需要定义__slots__，且构造函数会重设全部属性
+
+        Attributes
+        ----------
+        freeLists : dict
+            {实体类 : 已回收的实体[]}
+        maxSize : int
+            每种类型最多保存的实体数量
+        created : int
+            新分配的实体数量
+        reused : int
+            重新利用的实体数量
+    """
+    def __init__(self, maxSize=256):
+        self.freeLists = {}
+        self.maxSize = maxSize
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, entityClass, *args):
+        """
+            获取一个entityClass的实体，相当于entityClass(*args)
+
+            Parameters
+            ----------
+            entityClass : class
+                实体类
+            args : tuple
+                构造函数的参数
+        """
+        freeList = self.freeLists.get(entityClass)
+        if(freeList):
+            entity = freeList.pop()
+            entity.__init__(*args)
+            self.reused += 1
+            return entity
+        self.created += 1
+        return entityClass(*args)
+
+    def release(self, entity):
+        """
+            回收不再使用的实体，之后不能再持有它的引用
+
+            Parameters
+            ----------
+            entity : object
+                实体
+        """
+        freeList = self.freeLists.setdefault(entity.__class__, [])
+        if(len(freeList) < self.maxSize):
+            freeList.append(entity)
@@ -0,0 +1,140 @@
+import argparse
+import time
+from stage import Stage, PlayerInput
+
+# 允许的时间步长放大倍数：这些倍数下批量模拟的得分、存活时间、击败BOSS的时间和被命中次数与逐帧推进在统计上一致
+STEP_SCALE_CHOICES = (1, 2, 4, 8)
+
+class AutoPilot:
+    """
+        简单的自动驾驶输入：一直开火，在屏幕底部左右来回移动
+        玩家从屏幕中央出发，先向右，越过距离边界margin处一帧后掉头，在两侧之间往返
+        路线按已经过的60Hz帧数算出，每帧朝本帧结束时应到达的位置移动：放大时间步长时与逐帧推进的路线最多相差一个步长，不会累积偏移
+
+        Attributes
+        ----------
+        margin : float
+            距离边界多近时掉头
+    """
+    def __init__(self, margin=30):
+        self.margin = margin
+
+    def getTargetX(self, stage, frames) -> float:
+        """
+            逐帧推进时，经过frames帧后玩家所在的横坐标
+
+            Parameters
+            ----------
+            stage : Stage
+                场景
+            frames : int
+                经过的60Hz帧数
+        """
+        step = stage.player.velocity * Stage.baseFrameInterv / 1e3
+        # 单程的帧数：两侧各越过边距一帧
+        oneWayFrames = round((stage.screenSize[0] - 2 * self.margin) / step) + 2
+        phase = (frames + oneWayFrames // 2) % (2 * oneWayFrames)
+        return stage.screenSize[0] * 0.5 + step * (min(phase, 2 * oneWayFrames - phase) - oneWayFrames // 2)
+
+    def __call__(self, stage) -> int:
+        """
+            根据场景状态给出本帧的按键
+
+            Parameters
+            ----------
+            stage : Stage
+                场景
+        """
+        subStepCount = stage.getSubStepCount()
+        targetX = self.getTargetX(stage, (stage.tickCount + 1) * subStepCount)
+        # 本帧最多移动subStepCount步，取离目标最近的走法
+        move = round((targetX - stage.player.pos[0]) / (stage.player.velocity * stage.frameInterv / 1e3))
+        if(move > 0):
+            return PlayerInput.FIRE | PlayerInput.RIGHT
+        elif(move < 0):
+            return PlayerInput.FIRE | PlayerInput.LEFT
+        return PlayerInput.FIRE
+
+class HeadlessRunner:
+    """
+        无窗口运行器，不加载任何素材，以CPU允许的最快速度推进Stage
+
+        Attributes
+        ----------
+        stage : Stage
+            被推进的场景
+        inputPolicy : callable
+            输入策略，stage -> playerInput
+        stopOnGameOver : bool
+            玩家死亡后是否停止
+    """
+    def __init__(self, stage=None, inputPolicy=None, stopOnGameOver=True):
+        self.stage = stage if stage is not None else Stage()
+        self.inputPolicy = inputPolicy if inputPolicy is not None else AutoPilot()
+        self.stopOnGameOver = stopOnGameOver
+
+    def run(self, gameTime) -> dict:
+        """
+            推进场景，直到经过了gameTime的游戏时间或玩家死亡
+
+            Parameters
+            ----------
+            gameTime : float
+                要模拟的游戏时间，单位：ms
+
+            Returns
+            -------
+            result : dict
+                模拟的帧数、游戏时间、实际耗时等统计信息
+        """
+        return self.runTicks(int(gameTime / self.stage.frameInterv))
+
+    def runTicks(self, ticks) -> dict:
+        """
+            推进场景ticks帧，玩家死亡时提前停止（如果stopOnGameOver）
+
+            Parameters
+            ----------
+            ticks : int
+                要模拟的帧数
+
+            Returns
+            -------
+            result : dict
+                同run
+        """
+        stage = self.stage
+        startTick = stage.tickCount
+        startTime = time.perf_counter()
+        for i in range(ticks):
+            stage.tick(self.inputPolicy(stage))
+            if(self.stopOnGameOver and stage.isGameOver):
+                break
+        wallTime = time.perf_counter() - startTime
+        ticksDone = stage.tickCount - startTick
+        simTime = ticksDone * stage.frameInterv
+        return {
+            "ticks" : ticksDone,
+            "gameTime" : simTime,
+            "wallTime" : wallTime,
+            "ticksPerSec" : ticksDone / wallTime if wallTime > 0 else float("inf"),
+            "speedup" : simTime / 1e3 / wallTime if wallTime > 0 else float("inf"),
+            "score" : float(stage.score),
+            "level" : stage.level,
+            "isGameOver" : stage.isGameOver,
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="无窗口运行游戏模拟")
+    parser.add_argument("--minutes", type=float, default=10, help="模拟的游戏时间，单位：分钟")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    parser.add_argument("--god", action="store_true", help="玩家无敌，用于跑完整个流程")
+    parser.add_argument("--stepScale", type=int, default=1, choices=STEP_SCALE_CHOICES, help="时间步长放大的倍数，耗时相应减少；子弹碰撞按相对运动的轨迹判定，开火和玩家移动仍按60Hz逐帧计算")
+    args = parser.parse_args()
+
+    stage = Stage(args.seed)
+    stage.frameInterv *= args.stepScale
+    if(args.god):
+        stage.player.hp = stage.player.hpMax = 1e12
+    result = HeadlessRunner(stage).run(args.minutes * 60e3)
+    print("%d ticks, %.1f s game time in %.2f s (%.0f ticks/s, x%.1f real time), score %d, level %d%s" % (result["ticks"], result["gameTime"] / 1e3, result["wallTime"], result["ticksPerSec"], result["speedup"], result["score"], result["level"], ", game over" if result["isGameOver"] else ""))
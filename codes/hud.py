@@ -0,0 +1,137 @@
+from player import Player
+import pygame
+
+class Hud:
+    """
+        信息面板：底部的玩家血条面板、顶部的BOSS血条和暂停文字
+        字体只在创建时加载一次；面板合成后缓存，只有显示的数值或显示选项变化时才重新绘制
+
+        Attributes
+        ----------
+        screenSize : int[2]
+            场景大小（不含底部面板）
+        panelHeight : int
+            底部面板的高度
+        surfaceCache : SurfaceCache
+            图像缓存，血条和玩家图标从这里取图
+        font : Font
+            血量等文字的字体
+        smallFont : Font
+            耗时面板的字体
+        playerPanel : Surface
+            合成好的底部面板
+        playerPanelKey : tuple
+            合成playerPanel时的(hp, hpMax, 是否显示血量数值)，变化后重新合成
+        bossBar : Surface
+            合成好的BOSS血条，背景透明
+        bossBarKey : tuple
+            合成bossBar时的(hp, maxHp, 是否显示血量数值)，变化后重新合成
+        pauseImg : Surface
+            暂停文字
+    """
+    def __init__(self, screenSize, panelHeight, surfaceCache):
+        self.screenSize = screenSize
+        self.panelHeight = panelHeight
+        self.surfaceCache = surfaceCache
+        self.font = pygame.font.SysFont(None, 32)
+        self.smallFont = pygame.font.SysFont(None, 18)
+        self.playerPanel = pygame.Surface((screenSize[0], panelHeight))
+        self.playerPanelKey = None
+        self.bossBar = pygame.Surface((screenSize[0], max(20, self.font.get_linesize())), pygame.SRCALPHA)
+        self.bossBarKey = None
+        self.pauseImg = self.font.render('PAUSE', True, (255, 0, 0))
+
+    def renderHpText(self, hp, hpMax):
+        """
+            渲染血量文字，数值过大时用科学计数法
+
+            Parameters
+            ----------
+            hp : float
+                当前血量
+            hpMax : float
+                血量上限
+        """
+        if(hpMax >= 1e8):
+            return self.font.render('%.3e / %.3e' % (hp, hpMax), True, (255, 255, 255))
+        return self.font.render('%d / %d' % (hp, hpMax), True, (255, 255, 255))
+
+    def getPlayerPanel(self, player, doShowHpText):
+        """
+            获取底部的玩家血条面板，血量或显示选项变化时重新合成
+
+            Parameters
+            ----------
+            player : Player
+                玩家
+            doShowHpText : bool
+                是否显示血量数值
+
+            Returns
+            -------
+            panel : Surface
+                面板，左上角应贴在场景左下角
+        """
+        key = (player.hp, player.hpMax, doShowHpText)
+        if(key == self.playerPanelKey):
+            return self.playerPanel
+        self.playerPanelKey = key
+        panel = self.playerPanel
+        width = self.screenSize[0]
+        height = self.panelHeight
+        # 底板和边框
+        panel.fill((0, 0, 0))
+        pygame.draw.rect(panel, (255, 255, 255), pygame.Rect(0, 0, width, height), width=1)
+        # 血条贴出
+        hpBarImg = self.surfaceCache.get("img/hpBar.png", (1.2, 1))
+        hpBarImgRect = hpBarImg.get_rect()
+        hpBarImgRect.centerx = width / 2 + 36
+        hpBarImgRect.centery = height / 2
+        panel.blit(hpBarImg, hpBarImgRect)
+        # 按扣血量百分比遮住血条的相应部分
+        hpRemainRatio = player.hp / player.hpMax
+        maskX = hpBarImgRect.left + hpBarImgRect.width * hpRemainRatio
+        pygame.draw.rect(panel, (0, 0, 0), pygame.Rect(maskX, hpBarImgRect.top, hpBarImgRect.right - maskX, hpBarImgRect.height))
+        # 在血条左侧显示玩家的图标
+        playerIcon = self.surfaceCache.get(Player.srcImg, 2)
+        playerIconRect = playerIcon.get_rect()
+        playerIconRect.centerx = 40
+        playerIconRect.centery = height / 2
+        panel.blit(playerIcon, playerIconRect)
+        # 血量文字显示
+        if(doShowHpText):
+            panel.blit(self.renderHpText(player.hp, player.hpMax), (0.25 * width, 15))
+        return panel
+
+    def getBossBar(self, boss, doShowHpText):
+        """
+            获取BOSS血条，血量或显示选项变化时重新合成
+
+            Parameters
+            ----------
+            boss : BaseEnemy
+                BOSS
+            doShowHpText : bool
+                是否显示血量数值
+
+            Returns
+            -------
+            bar : Surface
+                血条，背景透明
+        """
+        key = (boss.hp, boss.maxHp, doShowHpText)
+        if(key == self.bossBarKey):
+            return self.bossBar
+        self.bossBarKey = key
+        bar = self.bossBar
+        width = self.screenSize[0]
+        bar.fill((0, 0, 0, 0))
+        # 血条内容和边框
+        bossHpRatio = boss.hp / boss.maxHp
+        pygame.draw.rect(bar, (255, 0, 0), pygame.Rect(0.25 * width, 0, bossHpRatio * 0.7 * width, 20), width=0)
+        pygame.draw.rect(bar, (255, 255, 255), pygame.Rect(0.25 * width, 0, 0.7 * width, 20), width=1)
+        # BOSS文字和血量文字
+        bar.blit(self.font.render('BOSS', True, (255, 255, 255)), (0.05 * width, 0))
+        if(doShowHpText):
+            bar.blit(self.renderHpText(boss.hp, boss.maxHp), (0.3 * width, 0))
+        return bar
@@ -10,27 +10,37 @@ class BaseItem:
             出现权重
         srcImg : string
             素材图像所在路径
-        img : Image
-            图像
-        imgRect : Rect
-            图像区域
+        imgSize : int[2]
+            图像尺寸，与素材图像保持一致，用于拾取判定，不需要读取图像
         pos : float[2]
             道具所在位置
-        velocity : float
-            道具下落速度
+        velocity : float[2]
+            道具下落速度，单位：像素/秒
+        handle : int
+            在道具容器中的句柄，加入容器前为None
     """
+
+    __slots__ = ("itemName", "pos", "velocity", "handle")
+
+    imgSize = [51, 51]
+
     def __init__(self, pos) -> None:
         self.itemName = None
-        self.appearPower = None
         self.pos = pos
-        self.velocity = [0, 3]
+        self.velocity = [0, 180]
+        self.handle = None
 
-    def move(self):
+    def move(self, dt):
         """
-            子弹移动
+            道具移动
+
+            Parameters
+            ----------
+            dt : float
+                时间步长，单位：s
         """
-        self.pos[0] += self.velocity[0]
-        self.pos[1] += self.velocity[1]
+        self.pos[0] += self.velocity[0] * dt
+        self.pos[1] += self.velocity[1] * dt
 
 class RecoverItem(BaseItem):
     """
@@ -42,6 +52,8 @@ class RecoverItem(BaseItem):
             回血量
     """
 
+    __slots__ = ("addHp",)
+
     srcImg = "./img/recoverItem.png"
     appearPower = 100
 
@@ -60,6 +72,8 @@ class AddHpLimitItem(BaseItem):
             增加血量上限的数量
     """
 
+    __slots__ = ("addHpLimit",)
+
     srcImg = "./img/addHpLimitItem.png"
     appearPower = 50
     
@@ -67,7 +81,7 @@ class AddHpLimitItem(BaseItem):
         BaseItem.__init__(self, pos)
         self.itemName = "AddHpLimitItem"
         self.addHpLimit = 0.15
-        self.velocity = [0, 4.5]
+        self.velocity = [0, 270]
 
 class EnhanceFireItem(BaseItem):
     """
@@ -79,6 +93,8 @@ class EnhanceFireItem(BaseItem):
             每秒的次数提升量
     """
 
+    __slots__ = ("addFireFreq",)
+
     srcImg = "./img/enhanceFireItem.png"
     appearPower = 50
 
@@ -86,7 +102,7 @@ class EnhanceFireItem(BaseItem):
         BaseItem.__init__(self, pos)
         self.itemName = "EnhanceFireItem"
         self.addFireFreq = 0.33
-        self.velocity = [0, 4.5]
+        self.velocity = [0, 270]
 
 class EnhanceAtkItem(BaseItem):
     """
@@ -97,6 +113,8 @@ class EnhanceAtkItem(BaseItem):
         addAtk : float = 2
     """
 
+    __slots__ = ("addAtk",)
+
     srcImg = "./img/enhanceAtkItem.png"
     appearPower = 20
 
@@ -104,7 +122,7 @@ class EnhanceAtkItem(BaseItem):
         BaseItem.__init__(self, pos)
         self.itemName = "EnhanceAtkItem"
         self.addAtk = 0.15
-        self.velocity = [0, 6]
+        self.velocity = [0, 360]
 
 class EnhanceDefenItem(BaseItem):
     """
@@ -115,6 +133,8 @@ class EnhanceDefenItem(BaseItem):
         addDefen : float = 1
     """
 
+    __slots__ = ("addDefen",)
+
     srcImg = "./img/enhanceDefenItem.png"
     appearPower = 20
 
@@ -122,7 +142,7 @@ class EnhanceDefenItem(BaseItem):
         BaseItem.__init__(self, pos)
         self.itemName = "EnhanceDefenItem"
         self.addDefen = 0.01
-        self.velocity = [0, 5]
+        self.velocity = [0, 300]
 
 class BlasterItem(BaseItem):
     """
@@ -132,13 +152,15 @@ class BlasterItem(BaseItem):
         ----------
     """
 
+    __slots__ = ()
+
     srcImg = "./img/blasterItem.png"
     appearPower = 2
 
     def __init__(self, pos) -> None:
         BaseItem.__init__(self, pos)
         self.itemName = "BlasterItem"
-        self.velocity = [0, 1]
+        self.velocity = [0, 60]
 
 class AddFirePosItem(BaseItem):
     """
@@ -148,10 +170,12 @@ class AddFirePosItem(BaseItem):
         ----------
     """
 
+    __slots__ = ()
+
     srcImg = "./img/addFirePosItem.png"
     appearPower = 2
 
     def __init__(self, pos) -> None:
         BaseItem.__init__(self, pos)
         self.itemName = "AddFirePosItem"
-        self.velocity = [0, 1]
+        self.velocity = [0, 60]
@@ -11,7 +11,7 @@ class Player:
         pos : float[2]
             玩家当前所处坐标位置
         velocity : float
-            玩家的移动速度
+            玩家的移动速度，单位：像素/秒
         crashBox : float[2]
             玩家的碰撞箱
         firePos : float[2][]
@@ -32,15 +32,16 @@ class Player:
             是否有爆能束
     """
 
+    __slots__ = ("pos", "velocity", "crashBox", "firePos", "fireInterv", "lastTimeFired", "atk", "hp", "hpMax", "defen", "hasBlaster")
+
     srcImg = "img/player.png"
     scale = 5
 
     def __init__(self, initPos):
         
         self.pos = initPos
-        self.velocity = 5
+        self.velocity = 300
         self.crashBox = [4, 3]
-        self.scale = Player.scale
         self.firePos = [[0,-35]]
         self.fireInterv = 160
         self.lastTimeFired = 0 # 初始化最近发射时间戳为0
@@ -50,7 +51,7 @@ class Player:
         self.defen = 0 # 防御力初始化
         self.hasBlaster = False # 是否有爆能束
 
-    def move(self, direction):
+    def move(self, direction, dt):
         """
             玩家进行移动
 
@@ -58,15 +59,17 @@ class Player:
             ----------
             direction : int
                 移动方向，0:上，1:左，2:下，3:右
+            dt : float
+                时间步长，单位：s
         """
         if(direction == 0):
-            self.pos[1] -= self.velocity
+            self.pos[1] -= self.velocity * dt
         elif(direction == 1):
-            self.pos[0] -= self.velocity
+            self.pos[0] -= self.velocity * dt
         elif(direction == 2):
-            self.pos[1] += self.velocity
+            self.pos[1] += self.velocity * dt
         elif(direction == 3):
-            self.pos[0] += self.velocity
+            self.pos[0] += self.velocity * dt
 
     def crashBoxRescale(self):
         """
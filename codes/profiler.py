@@ -0,0 +1,94 @@
+import time
+import numpy as np
+
+class FrameProfiler:
+    """
+        逐帧分阶段计时器，每帧的各阶段耗时和实体数量写入固定长度的环形缓冲区
+
+        用法：每帧开始时调用startFrame，每个阶段结束时调用lap，帧结束时调用endFrame
+
+        Attributes
+        ----------
+        phaseList : string[]
+            阶段名，按执行顺序排列
+        capacity : int
+            环形缓冲区能保存的帧数
+        times : float[capacity][nPhases]
+            各帧各阶段的耗时，单位：s
+        counts : int[capacity][3]
+            各帧结束时的子弹、敌人、道具数量
+        frameCount : int
+            已经记录的总帧数
+    """
+
+    countNameList = ["bullets", "enemies", "items"]
+
+    def __init__(self, phaseList, capacity=600):
+        self.phaseList = list(phaseList)
+        self.phaseIdx = {name : idx for (idx, name) in enumerate(self.phaseList)}
+        self.capacity = capacity
+        self.times = np.zeros((capacity, len(self.phaseList)))
+        self.counts = np.zeros((capacity, len(FrameProfiler.countNameList)), dtype=np.int64)
+        self.frameCount = 0
+        self.row = 0
+        self.lastTime = 0
+
+    def startFrame(self):
+        """
+            开始记录新的一帧
+        """
+        self.row = self.frameCount % self.capacity
+        self.times[self.row] = 0
+        self.lastTime = time.perf_counter()
+
+    def lap(self, phaseName):
+        """
+            记录从上一次计时到现在的耗时，计入phaseName阶段
+
+            Parameters
+            ----------
+            phaseName : string
+                阶段名
+        """
+        now = time.perf_counter()
+        self.times[self.row, self.phaseIdx[phaseName]] += now - self.lastTime
+        self.lastTime = now
+
+    def endFrame(self, nBullets, nEnemies, nItems):
+        """
+            结束当前帧，记录实体数量
+
+            Parameters
+            ----------
+            nBullets, nEnemies, nItems : int
+                子弹、敌人、道具数量
+        """
+        counts = self.counts[self.row]
+        counts[0] = nBullets
+        counts[1] = nEnemies
+        counts[2] = nItems
+        self.frameCount += 1
+
+    def summary(self) -> dict:
+        """
+            统计环形缓冲区中各阶段耗时的p50和p99，以及实体数量的最新值和最大值
+
+            Returns
+            -------
+            result : dict
+                {"phases" : {phaseName : {"p50" : ms, "p99" : ms}}, "frame" : {"p50" : ms, "p99" : ms}, "counts" : {name : {"last" : n, "max" : n}}}
+        """
+        n = min(self.frameCount, self.capacity)
+        result = {"frames" : n, "phases" : {}, "frame" : {"p50" : 0.0, "p99" : 0.0}, "counts" : {}}
+        if(n == 0):
+            return result
+        times = self.times[:n] * 1e3
+        p50, p99 = np.percentile(times, [50, 99], axis=0)
+        for (idx, name) in enumerate(self.phaseList):
+            result["phases"][name] = {"p50" : float(p50[idx]), "p99" : float(p99[idx])}
+        frameP50, frameP99 = np.percentile(times.sum(axis=1), [50, 99])
+        result["frame"] = {"p50" : float(frameP50), "p99" : float(frameP99)}
+        lastRow = (self.frameCount - 1) % self.capacity
+        for (idx, name) in enumerate(FrameProfiler.countNameList):
+            result["counts"][name] = {"last" : int(self.counts[lastRow, idx]), "max" : int(self.counts[:n, idx].max())}
+        return result
@@ -0,0 +1,113 @@
+import argparse
+import struct
+from stage import Stage
+from headless import HeadlessRunner
+
+# 回放文件：文件头之后每一帧一个字节，为该帧的按键状态（PlayerInput）
+REPLAY_MAGIC = b"SWRP"
+REPLAY_VERSION = 1
+# 文件头：魔数、版本号、随机数种子、帧间隔（ms）
+REPLAY_HEADER_FORMAT = "<4sHqd"
+
+class ReplayRecorder:
+    """
+        输入录制器，把每一帧的按键状态依次写入回放文件
+        文件头记录随机数种子和帧间隔，在同一份敌人出场配置下可以完全复现整局游戏
+
+        Attributes
+        ----------
+        path : string
+            回放文件路径
+        ticks : int
+            已经录制的帧数
+    """
+    def __init__(self, path, stage):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(struct.pack(REPLAY_HEADER_FORMAT, REPLAY_MAGIC, REPLAY_VERSION, stage.seed, stage.frameInterv))
+        self.ticks = 0
+
+    def record(self, playerInput):
+        """
+            录制一帧的按键状态，应在每次stage.tick时调用
+
+            Parameters
+            ----------
+            playerInput : int
+                由PlayerInput中的各位组合而成的按键状态
+        """
+        self.file.write(bytes((playerInput,)))
+        self.ticks += 1
+
+    def close(self):
+        """
+            写完并关闭回放文件
+        """
+        self.file.close()
+
+class ReplayPlayer:
+    """
+        回放器，读取回放文件，作为HeadlessRunner的输入策略逐帧给出录制的按键，以CPU允许的最快速度重放
+
+        Attributes
+        ----------
+        seed : int
+            录制时的随机数种子
+        frameInterv : float
+            录制时的帧间隔，单位：ms
+        inputs : bytes
+            每一帧的按键状态
+        startTick : int
+            回放开始时场景的帧数
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        headerSize = struct.calcsize(REPLAY_HEADER_FORMAT)
+        if(len(data) < headerSize):
+            raise ValueError("%s: not a replay file" % path)
+        (magic, version, self.seed, self.frameInterv) = struct.unpack_from(REPLAY_HEADER_FORMAT, data)
+        if(magic != REPLAY_MAGIC):
+            raise ValueError("%s: not a replay file" % path)
+        if(version != REPLAY_VERSION):
+            raise ValueError("%s: unsupported replay version %d" % (path, version))
+        self.inputs = data[headerSize:]
+        self.startTick = 0
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def __call__(self, stage) -> int:
+        return self.inputs[stage.tickCount - self.startTick]
+
+    def createStage(self) -> Stage:
+        """
+            按录制时的种子和帧间隔创建场景
+        """
+        stage = Stage(self.seed)
+        stage.frameInterv = self.frameInterv
+        self.startTick = stage.tickCount
+        return stage
+
+    def run(self) -> dict:
+        """
+            从头重放整个回放文件
+
+            Returns
+            -------
+            result : dict
+                HeadlessRunner的统计信息，另外"stage"为重放结束时的场景
+        """
+        runner = HeadlessRunner(self.createStage(), self, stopOnGameOver=False)
+        result = runner.runTicks(len(self.inputs))
+        result["stage"] = runner.stage
+        return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="以最快速度无窗口重放录制的游戏")
+    parser.add_argument("replay", help="回放文件")
+    args = parser.parse_args()
+
+    player = ReplayPlayer(args.replay)
+    result = player.run()
+    print("seed %d, %d ticks, %.1f s game time in %.2f s (%.0f ticks/s, x%.1f real time), score %d, level %d%s" % (player.seed, result["ticks"], result["gameTime"] / 1e3, result["wallTime"], result["ticksPerSec"], result["speedup"], result["score"], result["level"], ", game over" if result["isGameOver"] else ""))
@@ -0,0 +1,254 @@
+import math
+import random
+import struct
+import numpy as np
+from stage import Stage, BalanceConfig
+from enemy import enemyClassDict
+from item import *
+
+# 存档文件：文件头之后依次为场景、玩家、数值平衡参数及统计各一条记录，五个数量，然后是敌人、道具、子弹、出场队列、BOSS击杀的定长记录
+SNAPSHOT_MAGIC = b"SWSS"
+SNAPSHOT_VERSION = 3
+# 文件头：魔数、版本号
+SNAPSHOT_HEADER_FORMAT = "<4sH"
+
+# 敌人和道具的类型编号，即在下列表中的下标，修改顺序时需要提升SNAPSHOT_VERSION
+enemyClassList = list(enemyClassDict.values())
+itemClassList = [RecoverItem, AddHpLimitItem, EnhanceFireItem, EnhanceAtkItem, EnhanceDefenItem, BlasterItem, AddFirePosItem]
+
+STAGE_DTYPE = np.dtype([
+    ("seed", "<i8"), ("frameInterv", "<f8"), ("timeStamp", "<f8"), ("lastTimeStamp", "<f8"), ("bossTS", "<f8"),
+    ("level", "<i8"), ("score", "<f8"), ("tickCount", "<i8"), ("isGameOver", "?"), ("bossIdx", "<i4"),
+    ("enemyNextHandle", "<i8"), ("itemNextHandle", "<i8"), ("bulletNextHandle", "<i8"), ("nextReloadCheck", "<f8"),
+    ("rngVersion", "<i4"), ("rngState", "<u4", 625), ("hasGaussNext", "?"), ("gaussNext", "<f8"),
+])
+PLAYER_DTYPE = np.dtype([
+    ("pos", "<f8", 2), ("crashBox", "<f8", 2), ("nFirePos", "<i4"), ("fireInterv", "<f8"), ("lastTimeFired", "<f8"),
+    ("atk", "<f8"), ("hp", "<f8"), ("hpMax", "<f8"), ("defen", "<f8"), ("hasBlaster", "?"),
+])
+# 各类敌人特有的数值（没有该属性时记为NaN），包括死星两种子弹各自的发射间隔
+ENEMY_FLOAT_FIELDS = ["hp", "maxHp", "atk", "defen", "fireInterv", "lastTimeFired", "fireInterv_beam", "fireInterv_blaster", "lastTimeFired_beam", "lastTimeFired_blaster"]
+ENEMY_DTYPE = np.dtype([("classId", "<i2"), ("handle", "<i8"), ("pos", "<f8", 2), ("velocity", "<f8", 2), ("crashBox", "<f8", 2), ("beamX", "<f8")] + [(name, "<f8") for name in ENEMY_FLOAT_FIELDS])
+ITEM_DTYPE = np.dtype([("classId", "<i2"), ("handle", "<i8"), ("pos", "<f8", 2), ("velocity", "<f8", 2)])
+BULLET_DTYPE = np.dtype([("handle", "<i8"), ("pos", "<f8", 2), ("prevPos", "<f8", 2), ("velocity", "<f8", 2), ("atk", "<f8"), ("owner", "<i1"), ("typeId", "<i1"), ("explosionFrame", "<i2")])
+QUEUE_DTYPE = np.dtype([("spawnTime", "<f8"), ("ruleIdx", "<i4")])
+# 数值平衡参数和道具拾取统计，道具按itemClassList的顺序
+BALANCE_FLOAT_FIELDS = ["atkGrowth", "defenGrowth", "hpGrowth", "fireIntervDecay", "blasterIntervDecay"]
+BALANCE_DTYPE = np.dtype([(name, "<f8") for name in BALANCE_FLOAT_FIELDS] + [("itemPower", "<i8", len(itemClassList)), ("itemPickupCount", "<i8", len(itemClassList))])
+BOSS_KILL_DTYPE = np.dtype([("classId", "<i2"), ("gameTime", "<f8"), ("fightTime", "<f8")])
+
+def dumpSnapshot(stage) -> bytes:
+    """
+        把场景的完整状态编码为存档
+
+        Parameters
+        ----------
+        stage : Stage
+            场景
+
+        Returns
+        -------
+        data : bytes
+            存档内容
+    """
+    enemyList = list(stage.enemyContainer)
+    itemList = list(stage.itemContainer)
+    # 场景
+    stageRec = np.zeros(1, dtype=STAGE_DTYPE)[0]
+    stageRec["seed"] = stage.seed
+    stageRec["frameInterv"] = stage.frameInterv
+    stageRec["timeStamp"] = stage.timeStamp
+    stageRec["lastTimeStamp"] = stage.lastTimeStamp
+    stageRec["bossTS"] = stage.bossTS
+    stageRec["level"] = stage.level
+    stageRec["score"] = stage.score
+    stageRec["tickCount"] = stage.tickCount
+    stageRec["isGameOver"] = stage.isGameOver
+    stageRec["bossIdx"] = enemyList.index(stage.boss) if stage.boss is not None else -1
+    stageRec["enemyNextHandle"] = stage.enemyContainer.nextHandle
+    stageRec["itemNextHandle"] = stage.itemContainer.nextHandle
+    stageRec["bulletNextHandle"] = stage.bulletContainer.nextHandle
+    stageRec["nextReloadCheck"] = stage.spawnScheduler.nextReloadCheck
+    (rngVersion, rngState, gaussNext) = stage.rng.getstate()
+    stageRec["rngVersion"] = rngVersion
+    stageRec["rngState"] = rngState
+    stageRec["hasGaussNext"] = gaussNext is not None
+    stageRec["gaussNext"] = gaussNext if gaussNext is not None else 0
+    # 玩家
+    player = stage.player
+    playerRec = np.zeros(1, dtype=PLAYER_DTYPE)[0]
+    playerRec["pos"] = player.pos
+    playerRec["crashBox"] = player.crashBox
+    playerRec["nFirePos"] = len(player.firePos)
+    for name in ("fireInterv", "lastTimeFired", "atk", "hp", "hpMax", "defen", "hasBlaster"):
+        playerRec[name] = getattr(player, name)
+    # 敌人
+    enemyRec = np.zeros(len(enemyList), dtype=ENEMY_DTYPE)
+    enemyClassId = {eachClass : classId for (classId, eachClass) in enumerate(enemyClassList)}
+    for (eachRec, eachEnemy) in zip(enemyRec, enemyList):
+        eachRec["classId"] = enemyClassId[eachEnemy.__class__]
+        eachRec["handle"] = eachEnemy.handle
+        eachRec["pos"] = eachEnemy.pos
+        eachRec["velocity"] = eachEnemy.velocity
+        eachRec["crashBox"] = eachEnemy.crashBox
+        eachRec["beamX"] = eachEnemy.firePos_beam[0][0] if hasattr(eachEnemy, "firePos_beam") else math.nan
+        for name in ENEMY_FLOAT_FIELDS:
+            value = getattr(eachEnemy, name, None)
+            eachRec[name] = value if value is not None else math.nan
+    # 道具
+    itemRec = np.zeros(len(itemList), dtype=ITEM_DTYPE)
+    itemClassId = {eachClass : classId for (classId, eachClass) in enumerate(itemClassList)}
+    for (eachRec, eachItem) in zip(itemRec, itemList):
+        eachRec["classId"] = itemClassId[eachItem.__class__]
+        eachRec["handle"] = eachItem.handle
+        eachRec["pos"] = eachItem.pos
+        eachRec["velocity"] = eachItem.velocity
+    # 子弹，只保存未被删除的行
+    bulletPool = stage.bulletContainer
+    aliveIdx = np.flatnonzero(bulletPool.alive[:bulletPool.size])
+    bulletRec = np.zeros(len(aliveIdx), dtype=BULLET_DTYPE)
+    for name in BULLET_DTYPE.names:
+        bulletRec[name] = getattr(bulletPool, name)[aliveIdx]
+    # 出场队列，按堆中的顺序保存
+    queueRec = np.array(stage.spawnScheduler.queue, dtype=QUEUE_DTYPE)
+    # 数值平衡参数和统计信息
+    balanceRec = np.zeros(1, dtype=BALANCE_DTYPE)[0]
+    for name in BALANCE_FLOAT_FIELDS:
+        balanceRec[name] = getattr(stage.balance, name)
+    balanceRec["itemPower"] = [stage.balance.itemPower[eachClass.__name__] for eachClass in itemClassList]
+    balanceRec["itemPickupCount"] = [stage.itemPickupCount.get(eachClass.__name__, 0) for eachClass in itemClassList]
+    bossKillRec = np.array([(enemyClassId[enemyClassDict[bossName]], gameTime, fightTime) for (bossName, gameTime, fightTime) in stage.bossKillList], dtype=BOSS_KILL_DTYPE)
+    counts = np.array([len(enemyRec), len(itemRec), len(bulletRec), len(queueRec), len(bossKillRec)], dtype="<u4")
+    return b"".join([struct.pack(SNAPSHOT_HEADER_FORMAT, SNAPSHOT_MAGIC, SNAPSHOT_VERSION), stageRec.tobytes(), playerRec.tobytes(), balanceRec.tobytes(), counts.tobytes(), enemyRec.tobytes(), itemRec.tobytes(), bulletRec.tobytes(), queueRec.tobytes(), bossKillRec.tobytes()])
+
+def loadSnapshot(data) -> Stage:
+    """
+        从存档恢复场景
+
+        Parameters
+        ----------
+        data : bytes
+            dumpSnapshot得到的存档内容
+
+        Returns
+        -------
+        stage : Stage
+            恢复后的场景，继续模拟的结果与存档时的场景完全相同
+    """
+    headerSize = struct.calcsize(SNAPSHOT_HEADER_FORMAT)
+    if(len(data) < headerSize):
+        raise ValueError("not a snapshot")
+    (magic, version) = struct.unpack_from(SNAPSHOT_HEADER_FORMAT, data)
+    if(magic != SNAPSHOT_MAGIC):
+        raise ValueError("not a snapshot")
+    if(version != SNAPSHOT_VERSION):
+        raise ValueError("unsupported snapshot version %d" % version)
+    offset = headerSize
+    stageRec = np.frombuffer(data, dtype=STAGE_DTYPE, count=1, offset=offset)[0]
+    offset += STAGE_DTYPE.itemsize
+    playerRec = np.frombuffer(data, dtype=PLAYER_DTYPE, count=1, offset=offset)[0]
+    offset += PLAYER_DTYPE.itemsize
+    balanceRec = np.frombuffer(data, dtype=BALANCE_DTYPE, count=1, offset=offset)[0]
+    offset += BALANCE_DTYPE.itemsize
+    (nEnemies, nItems, nBullets, nQueue, nBossKills) = np.frombuffer(data, dtype="<u4", count=5, offset=offset).tolist()
+    offset += 20
+    recList = []
+    for (dtype, count) in ((ENEMY_DTYPE, nEnemies), (ITEM_DTYPE, nItems), (BULLET_DTYPE, nBullets), (QUEUE_DTYPE, nQueue), (BOSS_KILL_DTYPE, nBossKills)):
+        recList.append(np.frombuffer(data, dtype=dtype, count=count, offset=offset))
+        offset += dtype.itemsize * count
+    (enemyRec, itemRec, bulletRec, queueRec, bossKillRec) = recList
+
+    # 数值平衡参数影响道具别名表等初始状态，需要在创建场景时传入
+    balanceParams = {name : float(balanceRec[name]) for name in BALANCE_FLOAT_FIELDS}
+    balanceParams.update({eachClass.__name__ : int(eachPower) for (eachClass, eachPower) in zip(itemClassList, balanceRec["itemPower"].tolist())})
+    stage = Stage(int(stageRec["seed"]), BalanceConfig(**balanceParams))
+    # 场景，时间步长（放大倍数）也按存档恢复
+    stage.frameInterv = float(stageRec["frameInterv"])
+    stage.timeStamp = float(stageRec["timeStamp"])
+    stage.lastTimeStamp = float(stageRec["lastTimeStamp"])
+    stage.bossTS = float(stageRec["bossTS"])
+    stage.level = int(stageRec["level"])
+    stage.score = float(stageRec["score"])
+    stage.tickCount = int(stageRec["tickCount"])
+    stage.isGameOver = bool(stageRec["isGameOver"])
+    gaussNext = float(stageRec["gaussNext"]) if stageRec["hasGaussNext"] else None
+    stage.rng.setstate((int(stageRec["rngVersion"]), tuple(stageRec["rngState"].tolist()), gaussNext))
+    stage.spawnScheduler.queue = [(float(eachRec["spawnTime"]), int(eachRec["ruleIdx"])) for eachRec in queueRec]
+    stage.spawnScheduler.nextReloadCheck = float(stageRec["nextReloadCheck"])
+    # 统计信息
+    stage.bossKillList = [(enemyClassList[int(eachRec["classId"])].__name__, float(eachRec["gameTime"]), float(eachRec["fightTime"])) for eachRec in bossKillRec]
+    stage.itemPickupCount = {eachClass.__name__ : eachCount for (eachClass, eachCount) in zip(itemClassList, balanceRec["itemPickupCount"].tolist()) if eachCount > 0}
+    # 玩家
+    player = stage.player
+    for i in range(int(playerRec["nFirePos"]) - 1):
+        player.addFirePos()
+    player.pos = playerRec["pos"].tolist()
+    player.crashBox = playerRec["crashBox"].tolist()
+    for name in ("fireInterv", "lastTimeFired", "atk", "hp", "hpMax", "defen"):
+        setattr(player, name, float(playerRec[name]))
+    player.hasBlaster = bool(playerRec["hasBlaster"])
+    # 敌人，构造时不能消耗场景的随机数
+    dummyRng = random.Random(0)
+    enemyContainer = stage.enemyContainer
+    for eachRec in enemyRec:
+        newEnemy = enemyClassList[eachRec["classId"]](eachRec["pos"].tolist(), dummyRng)
+        newEnemy.velocity = eachRec["velocity"].tolist()
+        newEnemy.crashBox = eachRec["crashBox"].tolist()
+        if(not math.isnan(eachRec["beamX"])):
+            newEnemy.firePos_beam = [[float(eachRec["beamX"]), 40]]
+        for name in ENEMY_FLOAT_FIELDS:
+            if(not math.isnan(eachRec[name])):
+                setattr(newEnemy, name, float(eachRec[name]))
+        # 按存档中的句柄加入容器，同时写入运动学数组
+        enemyContainer.nextHandle = int(eachRec["handle"])
+        enemyContainer.append(newEnemy)
+    enemyContainer.nextHandle = int(stageRec["enemyNextHandle"])
+    bossIdx = int(stageRec["bossIdx"])
+    stage.boss = enemyContainer.entities[bossIdx] if bossIdx >= 0 else None
+    # 道具
+    itemContainer = stage.itemContainer
+    for eachRec in itemRec:
+        newItem = itemClassList[eachRec["classId"]](eachRec["pos"].tolist())
+        newItem.velocity = eachRec["velocity"].tolist()
+        newItem.handle = int(eachRec["handle"])
+        itemContainer.rowOf[newItem.handle] = len(itemContainer.entities)
+        itemContainer.entities.append(newItem)
+        itemContainer.alive.append(True)
+    itemContainer.nextHandle = int(stageRec["itemNextHandle"])
+    # 子弹
+    bulletPool = stage.bulletContainer
+    while(len(bulletPool.atk) < nBullets):
+        bulletPool.grow()
+    for name in BULLET_DTYPE.names:
+        getattr(bulletPool, name)[:nBullets] = bulletRec[name]
+    bulletPool.alive[:nBullets] = True
+    bulletPool.size = nBullets
+    bulletPool.nextHandle = int(stageRec["bulletNextHandle"])
+    bulletPool.version += 1
+    return stage
+
+def saveSnapshotFile(stage, path):
+    """
+        把场景存档写入文件
+
+        Parameters
+        ----------
+        stage : Stage
+            场景
+        path : string
+            存档文件路径
+    """
+    with open(path, "wb") as f:
+        f.write(dumpSnapshot(stage))
+
+def loadSnapshotFile(path) -> Stage:
+    """
+        从存档文件恢复场景
+
+        Parameters
+        ----------
+        path : string
+            存档文件路径
+    """
+    with open(path, "rb") as f:
+        return loadSnapshot(f.read())
@@ -0,0 +1,83 @@
+import numpy as np
+
+class SpatialHash:
+    """
+        均匀网格空间哈希，将场景划分为等大的格子，按子弹所在格子分桶
+        碰撞检测时，实体的碰撞箱只需要检查与其重叠的格子中的子弹
+
+        Attributes
+        ----------
+        screenSize : int[2]
+            场景大小
+        cellSize : float
+            格子边长
+        cols : int
+            横向格子数
+        rows : int
+            纵向格子数
+        order : int[]
+            按格子编号排好序的子弹下标
+        cellStart : int[]
+            每个格子在order中的起始位置，第i个格子的子弹为order[cellStart[i]:cellStart[i+1]]
+        version : int
+            建立索引时子弹池的版本号，用于判断索引是否过期
+    """
+    def __init__(self, screenSize, cellSize=40):
+        self.screenSize = screenSize
+        self.cellSize = cellSize
+        self.cols = int(np.ceil(screenSize[0] / cellSize))
+        self.rows = int(np.ceil(screenSize[1] / cellSize))
+        self.order = np.zeros(0, dtype=np.intp)
+        self.cellStart = np.zeros(self.cols * self.rows + 1, dtype=np.intp)
+        self.version = None
+
+    def build(self, pos, version=None):
+        """
+            根据子弹位置重建索引，场景外的点归入边缘的格子
+
+            Parameters
+            ----------
+            pos : float[n][2]
+                子弹位置
+            version : int
+                子弹池的版本号
+        """
+        cell = (pos // self.cellSize).astype(np.intp)
+        np.maximum(cell, 0, out=cell)
+        np.minimum(cell, (self.cols - 1, self.rows - 1), out=cell)
+        cellId = cell[:, 1] * self.cols + cell[:, 0]
+        self.order = np.argsort(cellId, kind="stable")
+        counts = np.bincount(cellId, minlength=self.cols * self.rows)
+        np.cumsum(counts, out=self.cellStart[1:])
+        self.version = version
+
+    def query(self, xMin, yMin, xMax, yMax):
+        """
+            查询与矩形区域重叠的格子中的所有子弹（粗筛，需要再做精确判定）
+
+            Parameters
+            ----------
+            xMin, yMin, xMax, yMax : float
+                矩形区域的边界
+
+            Returns
+            -------
+            idx : int[]
+                候选子弹的下标，按升序排列
+        """
+        c0 = min(max(int(xMin // self.cellSize), 0), self.cols - 1)
+        c1 = min(max(int(xMax // self.cellSize), 0), self.cols - 1)
+        r0 = min(max(int(yMin // self.cellSize), 0), self.rows - 1)
+        r1 = min(max(int(yMax // self.cellSize), 0), self.rows - 1)
+        # 同一行中相邻格子的编号连续，每一行只需切片一次
+        segments = []
+        for r in range(r0, r1 + 1):
+            start = self.cellStart[r * self.cols + c0]
+            end = self.cellStart[r * self.cols + c1 + 1]
+            if(start < end):
+                segments.append(self.order[start:end])
+        if(len(segments) == 0):
+            return self.order[:0]
+        if(len(segments) == 1):
+            return np.sort(segments[0])
+        return np.sort(np.concatenate(segments))
@@ -0,0 +1,214 @@
+import heapq
+import json
+import math
+import os
+import random
+
+class SpawnRule:
+    """
+        编译后的一条敌人出场规则，对应enemySpanConfig.json中的一项
+
+        Attributes
+        ----------
+        ruleIdx : int
+            在配置文件中的序号，同一帧出场的敌人按序号先后生成
+        className : string
+            敌人的类名
+        enemyClass : class
+            敌人类
+        appearBy : string
+            出场依据：time——等间隔出场，immediately——在指定时间点出场
+        appearMode : string
+            出场位置：random——随机位置，fix——固定位置
+        mu : float
+            时间间隔的均值，单位：ms
+        std : float
+            时间间隔的标准差
+        firstTime : float
+            第一次出场的时间，未指定时为0（此时0时刻不出场）
+        spawnAt : float(tuple)
+            immediately依据下的出场时间点
+        posX, posY : float
+            fix位置下的出场位置
+    """
+    def __init__(self, ruleIdx, config, enemyClassDict):
+        self.ruleIdx = ruleIdx
+        self.className = config["className"]
+        self.enemyClass = enemyClassDict[self.className]
+        self.appearBy = config["appearBy"]
+        self.appearMode = config["appearMode"]
+        self.mu = float(config.get("mu", 0))
+        self.std = float(config.get("std", 0))
+        self.firstTime = float(config.get("firstTime", 0))
+        self.spawnAt = tuple(sorted(float(t) for t in config.get("spawnAt", [])))
+        self.posX = config.get("posX", -1)
+        self.posY = config.get("posY", -1)
+        if(self.appearBy == "time" and self.mu <= 0):
+            raise ValueError("enemy %s: mu must be positive" % self.className)
+
+    def nextSpawnTime(self, timeStamp, lastSpawnTime=None, rng=random):
+        """
+            计算严格晚于timeStamp的下一次出场时间
+
+            Parameters
+            ----------
+            timeStamp : float
+                当前时间戳
+            lastSpawnTime : float
+                上一次计划的出场时间，仅在间隔带随机误差时使用
+            rng : random.Random
+                随机数生成器，仅在间隔带随机误差时使用
+
+            Returns
+            -------
+            spawnTime : float
+                下一次出场时间，没有下一次时返回None
+        """
+        if(self.appearBy == "time"):
+            # 无随机误差：出场时间为firstTime + k * mu，k >= 0
+            if(self.std == 0):
+                if(timeStamp < self.firstTime):
+                    return self.firstTime
+                k = math.floor((timeStamp - self.firstTime) / self.mu) + 1
+                return self.firstTime + k * self.mu
+            # 有随机误差：在上一次的基础上加一个高斯分布的间隔
+            if(lastSpawnTime is None):
+                if(timeStamp < self.firstTime):
+                    return self.firstTime
+                lastSpawnTime = timeStamp
+            spawnTime = lastSpawnTime
+            while(spawnTime <= timeStamp):
+                dtEnemy = rng.gauss(self.mu, self.std)
+                while(dtEnemy <= 0):
+                    dtEnemy = rng.gauss(self.mu, self.std)
+                spawnTime += dtEnemy
+            return spawnTime
+        elif(self.appearBy == "immediately"):
+            for eachTimeStamp in self.spawnAt:
+                if(eachTimeStamp > timeStamp):
+                    return eachTimeStamp
+        return None
+
+class SpawnScheduler:
+    """
+        敌人出场调度器：配置文件只读取一次并编译为SpawnRule，
+        待出场的规则按下一次出场时间放在优先队列中，每帧只弹出到期的规则
+
+        Attributes
+        ----------
+        configPath : string
+            配置文件路径
+        ruleList : SpawnRule[]
+            所有出场规则
+        queue : (float, int)[]
+            最小堆，元素为(下一次出场时间, 规则序号)
+        configMTime : float
+            配置文件的修改时间，变化后重新读取
+        nextReloadCheck : float
+            下一次检查配置文件是否修改的时间戳
+        rng : random.Random
+            随机数生成器，由Stage传入，保证同一种子下出场时间可复现
+    """
+
+    # 每隔多长的游戏时间检查一次配置文件是否修改，单位：ms
+    RELOAD_CHECK_INTERV = 1000
+
+    def __init__(self, configPath, enemyClassDict, timeStamp=0, rng=None):
+        self.configPath = configPath
+        self.enemyClassDict = enemyClassDict
+        self.rng = rng if rng is not None else random.Random()
+        self.ruleList = []
+        self.queue = []
+        self.configMTime = None
+        self.nextReloadCheck = 0
+        self.load(timeStamp)
+
+    def load(self, timeStamp):
+        """
+            读取并编译配置文件，然后从timeStamp开始重新排期
+
+            Parameters
+            ----------
+            timeStamp : float
+                当前时间戳
+        """
+        self.configMTime = os.path.getmtime(self.configPath)
+        with open(self.configPath, "r") as enemySpanConfigFile:
+            enemySpanConfig = json.load(enemySpanConfigFile)
+        self.ruleList = [SpawnRule(idx, eachEnemy, self.enemyClassDict) for (idx, eachEnemy) in enumerate(enemySpanConfig["enemies"])]
+        self.reschedule(timeStamp)
+
+    def checkReload(self, timeStamp) -> bool:
+        """
+            每隔RELOAD_CHECK_INTERV检查一次配置文件，修改时间变化后重新读取
+
+            Parameters
+            ----------
+            timeStamp : float
+                当前时间戳
+
+            Returns
+            -------
+            True / False
+                重新读取了 / 没有重新读取
+        """
+        if(timeStamp < self.nextReloadCheck):
+            return False
+        self.nextReloadCheck = timeStamp + SpawnScheduler.RELOAD_CHECK_INTERV
+        if(os.path.getmtime(self.configPath) == self.configMTime):
+            return False
+        self.load(timeStamp)
+        return True
+
+    def reschedule(self, timeStamp):
+        """
+            按当前时间戳重新计算所有规则的下一次出场时间，用于时间戳回退（BOSS死亡）等情形
+
+            Parameters
+            ----------
+            timeStamp : float
+                当前时间戳，只有严格晚于它的出场才会被排入
+        """
+        self.queue = []
+        for eachRule in self.ruleList:
+            spawnTime = eachRule.nextSpawnTime(timeStamp, rng=self.rng)
+            if(spawnTime is not None):
+                self.queue.append((spawnTime, eachRule.ruleIdx))
+        heapq.heapify(self.queue)
+        # 时间戳回退后，配置文件检查的时间也要跟着回退
+        self.nextReloadCheck = min(self.nextReloadCheck, timeStamp + SpawnScheduler.RELOAD_CHECK_INTERV)
+
+    def popDue(self, lastTimeStamp, timeStamp):
+        """
+            弹出所有在(lastTimeStamp, timeStamp]内到期的规则，并为它们排入下一次出场
+            早于lastTimeStamp的过期项（例如时间戳被直接修改过）只重新排期，不出场
+            同一规则在一帧内最多出场一次
+
+            Parameters
+            ----------
+            lastTimeStamp : float
+                上一帧的时间戳
+            timeStamp : float
+                当前时间戳
+
+            Returns
+            -------
+            ruleList : SpawnRule[]
+                本帧需要出场的规则，按配置文件中的顺序排列
+        """
+        if(timeStamp < lastTimeStamp):
+            self.reschedule(timeStamp)
+            return []
+        dueList = []
+        queue = self.queue
+        while(queue and queue[0][0] <= timeStamp):
+            (spawnTime, ruleIdx) = heapq.heappop(queue)
+            eachRule = self.ruleList[ruleIdx]
+            if(spawnTime > lastTimeStamp):
+                dueList.append(eachRule)
+            nextTime = eachRule.nextSpawnTime(timeStamp, spawnTime, self.rng)
+            if(nextTime is not None):
+                heapq.heappush(queue, (nextTime, ruleIdx))
+        if(len(dueList) > 1):
+            dueList.sort(key=lambda eachRule: eachRule.ruleIdx)
+        return dueList
@@ -1,17 +1,72 @@
-from hashlib import new
-from os import remove
 from player import Player
 from bullet import *
 from enemy import *
 from item import *
-import pygame
+from spatialHash import SpatialHash
+from collision import segmentsHitBox, segmentHitsBox
+from spawnScheduler import SpawnScheduler
+from container import EntityContainer, KinematicContainer
+from aliasTable import AliasTable
+from freeList import FreeList
 import random
-import json
 import numpy as np
 
+class PlayerInput:
+    """
+        玩家输入，一帧的按键状态压缩为一个整数，每一位对应一个按键
+    """
+    UP = 1
+    LEFT = 2
+    DOWN = 4
+    RIGHT = 8
+    FIRE = 16
+    # 下标与Stage.playerMove中的方向编号一致
+    directionList = [UP, LEFT, DOWN, RIGHT]
+
+class BalanceConfig:
+    """
+        数值平衡参数，默认值即为游戏中使用的数值，批量模拟时可以逐局修改
+
+        Attributes
+        ----------
+        atkGrowth : float
+            每提升一个level，新出现敌人攻击力的增长率
+        defenGrowth : float
+            每提升一个level，新出现敌人防御力的增长率
+        hpGrowth : float
+            每提升一个level，新出现敌人血量的增长率
+        fireIntervDecay : float
+            每提升一个level，新出现敌人发射间隔的缩短率
+        blasterIntervDecay : float
+            每提升一个level，最终BOSS爆能束发射间隔的缩短率
+        itemPower : dict
+            {道具类名 : 出现权重}，权重为整数
+    """
+    atkGrowth = 0.44
+    defenGrowth = 0.15
+    hpGrowth = 0.67
+    fireIntervDecay = 0.1
+    blasterIntervDecay = 0.15
+
+    def __init__(self, **params):
+        """
+            Parameters
+            ----------
+            params : dict
+                要修改的参数，道具的出现权重直接以道具类名为参数名
+        """
+        self.itemPower = {eachClass.__name__ : eachClass.appearPower for eachClass in [RecoverItem, AddHpLimitItem, EnhanceFireItem, EnhanceAtkItem, EnhanceDefenItem, BlasterItem, AddFirePosItem]}
+        for (name, value) in params.items():
+            if(name in self.itemPower):
+                self.itemPower[name] = int(value)
+            elif(name in ("atkGrowth", "defenGrowth", "hpGrowth", "fireIntervDecay", "blasterIntervDecay")):
+                setattr(self, name, float(value))
+            else:
+                raise ValueError("unknown balance parameter: %s" % name)
+
 class Stage:
     """
-        场景类
+        场景类，纯粹的模拟核心，不依赖pygame，可以脱离窗口运行
 
         Parameters
         ----------
@@ -19,65 +74,207 @@ class Stage:
             场景大小
         player : Player
             玩家
-        bulletContainer : BaseBullet[]
-            使用列表存储场景中的所有子弹
+        bulletContainer : BulletPool
+            子弹池，以数组形式存储场景中的所有子弹
+        bulletIndex : SpatialHash
+            子弹的空间索引，子弹很多时用于碰撞检测的粗筛，按子弹当前位置建立
+        bulletMaxStep : float[2]
+            子弹本步在x、y方向上移动距离的最大值，查询时矩形向外扩展这么多，以找到轨迹穿过矩形的子弹
         timeStamp : float
             时间戳
         lastTimeStamp : float
             最近一次时间戳
-        enemyContainer : BaseEnemy[]
+        enemyContainer : KinematicContainer
             敌人容器，包含所有在场的敌人
-        bossName : string[]
-            BOSS的类名
+        boss : BaseEnemy
+            当前在场的BOSS，没有BOSS时为None，在BOSS登场和死亡时更新
+        balance : BalanceConfig
+            数值平衡参数
         itemDict : dict[]
             所有可能出现的道具（类名）及其权重
             {'itemName' : power}
-        itemContainer : BaseItem[]
+        itemContainer : EntityContainer
             道具容器，当前在屏幕范围内的道具
-        itemSpawnTable : int[]
-            物品生成表，用于后续随机生成物品
+        itemFreeList : FreeList
+            已被拾取或移出场景的道具，生成新道具时重新利用
+        itemClassList : class[]
+            可能出现的道具类，与itemDict的顺序一致
+        itemSampler : AliasTable
+            按itemDict的权重抽取道具的别名表
         bossTS : float
             最近一次BOSS出现时的时间戳
+        spawnScheduler : SpawnScheduler
+            敌人出场调度器
         level : int
             每击杀一次BOSS，提升一个level，强化新出现的敌人属性
         score : float
             游戏得分
+        frameInterv : float
+            每一帧推进的游戏时间（固定步长），单位：ms，所有速度均以像素/秒为单位并乘以该步长
+            批量模拟时可以放大为baseFrameInterv的整数倍，开火仍按baseFrameInterv逐帧检查
+        playerPrevPos : float[2]
+            玩家本帧移动前的位置，与子弹轨迹一起做相对运动的扫掠判定
+        tickFirstHandle : int
+            本帧开始时子弹池的下一个句柄，句柄不小于它的子弹是本帧发射的
+        tickCount : int
+            已经模拟的帧数
+        isGameOver : bool
+            玩家是否已经死亡
+        profiler : FrameProfiler
+            分阶段计时器，为None时不计时
+        seed : int
+            随机数种子，未指定时随机生成，记录下来用于回放
+        rng : random.Random
+            场景中所有随机事件共用的随机数生成器，同一种子和同一输入序列下模拟结果完全相同
+        bossKillList : (string, float, float)[]
+            击败BOSS的记录：(BOSS类名, 击败时已经经过的游戏时间, BOSS战持续时间)，单位：ms
+        itemPickupCount : dict
+            {道具类名 : 拾取次数}
     """
-    def __init__(self) -> None:
+
+    # 逐帧推进时每一帧的游戏时间（60Hz），单位：ms
+    baseFrameInterv = 1e3 / 60
+
+    # 碰撞检测中矩形与候选子弹的组合数不超过该值时整块判定，超过时先用空间索引粗筛
+    denseCrashLimit = 4096
+    # 逐帧推进时矩形与子弹的组合数不超过该值时逐个比较，不调用NumPy
+    scalarCrashLimit = 128
+
+    # 一次掉落的道具不少于该数量时，散开位置用NumPy整批算出
+    scatterBatchLimit = 16
+
+    # 一帧中依次执行的阶段
+    phaseList = ["playerInput", "updateFire", "enemySpan", "enemyFire", "enemyStateUpdate", "playerStateUpdate", "itemMove"]
+    def __init__(self, seed=None, balance=None) -> None:
+        # 随机数生成器
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.rng = random.Random(self.seed)
+
+        # 数值平衡参数
+        self.balance = balance if balance is not None else BalanceConfig()
+
         # 初始化屏幕
         self.screenSize = (400, 600)
         
         # 初始化玩家
         self.player = Player([self.screenSize[0] * 0.5, self.screenSize[1] * 0.95])
         self.player.crashBoxRescale()
+        self.playerPrevPos = tuple(self.player.pos)
         
-        self.bulletContainer = []
-        self.enemyContainer = []
+        self.bulletContainer = BulletPool()
+        self.tickFirstHandle = 0
+        self.bulletIndex = SpatialHash(self.screenSize)
+        self.bulletMaxStep = (0, 0)
+        self.enemyContainer = KinematicContainer()
         self.timeStamp = 0 # 初始化游戏时间戳为零
         self.lastTimeStamp = 0 # 最近一次时间戳
 
-        # BOSS名单
-        self.bossName = ["BulletRainShooter", "Sticker", "Tracker", "Windmiller", "TieVader", "StarDestroyer", "DeathStar"]
+        # 当前在场的BOSS
+        self.boss = None
 
         # 所有可能出现的道具（类名）及其权重
-        self.itemDict = {"RecoverItem" : RecoverItem.appearPower, "AddHpLimitItem" : AddHpLimitItem.appearPower, "EnhanceFireItem" : EnhanceFireItem.appearPower, "EnhanceAtkItem" : EnhanceAtkItem.appearPower, "EnhanceDefenItem" : EnhanceDefenItem.appearPower, "BlasterItem" : BlasterItem.appearPower, "AddFirePosItem" : AddFirePosItem.appearPower}
+        self.itemDict = dict(self.balance.itemPower)
 
         # 道具容器
-        self.itemContainer = []
+        self.itemFreeList = FreeList()
+        self.itemContainer = EntityContainer(self.itemFreeList)
 
-        # 物品生成表
-        self.itemSpawnTable = None
-        self.createItemSpawnTable()
+        # 道具抽样表
+        self.itemClassList = None
+        self.itemSampler = None
+        self.createItemSampler()
 
         # 最近一次BOSS出现时的时间戳
         self.bossTS = 0
 
+        # 敌人出场调度器
+        self.spawnScheduler = SpawnScheduler("./config/enemySpanConfig.json", enemyClassDict, self.timeStamp, self.rng)
+
         # level
         self.level = 0
 
         # 游戏得分
         self.score = 0
 
+        # 每一帧推进的游戏时间，固定为60Hz
+        self.frameInterv = Stage.baseFrameInterv
+        self.tickCount = 0
+        self.isGameOver = False
+        self.profiler = None
+
+        # 统计信息
+        self.bossKillList = []
+        self.itemPickupCount = {}
+
+    def tick(self, playerInput=0) -> None:
+        """
+            推进一帧：玩家移动和开火、子弹移动、敌人和玩家更新，最后更新时间戳
+
+            Parameters
+            ----------
+            playerInput : int
+                本帧的按键状态，由PlayerInput中的各位组合而成
+        """
+        if(self.profiler is not None):
+            self.profiledTick(playerInput)
+            return
+        # 根据按键作出响应
+        self.applyPlayerInput(playerInput)
+        # 随着时间流逝，进行每一帧的刷新
+        self.updateFire() # 子弹向前推移
+        self.enemySpan() # 敌人生成
+        self.enemyFire() # 敌人发射子弹
+        self.enemyStateUpdate() # 敌人状态更新
+        self.playerStateUpdate() # 玩家状态更新
+        self.itemMove() # 物品移动
+        # 更新时间戳
+        self.timeStamp += self.frameInterv
+        self.tickCount += 1
+
+    def profiledTick(self, playerInput) -> None:
+        """
+            与tick相同，但每个阶段结束后都向profiler计时
+
+            Parameters
+            ----------
+            playerInput : int
+                本帧的按键状态，由PlayerInput中的各位组合而成
+        """
+        profiler = self.profiler
+        self.applyPlayerInput(playerInput)
+        profiler.lap("playerInput")
+        self.updateFire()
+        profiler.lap("updateFire")
+        self.enemySpan()
+        profiler.lap("enemySpan")
+        self.enemyFire()
+        profiler.lap("enemyFire")
+        self.enemyStateUpdate()
+        profiler.lap("enemyStateUpdate")
+        self.playerStateUpdate()
+        profiler.lap("playerStateUpdate")
+        self.itemMove()
+        profiler.lap("itemMove")
+        self.timeStamp += self.frameInterv
+        self.tickCount += 1
+
+    def applyPlayerInput(self, playerInput) -> None:
+        """
+            根据本帧的按键，玩家移动并尝试开火
+
+            Parameters
+            ----------
+            playerInput : int
+                由PlayerInput中的各位组合而成的按键状态
+        """
+        self.playerPrevPos = tuple(self.player.pos)
+        self.tickFirstHandle = self.bulletContainer.nextHandle
+        for (direction, eachKey) in enumerate(PlayerInput.directionList):
+            if(playerInput & eachKey):
+                self.playerMove(direction)
+        if(playerInput & PlayerInput.FIRE):
+            self.playerFire()
+
     def playerMove(self, direction) -> None:
         """
             玩家移动
@@ -87,14 +284,16 @@ class Stage:
             direction : int
                 移动方向，0:上，1:左，2:下，3:右
         """
-        if(direction == 0 and self.checkPlayerMove((self.player.pos[0], self.player.pos[1]-self.player.velocity))):
-            self.player.pos[1] -= self.player.velocity
-        elif(direction == 1 and self.checkPlayerMove((self.player.pos[0]-self.player.velocity, self.player.pos[1]))):
-            self.player.pos[0] -= self.player.velocity
-        elif(direction == 2 and self.checkPlayerMove((self.player.pos[0], self.player.pos[1]+self.player.velocity))):
-            self.player.pos[1] += self.player.velocity
-        elif(direction == 3 and self.checkPlayerMove((self.player.pos[0]+self.player.velocity, self.player.pos[1]))):
-            self.player.pos[0] += self.player.velocity
+        # 按baseFrameInterv分段移动，放大步长时也能走到逐帧推进所能到达的边界附近
+        subStepCount = self.getSubStepCount()
+        step = self.player.velocity * self.frameInterv / subStepCount / 1e3 # 每一段的移动距离
+        (dx, dy) = [(0, -step), (-step, 0), (0, step), (step, 0)][direction]
+        for i in range(subStepCount):
+            aimPos = (self.player.pos[0] + dx, self.player.pos[1] + dy)
+            if(not self.checkPlayerMove(aimPos)):
+                break
+            self.player.pos[0] = aimPos[0]
+            self.player.pos[1] = aimPos[1]
 
     def checkPlayerMove(self, aimPos) -> bool:
         """
@@ -114,146 +313,67 @@ class Stage:
         """
             玩家发射子弹
         """
-        # 如果间隔时间不够，则不发射子弹
-        if(self.timeStamp - self.player.lastTimeFired < self.player.fireInterv):
-            return
-        # 生成子弹后，将其加入到子弹容器中
-        for eachFirePos in self.player.firePos:
-            newBulletPos = [self.player.pos[0]+eachFirePos[0],self.player.pos[1]+eachFirePos[1]]
-            if(self.player.hasBlaster == False):
-                newBullet = PlayerBullet(newBulletPos, [0, -10])
-            else:
-                newBullet = PlayerBlasterBullet(newBulletPos, [0, -10])
-            newBullet.atk = self.player.atk
-            self.bulletContainer.append(newBullet)
-        # 发射子弹后，更新玩家最近发射时间
-        self.player.lastTimeFired = self.timeStamp
+        # 所有炮口的子弹整批写入子弹容器，不生成子弹对象；间隔时间不够时不发射
+        bulletClass = PlayerBlasterBullet if self.player.hasBlaster else PlayerBullet
+        for fireTime in self.getFireTimeList(self.player.lastTimeFired, self.player.fireInterv):
+            age = self.timeStamp - fireTime
+            pos = self.player.pos
+            # 大步长中途发射时，炮口取玩家本帧移动到发射时刻的位置
+            if(age > 0):
+                ratio = age / self.frameInterv
+                pos = (pos[0] - (pos[0] - self.playerPrevPos[0]) * ratio, pos[1] - (pos[1] - self.playerPrevPos[1]) * ratio)
+            self.bulletContainer.extend(bulletClass, np.add(self.player.firePos, pos), (0, -600), self.player.atk, age / 1e3)
+            # 发射子弹后，更新玩家最近发射时间
+            self.player.lastTimeFired = fireTime
+
+    def getSubStepCount(self) -> int:
+        """
+            本帧相当于逐帧推进的帧数，即frameInterv是baseFrameInterv的多少倍
+        """
+        return max(1, round(self.frameInterv / Stage.baseFrameInterv))
+
+    def getFireTimeList(self, lastTimeFired, fireInterv) -> list:
+        """
+            本帧内的各个发射时刻：按baseFrameInterv逐帧检查发射间隔，放大步长时发射次数和时刻与逐帧推进一致
+
+            Parameters
+            ----------
+            lastTimeFired : float
+                最近一次发射的时间戳
+            fireInterv : float
+                发射间隔，单位：ms
+
+            Returns
+            -------
+            fireTimeList : float[]
+                本帧内各次发射的时间戳，不晚于当前时间戳，逐帧推进时最多一个
+        """
+        # 各发射时刻都不晚于当前时间戳，当前时刻还不能发射时本帧内都不会发射
+        if(self.timeStamp - lastTimeFired < fireInterv):
+            return []
+        subStepCount = self.getSubStepCount()
+        fireTimeList = []
+        for i in range(subStepCount - 1, -1, -1):
+            fireTime = self.timeStamp - i * Stage.baseFrameInterv
+            if(fireTime - lastTimeFired >= fireInterv):
+                fireTimeList.append(fireTime)
+                lastTimeFired = fireTime
+        return fireTimeList
 
     def enemyFire(self) -> None:
         """
-            敌人发射子弹
+            敌人发射子弹，发射方式由各敌人类的fire决定
         """
-        # 对于每个敌人
+        # 瞄准玩家的敌人先一次算出指向玩家的方向
+        self.enemyContainer.updateAim(0, len(self.enemyContainer.entities), self.player.pos)
         for eachEnemy in self.enemyContainer:
-            # 非最终BOSS情形
-            if(eachEnemy.__class__.__name__ != "DeathStar"):
-                # 如果间隔时间不够，则不发射子弹
-                if(self.timeStamp - eachEnemy.lastTimeFired < eachEnemy.fireInterv):
-                    continue
-                # 对于每个炮口，生成子弹后，将其加入到子弹容器中
-                for eachFirePos in eachEnemy.firePos:
-                    # 特殊情形：三线射手：
-                    if(eachEnemy.__class__.__name__ == "TripleShooter"):
-                        for eachVelocity in [[0, 5], [-1, 5], [1, 5]]:
-                            newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                            newBullet = NormalEnemyBullet(newBulletPos, eachVelocity)
-                            newBullet.atk = eachEnemy.atk
-                            self.bulletContainer.append(newBullet)
-                    # 特殊情形：弹幕敌人：
-                    elif(eachEnemy.__class__.__name__ == "BulletRainShooter"):
-                        for eachVelocity in [[5, 0], [3.5355, 3.5355], [0, 5], [-3.5355, 3.5355], [-5, 0], [-3.5355, -3.5355], [0, -5], [3.5355, -3.5355]]:
-                            newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                            newBullet = NormalEnemyBullet(newBulletPos, eachVelocity)
-                            newBullet.atk = eachEnemy.atk
-                            self.bulletContainer.append(newBullet)
-                    # 特殊情形：冲锋者：
-                    elif(eachEnemy.__class__.__name__ == "Sticker"):
-                        for eachVelocity in [[-0.67, 5], [-0.33, 5], [0, 5], [0.33, 5], [0.67, 5]]:
-                            newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                            newBullet = NormalEnemyBullet(newBulletPos, eachVelocity)
-                            newBullet.atk = eachEnemy.atk
-                            self.bulletContainer.append(newBullet)
-                    # 特殊情形：跟踪者：
-                    elif(eachEnemy.__class__.__name__ == "Tracker"):
-                        dX = self.player.pos[0] - eachEnemy.pos[0]
-                        dY = self.player.pos[1] - eachEnemy.pos[1]
-                        L = (dX**2 + dY**2)**0.5
-                        bulletVelocity = [dX / L * 5, dY / L * 5]
-                        newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                        newBullet = NormalEnemyBullet(newBulletPos, bulletVelocity)
-                        newBullet.atk = eachEnemy.atk
-                        self.bulletContainer.append(newBullet)
-                    # 特殊情形：风车
-                    elif(eachEnemy.__class__.__name__ == "Windmiller"):
-                        for eachVelocity in eachEnemy.getBulletVelocity(self.timeStamp):
-                            newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                            newBullet = NormalEnemyBullet(newBulletPos, eachVelocity)
-                            newBullet.atk = eachEnemy.atk
-                            self.bulletContainer.append(newBullet)
-                    # 特殊情形：爵爷
-                    elif(eachEnemy.__class__.__name__ == "TieVader"):
-                        newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                        newBullet = EnemyBlasterBullet(newBulletPos, [0, 5])
-                        newBullet.atk = eachEnemy.atk
-                        self.bulletContainer.append(newBullet)
-                    # 特殊情形：歼星舰
-                    elif(eachEnemy.__class__.__name__ == "StarDestroyer"):
-                        newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                        newBullet = EnemyBlasterBullet(newBulletPos, [0, 7.5])
-                        newBullet.atk = eachEnemy.atk
-                        self.bulletContainer.append(newBullet)
-                    # 特殊情形：钛战机
-                    elif(eachEnemy.__class__.__name__ == "Tie"):
-                        newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                        newBullet = EnemyBlasterBullet(newBulletPos, [0, 5])
-                        newBullet.atk = eachEnemy.atk
-                        self.bulletContainer.append(newBullet)
-                    # 普通情形
-                    else:
-                        newBulletPos = [eachEnemy.pos[0]+eachFirePos[0],eachEnemy.pos[1]+eachFirePos[1]]
-                        newBullet = NormalEnemyBullet(newBulletPos, [0, 5])
-                        newBullet.atk = eachEnemy.atk
-                        self.bulletContainer.append(newBullet)
-                # 发射子弹后，更新敌人最近发射时间
-                eachEnemy.lastTimeFired = self.timeStamp
-            # 最终BOSS单独考虑，因为有两种子弹
-            else:
-                # 普通爆能束
-                # 如果间隔时间不够，则不发射子弹
-                while True:
-                    if(self.timeStamp - eachEnemy.lastTimeFired_blaster < eachEnemy.fireInterv_blaster):
-                        break
-                    # 随机生成三个位置发射
-                    for eachFirePos in [[random.random() * 400, 0], [random.random() * 400, 0], [random.random() * 400, 0]]:
-                        newBulletPos = [eachFirePos[0],eachFirePos[1]]
-                        newBullet = EnemyBlasterBullet(newBulletPos, [0, 10])
-                        newBullet.atk = eachEnemy.atk
-                        self.bulletContainer.append(newBullet)
-                    # 发射子弹后，更新敌人最近发射时间
-                    eachEnemy.lastTimeFired_blaster = self.timeStamp
-                    break
-                # 光束
-                # 如果间隔时间不够，则不发射子弹
-                while True:
-                    if(self.timeStamp - eachEnemy.lastTimeFired_beam < eachEnemy.fireInterv_beam):
-                        break
-                    # 对于每个炮口，生成子弹后，将其加入到子弹容器中
-                    for eachFirePos in eachEnemy.firePos_beam:
-                        newBulletPos = [293, 87]
-                        newBullet = DeathStarBeamBullet(newBulletPos, [0, 10])
-                        newBullet.atk = eachEnemy.atk
-                        self.bulletContainer.append(newBullet)
-                    # 发射子弹后，更新敌人最近发射时间
-                    eachEnemy.lastTimeFired_beam = self.timeStamp
-                    break
+            eachEnemy.fire(self)
 
     def updateFire(self):
         """
             更新子弹位置，并删除已经到达界外或爆炸结束的子弹
         """
-        removeList = []
-        for eachBullet in self.bulletContainer:
-            eachBullet.move()
-            # 如果已经移动到了场外，则删除这个子弹
-            if(self.isOutside(eachBullet.pos)):
-                removeList.append(eachBullet)
-            # 如果子弹已爆炸，则更新子弹爆炸状态
-            if(eachBullet.isExplosion):
-                if(not eachBullet.nextExplosion()):
-                    # 若播放已结束，则移除子弹
-                    removeList.append(eachBullet)
-        for eachRemoveBullet in removeList:
-            self.bulletContainer.remove(eachRemoveBullet)
+        self.bulletContainer.update(self.screenSize, self.frameInterv / 1e3, self.isSweptCollision())
 
     def isOutside(self, pos) -> bool:
         """
@@ -272,107 +392,107 @@ class Stage:
         """
             逐个判断敌人的状态，并删除场外或已被消灭的敌人
         """
-        removeList = []
         self.enemyMove() # 敌人移动
-        # 判断敌人与子弹的碰撞以及是否出界
-        for eachEnemy in self.enemyContainer:
-            # 与子弹的碰撞
-            for eachBullet in self.bulletContainer:
+        bulletPool = self.bulletContainer
+        enemyContainer = self.enemyContainer
+        # 本阶段中敌人的位置不再变化，所有敌人与玩家子弹的碰撞一次整块判定
+        (boxes, steps) = enemyContainer.getCrashBoxes()
+        (boxIdx, bulletIdx) = self.getCrashBulletPairs(boxes, steps, 'P')
+        hitCountList = np.bincount(boxIdx, minlength=len(boxes)).tolist() if len(boxIdx) > 0 else [0] * len(boxes)
+        bulletIdxList = bulletIdx.tolist()
+        hitStart = 0
+        # 逐个结算敌人被命中和是否出界
+        for (eachEnemy, isAlive, (x, y), hitCount) in zip(enemyContainer.entities, enemyContainer.alive, enemyContainer.pos[:len(boxes)].tolist(), hitCountList):
+            hitEnd = hitStart + hitCount
+            if(not isAlive):
+                hitStart = hitEnd
+                continue
+            for eachBulletIdx in bulletIdxList[hitStart:hitEnd]:
+                # 同一颗子弹同时命中多个敌人时，只有排在前面的敌人被命中
+                if(bulletPool.explosionFrame[eachBulletIdx] != 0):
+                    continue
                 # 被玩家子弹命中扣血
-                if(eachBullet.bulletOwner == 'P' and self.isBulletCrashObj(eachEnemy, eachBullet.pos) and eachBullet.isExplosion == False):
-                    eachEnemy.hp -= ((eachBullet.atk - eachEnemy.defen) if (eachBullet.atk - eachEnemy.defen >= 1) else 1)
-                    # 游戏得分相应地增加
-                    self.score += ((eachBullet.atk - eachEnemy.defen) if (eachBullet.atk - eachEnemy.defen >= 1) else 1)
-                    # 血量为0时，敌人死亡
-                    if(eachEnemy.hp <= 0):
-                        if(eachEnemy in self.enemyContainer): # 这里不知道为什么会出现删除时不在列表中的错误，先加上if保险（现在知道了，去掉这句话应该没事）
-                            removeList.append(eachEnemy)
-                            # 如果死亡的是BOSS，则重设时间戳到打BOSS前的状态，并提升level
-                            if(eachEnemy.__class__.__name__ in self.bossName):
-                                self.timeStamp = self.bossTS
-                                self.player.lastTimeFired = self.bossTS
-                                if(eachEnemy.__class__.__name__ == "DeathStar"):
-                                    self.level += 3
-                                else:
-                                    self.level += 1
-                            # 敌人死亡时，道具掉落
-                            itemXStd = 17
-                            itemYStd = 10
-                            # 特殊型，多次掉落
-                            if(eachEnemy.__class__.__name__ == "BulletRainShooter"):
-                                for i in range(3):
-                                    self.spawnItem(1, np.array(eachEnemy.pos) + np.array([random.gauss(0, itemXStd), random.gauss(0, itemYStd)]))
-                            elif(eachEnemy.__class__.__name__ in ["Sticker", "Tracker"]):
-                                for i in range(4):
-                                    self.spawnItem(1, np.array(eachEnemy.pos) + np.array([random.gauss(0, itemXStd), random.gauss(0, itemYStd)]))
-                            elif(eachEnemy.__class__.__name__ in ["Windmiller", "TieVader"]):
-                                for i in range(5):
-                                    self.spawnItem(1, np.array(eachEnemy.pos) + np.array([random.gauss(0, itemXStd), random.gauss(0, itemYStd)]))
-                                # 击败爵爷时必定掉落爆能束装备
-                                if(eachEnemy.__class__.__name__ == "TieVader"):
-                                    newItem = BlasterItem(np.array(eachEnemy.pos) + np.array([random.gauss(0, itemXStd), random.gauss(0, itemYStd)]))
-                                    self.itemContainer.append(newItem)
-                            elif(eachEnemy.__class__.__name__ == "StarDestroyer"):
-                                for i in range(10):
-                                    self.spawnItem(1, np.array(eachEnemy.pos) + np.array([random.gauss(0, itemXStd), random.gauss(0, itemYStd)]))
-                                # 击败歼星舰时必定掉落炮管增加装备
-                                newItem = AddFirePosItem(np.array(eachEnemy.pos) + np.array([random.gauss(0, itemXStd), random.gauss(0, itemYStd)]))
-                                self.itemContainer.append(newItem)
-                            elif(eachEnemy.__class__.__name__ == "DeathStar"):
-                                for i in range(20):
-                                    self.spawnItem(1, np.array([random.gauss(200, itemXStd), random.gauss(100, itemYStd)]))
-                            # 非特殊型，仅一次掉落
+                eachBulletAtk = float(bulletPool.atk[eachBulletIdx])
+                eachEnemy.hp -= ((eachBulletAtk - eachEnemy.defen) if (eachBulletAtk - eachEnemy.defen >= 1) else 1)
+                # 游戏得分相应地增加
+                self.score += ((eachBulletAtk - eachEnemy.defen) if (eachBulletAtk - eachEnemy.defen >= 1) else 1)
+                # 血量为0时，敌人死亡，同一敌人只会被移除一次，死亡事件也只触发一次
+                if(eachEnemy.hp <= 0):
+                    if(self.enemyContainer.remove(eachEnemy.handle)):
+                        # 如果死亡的是BOSS，则清除BOSS记录，重设时间戳到打BOSS前的状态，并提升level
+                        if(eachEnemy.isBoss):
+                            if(eachEnemy is self.boss):
+                                self.boss = None
+                            self.bossKillList.append((eachEnemy.__class__.__name__, self.tickCount * self.frameInterv, self.timeStamp - self.bossTS))
+                            self.timeStamp = self.bossTS
+                            self.player.lastTimeFired = self.bossTS
+                            self.spawnScheduler.reschedule(self.bossTS)
+                            if(eachEnemy.__class__.__name__ == "DeathStar"):
+                                self.level += 3
+                            else:
+                                self.level += 1
+                        # 敌人死亡时，道具在爆点附近散开掉落
+                        # 特殊型，多次掉落
+                        if(eachEnemy.__class__.__name__ == "BulletRainShooter"):
+                            self.spawnItems(3, 1, (x, y))
+                        elif(eachEnemy.__class__.__name__ in ["Sticker", "Tracker"]):
+                            self.spawnItems(4, 1, (x, y))
+                        elif(eachEnemy.__class__.__name__ in ["Windmiller", "TieVader"]):
+                            self.spawnItems(5, 1, (x, y))
+                            # 击败爵爷时必定掉落爆能束装备
+                            if(eachEnemy.__class__.__name__ == "TieVader"):
+                                self.spawnItems(1, 1, (x, y), BlasterItem)
+                        elif(eachEnemy.__class__.__name__ == "StarDestroyer"):
+                            self.spawnItems(10, 1, (x, y))
+                            # 击败歼星舰时必定掉落炮管增加装备
+                            self.spawnItems(1, 1, (x, y), AddFirePosItem)
+                        elif(eachEnemy.__class__.__name__ == "DeathStar"):
+                            self.spawnItems(20, 1, (200, 100))
+                        # 非特殊型，仅一次掉落
+                        else:
+                            if(eachEnemy.__class__.__name__ == "OneHpEnemy"):
+                                prob = 0.2
+                            elif(eachEnemy.__class__.__name__ == "DoubleWarrior"):
+                                prob = 0.33
+                            elif(eachEnemy.__class__.__name__ == "TripleShooter"):
+                                prob = 0.33
+                            elif(eachEnemy.__class__.__name__ == "Tie"):
+                                prob = 0.45
                             else:
-                                if(eachEnemy.__class__.__name__ == "OneHpEnemy"):
-                                    prob = 0.2
-                                elif(eachEnemy.__class__.__name__ == "DoubleWarrior"):
-                                    prob = 0.33
-                                elif(eachEnemy.__class__.__name__ == "TripleShooter"):
-                                    prob = 0.33
-                                elif(eachEnemy.__class__.__name__ == "Tie"):
-                                    prob = 0.45
-                                else:
-                                    prob = 0
-                                self.spawnItem(prob, np.array(eachEnemy.pos) + np.array([random.gauss(0, itemXStd), random.gauss(0, itemYStd)]))
-                    # 命中后设置爆炸状态
-                    eachBullet.isExplosion = True
-                    eachBullet.velocity = [0,0]
-                    eachBullet.nextExplosion()
+                                prob = 0
+                            self.spawnItems(1, prob, (x, y))
+                # 命中后设置爆炸状态
+                bulletPool.explode(eachBulletIdx)
+            hitStart = hitEnd
             # 出界一定范围后移除敌人
-            effPos = [eachEnemy.pos[0], eachEnemy.pos[1] * 0.8]
-            if(self.isOutside(effPos)):
+            if(self.isOutside((x, y * 0.8))):
                 # BOSS除外
-                if(eachEnemy.__class__.__name__ not in self.bossName):
-                    removeList.append(eachEnemy)
-        for eachRemoveEnemy in removeList:
-            try:
-                self.enemyContainer.remove(eachRemoveEnemy)
-            except:
-                continue
+                if(not eachEnemy.isBoss):
+                    self.enemyContainer.remove(eachEnemy.handle)
+        self.enemyContainer.compact()
 
     def playerStateUpdate(self):
         """
             更新玩家状态，包括被子弹命中扣血，血量为零触发事件
         """
-        # 与子弹的碰撞
-        for eachBullet in self.bulletContainer:
+        # 与敌人子弹的碰撞
+        bulletPool = self.bulletContainer
+        playerStep = (self.player.pos[0] - self.playerPrevPos[0], self.player.pos[1] - self.playerPrevPos[1])
+        for eachBulletIdx in self.getCrashBulletIdx(self.player, 'E', playerStep):
             # 命中扣血
-            if(self.isBulletCrashObj(self.player, eachBullet.pos) and eachBullet.isExplosion == False):
-                self.player.hp -= (eachBullet.atk - self.player.defen) if (eachBullet.atk - self.player.defen >= 1) else 1
-                # 死亡时触发事件
-                if(self.player.hp <= 0):
-                    self.gameover()
-                # 命中后设置爆炸状态
-                eachBullet.isExplosion = True
-                eachBullet.velocity = [0,0]
-                eachBullet.nextExplosion()
+            eachBulletAtk = float(bulletPool.atk[eachBulletIdx])
+            self.player.hp -= (eachBulletAtk - self.player.defen) if (eachBulletAtk - self.player.defen >= 1) else 1
+            # 死亡时触发事件
+            if(self.player.hp <= 0):
+                self.gameover()
+            # 命中后设置爆炸状态
+            bulletPool.explode(eachBulletIdx)
         # 与物品的碰撞
-        removeList = []
         for eachItem in self.itemContainer:
-            eachItem.img = pygame.image.load(eachItem.srcImg)
-            if(self.isItemPickUp(eachItem)):
+            if(self.isItemPickUp(eachItem, playerStep)):
                 # 根据物品的不同，获得不同的效果
                 itemName = eachItem.__class__.__name__
+                self.itemPickupCount[itemName] = self.itemPickupCount.get(itemName, 0) + 1
                 if(itemName == "RecoverItem"):
                     self.player.hp = self.player.hp + (eachItem.addHp * self.player.hpMax) if(self.player.hp + (eachItem.addHp * self.player.hpMax) <= self.player.hpMax) else self.player.hpMax
                 elif(itemName == "AddHpLimitItem"):
@@ -393,59 +513,41 @@ class Stage:
                     self.player.addFirePos()
                     self.player.defen *= 2
                 # 吃完道具后，道具消失
-                removeList.append(eachItem)
-        for eachRemoveItem in removeList:
-            self.itemContainer.remove(eachRemoveItem)
+                self.itemContainer.remove(eachItem.handle)
+        self.itemContainer.compact()
 
     def enemyMove(self):
         """
-            敌人移动
-            对于特殊的BOSS，还将采取其他的措施
+            敌人移动：直线运动的敌人由敌人容器批量移动，再对需要的敌人逐个调用afterMove（切换运动状态、放出敌人等），
+            运动方式特殊的敌人逐个调用updateMove
+        """
+        dt = self.frameInterv / 1e3
+        enemyContainer = self.enemyContainer
+        enemyContainer.savePrevPos()
+        start = 0
+        # 本帧放出的敌人同样要移动一步，直到没有新的敌人加入为止
+        while(start < len(enemyContainer.entities)):
+            end = len(enemyContainer.entities)
+            # 直线运动和横向反弹整块完成
+            enemyContainer.moveLinear(start, end, self.screenSize, dt)
+            # 瞄准玩家的敌人按移动后的位置一次算出指向玩家的方向
+            enemyContainer.updateAim(start, end, self.player.pos)
+            # 运动方式特殊或需要切换运动模式的敌人逐个处理
+            perObject = enemyContainer.perObject[start:end]
+            if(np.count_nonzero(perObject) > 0):
+                for row in (start + np.flatnonzero(perObject)).tolist():
+                    if(not enemyContainer.alive[row]):
+                        continue
+                    eachEnemy = enemyContainer.entities[row]
+                    if(eachEnemy.isLinearMover):
+                        eachEnemy.afterMove(self, dt)
+                    else:
+                        eachEnemy.updateMove(self, dt)
+            start = end
+
+    def isBulletCrashObj(self, obj, bulletPos, bulletPrevPos=None) -> bool:
         """
-        for eachEnemy in self.enemyContainer:
-            # 如果即将越界，则立刻切换方向，切换后再移动
-            newPos = [eachEnemy.pos[0]+eachEnemy.velocity[0], eachEnemy.pos[1]+eachEnemy.velocity[1]]
-            if(self.isOutside(newPos)):
-                if(newPos[0] < 0 or newPos[0] >= self.screenSize[0]): # 横向出界
-                    eachEnemy.velocity[0] = -eachEnemy.velocity[0]
-            # 移动
-            # 特殊情形：Tracker
-            if(eachEnemy.__class__.__name__ == "Tracker"):
-                eachEnemy.move(self.player.pos)
-            # 普通情形
-            else:
-                eachEnemy.move()
-            # 特殊情形：冲锋者的运动状态修改
-            if(eachEnemy.__class__.__name__ == "Sticker"):
-                eachEnemy.modeSwitch(self.timeStamp)
-            # 特殊情形：风车的运动状态修改
-            if(eachEnemy.__class__.__name__ == "Windmiller"):
-                eachEnemy.modeSwitch(self.timeStamp)
-            # 特殊情形：爵爷的运动状态修改
-            if(eachEnemy.__class__.__name__ == "TieVader"):
-                eachEnemy.modeSwitch(self.timeStamp, self.player.pos)
-            # 特殊情形：歼星舰放出钛战机
-            if(eachEnemy.__class__.__name__ == "StarDestroyer"):
-                if(((self.timeStamp - 1e3 / 60) / 1e3) % 3 > (self.timeStamp / 1e3) % 3):
-                    newEnemy = Tie([eachEnemy.pos[0], eachEnemy.pos[1]])
-                    self.resetEnemyPowerByLevel(newEnemy)
-                    self.enemyContainer.append(newEnemy)
-            # 特殊情形：最终BOSS
-            if(eachEnemy.__class__.__name__ == "DeathStar"):
-                # 炮弹位置切换
-                eachEnemy.modeSwitch(self.timeStamp)
-                # 放出敌人
-                enemyTable = ["OneHpEnemy", "DoubleWarrior", "TripleShooter", "Tie"]
-                if(((self.timeStamp - 1e3 / 60) / 1e3) % 3 > (self.timeStamp / 1e3) % 3):
-                    for i in range(3):
-                        enemyName = enemyTable[int(random.random() * len(enemyTable))]
-                        newEnemy = globals()[enemyName]([random.random() * 400, 0])
-                        self.resetEnemyPowerByLevel(newEnemy)
-                        self.enemyContainer.append(newEnemy)
-
-    def isBulletCrashObj(self, obj, bulletPos) -> bool:
-        """
-            检查实体是否被某个子弹命中
+            检查实体是否被某个子弹命中，子弹本步的移动轨迹穿过碰撞箱即算命中
 
             Parameters
             ----------
@@ -453,15 +555,171 @@ class Stage:
                 实体
             bulletPos : float[2]
                 子弹的位置
+            bulletPrevPos : float[2]
+                子弹移动前的位置，为None时只判断当前位置
 
             Return
             ------
             True / False
                 被命中 / 未被命中
         """
-        if(obj.pos[0]-obj.crashBox[0] <= bulletPos[0] <= obj.pos[0]+obj.crashBox[0] and obj.pos[1]-obj.crashBox[1] <= bulletPos[1] <= obj.pos[1]+obj.crashBox[1]):
-            return True
-        return False
+        if(bulletPrevPos is None):
+            bulletPrevPos = bulletPos
+        return segmentHitsBox(bulletPrevPos, bulletPos, obj.pos[0]-obj.crashBox[0], obj.pos[1]-obj.crashBox[1], obj.pos[0]+obj.crashBox[0], obj.pos[1]+obj.crashBox[1])
+
+    def updateBulletIndex(self) -> SpatialHash:
+        """
+            子弹池发生变化后重建子弹的空间索引，同一帧内敌人和玩家的碰撞检测共用同一个索引，只在子弹很多时使用
+            放大时间步长时还要算出子弹本步位移的最大值，查询时矩形向外扩展这么多，以找到轨迹穿过矩形的子弹
+        """
+        bulletPool = self.bulletContainer
+        if(self.bulletIndex.version != bulletPool.version):
+            n = bulletPool.size
+            self.bulletIndex.build(bulletPool.pos[:n], bulletPool.version)
+            if(self.isSweptCollision() and n > 0):
+                self.bulletMaxStep = tuple(np.abs(bulletPool.pos[:n] - bulletPool.prevPos[:n]).max(axis=0).tolist())
+            else:
+                self.bulletMaxStep = (0, 0)
+        return self.bulletIndex
+
+    def isSweptCollision(self) -> bool:
+        """
+            碰撞是否按轨迹做扫掠判定：只有放大时间步长时子弹一步的位移才可能超过碰撞箱的大小，逐帧推进时只判断当前位置
+        """
+        return self.getSubStepCount() > 1
+
+    def getCrashBulletIdx(self, obj, bulletOwner=None, objStep=(0, 0)):
+        """
+            找出命中实体的所有未爆炸子弹
+
+            Parameters
+            ----------
+            obj : BaseEnemy / Player
+                实体
+            bulletOwner : char
+                只考虑该发射人的子弹，为None时考虑所有子弹
+            objStep : float[2]
+                实体本帧的位移
+
+            Returns
+            -------
+            idx : int[]
+                命中实体的子弹在子弹池中的下标，按升序排列
+        """
+        xMin = obj.pos[0] - obj.crashBox[0]
+        xMax = obj.pos[0] + obj.crashBox[0]
+        yMin = obj.pos[1] - obj.crashBox[1]
+        yMax = obj.pos[1] + obj.crashBox[1]
+        return self.getCrashBulletIdxInBox(xMin, yMin, xMax, yMax, bulletOwner, objStep)
+
+    def getCrashBulletIdxInBox(self, xMin, yMin, xMax, yMax, bulletOwner=None, boxStep=(0, 0)):
+        """
+            找出命中一个矩形区域的所有未爆炸子弹，判定方式同getCrashBulletPairs
+
+            Parameters
+            ----------
+            xMin, yMin, xMax, yMax : float
+                矩形区域移动后的边界
+            bulletOwner : char
+                只考虑该发射人的子弹，为None时考虑所有子弹
+            boxStep : float[2]
+                矩形区域本步的位移
+
+            Returns
+            -------
+            idx : int[]
+                区域内子弹在子弹池中的下标，按升序排列
+        """
+        return self.getCrashBulletPairs(np.array([[xMin, yMin, xMax, yMax]], dtype=float), np.array([boxStep], dtype=float), bulletOwner)[1]
+
+    def getCrashBulletPairs(self, boxes, boxSteps, bulletOwner=None):
+        """
+            一次找出多个矩形区域各自被哪些未爆炸子弹命中
+            逐帧推进时判断子弹的当前位置是否在矩形内；放大时间步长时判断本步移动轨迹是否穿过矩形（扫掠碰撞），
+            子弹不会穿透较薄的碰撞箱，矩形本身也在移动时按子弹相对矩形的运动判定
+            矩形与候选子弹的组合不超过denseCrashLimit时（绝大多数帧）整块判定所有组合，超过时先用空间索引为每个矩形粗筛；
+            逐帧推进且组合不超过scalarCrashLimit时逐个比较
+
+            Parameters
+            ----------
+            boxes : float[m][4]
+                各矩形区域移动后的边界(xMin, yMin, xMax, yMax)
+            boxSteps : float[m][2]
+                各矩形区域本步的位移
+            bulletOwner : char
+                只考虑该发射人的子弹，为None时考虑所有子弹
+
+            Returns
+            -------
+            boxIdx : int[]
+                命中的矩形序号，按升序排列
+            bulletIdx : int[]
+                对应的子弹在子弹池中的下标，同一矩形内按升序排列
+        """
+        bulletPool = self.bulletContainer
+        n = bulletPool.size
+        m = len(boxes)
+        if(m == 0 or n == 0):
+            return (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp))
+        ownerId = BulletPool.ownerName.index(bulletOwner) if bulletOwner is not None else None
+        isSwept = self.isSweptCollision()
+        if(not isSwept and m * n <= Stage.denseCrashLimit):
+            # 逐帧推进时直接判断所有组合中子弹的当前位置，命中的组合很少，之后再去掉已爆炸、已删除和其他发射人的子弹
+            if(m * n <= Stage.scalarCrashLimit):
+                # 组合很少时逐个比较，开销比NumPy的多次调用小
+                boxIdxList = []
+                bulletIdxList = []
+                posList = bulletPool.pos[:n].tolist()
+                for (i, (xMin, yMin, xMax, yMax)) in enumerate(boxes.tolist()):
+                    for (j, (x, y)) in enumerate(posList):
+                        if(xMin <= x <= xMax and yMin <= y <= yMax):
+                            boxIdxList.append(i)
+                            bulletIdxList.append(j)
+                if(len(bulletIdxList) == 0):
+                    return (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp))
+                (boxIdx, bulletIdx) = (np.array(boxIdxList, dtype=np.intp), np.array(bulletIdxList, dtype=np.intp))
+            else:
+                pos = bulletPool.pos[:n]
+                isHit = (boxes[:, 0:1] <= pos[:, 0]) & (pos[:, 0] <= boxes[:, 2:3]) & (boxes[:, 1:2] <= pos[:, 1]) & (pos[:, 1] <= boxes[:, 3:4])
+                (boxIdx, bulletIdx) = np.nonzero(isHit)
+            if(len(bulletIdx) == 0):
+                return (boxIdx, bulletIdx)
+            isValid = (bulletPool.explosionFrame[bulletIdx] == 0) & bulletPool.alive[bulletIdx]
+            if(ownerId is not None):
+                isValid &= bulletPool.owner[bulletIdx] == ownerId
+            return (boxIdx[isValid], bulletIdx[isValid])
+        # 未爆炸、未被删除的子弹才参与判定
+        isCandidate = (bulletPool.explosionFrame[:n] == 0) & bulletPool.alive[:n]
+        if(ownerId is not None):
+            isCandidate &= bulletPool.owner[:n] == ownerId
+        candidates = np.flatnonzero(isCandidate)
+        k = len(candidates)
+        if(k == 0):
+            return (np.zeros(0, dtype=np.intp), candidates)
+        if(m * k <= Stage.denseCrashLimit):
+            boxIdx = np.repeat(np.arange(m), k)
+            bulletIdx = np.tile(candidates, m)
+        else:
+            # 子弹很多时，每个矩形只取出移动前后所在格子中的子弹，轨迹穿过矩形的子弹当前位置离矩形最多bulletMaxStep
+            bulletIndex = self.updateBulletIndex()
+            (stepX, stepY) = self.bulletMaxStep
+            idxList = []
+            for ((xMin, yMin, xMax, yMax), (dx, dy)) in zip(boxes.tolist(), boxSteps.tolist()):
+                eachIdx = bulletIndex.query(xMin - max(dx, 0) - stepX, yMin - max(dy, 0) - stepY, xMax - min(dx, 0) + stepX, yMax - min(dy, 0) + stepY)
+                idxList.append(eachIdx[isCandidate[eachIdx]])
+            boxIdx = np.repeat(np.arange(m), [len(eachIdx) for eachIdx in idxList])
+            bulletIdx = np.concatenate(idxList)
+        box = boxes[boxIdx]
+        if(not isSwept):
+            pos = bulletPool.pos[bulletIdx]
+            isHit = (box[:, 0] <= pos[:, 0]) & (pos[:, 0] <= box[:, 2]) & (box[:, 1] <= pos[:, 1]) & (pos[:, 1] <= box[:, 3])
+        else:
+            # 在矩形的参考系中对子弹的相对轨迹做判定：相对轨迹的起点为移动前的位置加上矩形的位移
+            # 本帧发射的子弹从发射点出发，发射时矩形已经移动过，起点不再加上矩形的位移
+            isOld = (bulletPool.handle[bulletIdx] < self.tickFirstHandle)[:, None]
+            start = bulletPool.prevPos[bulletIdx] + isOld * boxSteps[boxIdx]
+            isHit = segmentsHitBox(start, bulletPool.pos[bulletIdx], box[:, 0], box[:, 1], box[:, 2], box[:, 3])
+        return (boxIdx[isHit], bulletIdx[isHit])
 
     def enemyDeath(self):
         """
@@ -475,126 +733,145 @@ class Stage:
         """
         # 如果BOSS在场，则不生成新的敌人
         if(not self.isBossOnstage()):
-            enemySpanConfigFile = open("./config/enemySpanConfig.json", "r")
-            enemySpanConfig = json.load(enemySpanConfigFile)
-            enemyList = enemySpanConfig["enemies"]
-            for eachEnemy in enemyList:
-                newEnemy = None
-                className = eachEnemy["className"]
-                # 间隔固定时间出现的敌人
-                if(eachEnemy["appearBy"] == "time"):
-                    timeCorr = 0
-                    # 对于指定在某个时间段之后才会等间隔出现的敌人，如果时候未到，直接跳过，而如果时间到了，则立刻开始
-                    if("firstTime" in eachEnemy.keys()):
-                        effTime = eachEnemy["firstTime"] - self.timeStamp
-                        if(effTime > 0):
-                            continue
-                        timeCorr = -eachEnemy["firstTime"]
-                    mu = eachEnemy["mu"]
-                    std = eachEnemy["std"]
-                    dtEnemy = random.gauss(mu, std)
-                    while(dtEnemy < 0):
-                        dtEnemy = random.gauss(mu, std)
-                    if((self.lastTimeStamp + timeCorr) % dtEnemy > (self.timeStamp + timeCorr) % dtEnemy and self.lastTimeStamp < self.timeStamp):
-                        # 随机位置生成的敌人
-                        if(eachEnemy["appearMode"] == "random"):
-                            newEnemy = globals()[className]([random.random()*self.screenSize[0], 0])
-                        # 固定位置生成的敌人
-                        if(eachEnemy["appearMode"] == "fix"):
-                            newEnemy = globals()[className]([eachEnemy["posX"], eachEnemy["posY"]])
-                # 在指定时间点立刻生成的敌人
-                elif(eachEnemy["appearBy"] == "immediately"):
-                    for eachTimeStamp in eachEnemy["spawnAt"]:
-                        if(self.lastTimeStamp < eachTimeStamp and self.timeStamp >= eachTimeStamp):
-                            # 随机位置生成的敌人
-                            if(eachEnemy["appearMode"] == "random"):
-                                newEnemy = globals()[className]([random.random()*self.screenSize[0], 0])
-                            # 固定位置生成的敌人
-                            if(eachEnemy["appearMode"] == "fix"):
-                                newEnemy = globals()[className]([eachEnemy["posX"], eachEnemy["posY"]])
-                if(newEnemy):
-                    self.resetEnemyPowerByLevel(newEnemy)
-                    self.enemyContainer.append(newEnemy)
-                    # 如果新的敌人是BOSS，则更新BOSS时间戳
-                    if(newEnemy.__class__.__name__ in self.bossName):
-                        self.bossTS = self.timeStamp
+            self.spawnScheduler.checkReload(self.timeStamp)
+            for eachRule in self.spawnScheduler.popDue(self.lastTimeStamp, self.timeStamp):
+                # 随机位置生成的敌人
+                if(eachRule.appearMode == "random"):
+                    newEnemy = eachRule.enemyClass([self.rng.random()*self.screenSize[0], 0], self.rng)
+                # 固定位置生成的敌人
+                else:
+                    newEnemy = eachRule.enemyClass([eachRule.posX, eachRule.posY], self.rng)
+                self.addEnemy(newEnemy)
         # 用于下一次的判断
         self.lastTimeStamp = self.timeStamp
 
+    def addEnemy(self, newEnemy):
+        """
+            敌人登场：根据level强化属性后加入敌人容器，如果是BOSS则记录BOSS并更新BOSS时间戳
+
+            Parameters
+            ----------
+            newEnemy : BaseEnemy
+                新的敌人
+        """
+        self.resetEnemyPowerByLevel(newEnemy)
+        self.enemyContainer.append(newEnemy)
+        if(newEnemy.isBoss):
+            self.boss = newEnemy
+            self.bossTS = self.timeStamp
+
     def gameover(self):
         """
             游戏结束触发事件
         """
-        print("Game Over! Score : %d" % int(self.score))
         self.player.hp = 0
-        pass
+        self.isGameOver = True
 
     def isBossOnstage(self) -> bool:
         """
             判断BOSS是否在场上
         """
-        for eachEnemy in self.enemyContainer:
-            if(eachEnemy.__class__.__name__ in self.bossName):
-                return True
-        return False
+        return self.boss is not None
 
-    def spawnItem(self, dropProb, pos):
+    def spawnItems(self, count, dropProb, center, itemClass=None, std=(17, 10)):
         """
-            击杀敌人时调用，尝试生成道具
+            一次掉落多个道具，各道具的位置在爆点附近按高斯分布散开，并各自按爆率判定是否生成
 
             Parameters
             ----------
+            count : int
+                掉落次数
             dropProb : float
-                爆率
-            pos : float[2]
+                每次掉落的爆率，不小于1时必定掉落
+            center : float[2]
                 爆点
+            itemClass : class
+                掉落的道具类，为None时按权重随机抽取
+            std : float[2]
+                x/y方向上散开的标准差
+        """
+        rng = self.rng
+        posList = self.getScatterPosList(count, center, std)
+        for pos in posList:
+            if(dropProb < 1 and rng.random() >= dropProb):
+                continue
+            eachClass = itemClass if itemClass is not None else self.itemClassList[self.itemSampler.sample(rng)]
+            self.itemContainer.append(self.itemFreeList.acquire(eachClass, pos))
+
+    def getScatterPosList(self, count, center, std) -> list:
         """
-        # 如果没有生成道具，则直接返回
-        if(random.random() >= dropProb):
-            return
-        # 生成道具
-        spawnItemName = list(self.itemDict.keys())[self.itemSpawnTable[int(random.random() * len(self.itemSpawnTable))]]
-        newItem = globals()[spawnItemName](pos)
-        self.itemContainer.append(newItem)
+            在center附近按高斯分布散开的count个位置
+            道具较多时（不少于scatterBatchLimit个）整批算出：每个位置取两个均匀分布随机数，经Box-Muller变换得到x/y方向上相互独立的高斯偏移；
+            道具较少时NumPy的调用开销更大，逐个调用rng.gauss
+
+            Parameters
+            ----------
+            count : int
+                位置个数
+            center : float[2]
+                中心
+            std : float[2]
+                x/y方向上的标准差
+
+            Returns
+            -------
+            posList : float[count][2]
+                各位置
+        """
+        rng = self.rng
+        (cx, cy) = (float(center[0]), float(center[1]))
+        (xStd, yStd) = std
+        if(count < Stage.scatterBatchLimit):
+            return [[rng.gauss(cx, xStd), rng.gauss(cy, yStd)] for i in range(count)]
+        u = np.array([rng.random() for i in range(2 * count)])
+        radius = np.sqrt(-2 * np.log1p(-u[:count]))
+        theta = 2 * np.pi * u[count:]
+        return (np.stack([radius * np.cos(theta), radius * np.sin(theta)], axis=1) * std + (cx, cy)).tolist()
 
     def itemMove(self):
         """
             物品在场景中移动，其中移出场景的物品被移除
         """
-        removeList = []
+        dt = self.frameInterv / 1e3
         for eachItem in self.itemContainer:
-            eachItem.move()
+            eachItem.move(dt)
             # 出界后移除物品
             effPos = [eachItem.pos[0], eachItem.pos[1] * 0.8]
             if(self.isOutside(effPos)):
-                removeList.append(eachItem)
-        for eachRemoveItem in removeList:
-            self.itemContainer.remove(eachRemoveItem)
+                self.itemContainer.remove(eachItem.handle)
+        self.itemContainer.compact()
 
-    def isItemPickUp(self, item) -> bool:
+    def isItemPickUp(self, item, playerStep=(0, 0)) -> bool:
         """
             检查玩家是否捡到道具
+            放大时间步长时按相对运动扫掠判定：逐帧推进时第k帧的玩家已经移动了k步、道具只移动了k-1步，
+            把各帧道具相对玩家的位置平移到玩家本帧结束时的参考系，连成一条线段，穿过拾取范围即算捡到
 
             Parameters
             ----------
             item : BaseItem
                 物品
+            playerStep : float[2]
+                玩家本帧的位移
         """
-        itemImgRect = item.img.get_rect()
-        itemImgRect.centerx = item.pos[0]
-        itemImgRect.centery = item.pos[1]
-        if(abs(self.player.pos[0] - item.pos[0]) <= (self.player.crashBox[0] + itemImgRect.size[0] / 2) and abs(self.player.pos[1] - item.pos[1]) <= (self.player.crashBox[1] + itemImgRect.size[1] / 2)):
-            return True
-        return False
+        (halfWidth, halfHeight) = (self.player.crashBox[0] + item.imgSize[0] / 2, self.player.crashBox[1] + item.imgSize[1] / 2)
+        if(not self.isSweptCollision()):
+            if(abs(self.player.pos[0] - item.pos[0]) <= halfWidth and abs(self.player.pos[1] - item.pos[1]) <= halfHeight):
+                return True
+            return False
+        subStepCount = self.getSubStepCount()
+        ratio = (subStepCount - 1) / subStepCount
+        dt = (subStepCount - 1) * Stage.baseFrameInterv / 1e3
+        start = (item.pos[0] + playerStep[0] * ratio, item.pos[1] + playerStep[1] * ratio)
+        end = (item.pos[0] + item.velocity[0] * dt, item.pos[1] + item.velocity[1] * dt)
+        return segmentHitsBox(start, end, self.player.pos[0] - halfWidth, self.player.pos[1] - halfHeight, self.player.pos[0] + halfWidth, self.player.pos[1] + halfHeight)
 
-    def createItemSpawnTable(self):
+    def createItemSampler(self):
         """
-            创建物品生成表，用于后续随机生成物品
+            按道具权重创建别名表，用于后续随机生成道具
         """
-        self.itemSpawnTable = []
-        for (idx, spawnPower) in zip(range(len(self.itemDict.values())), self.itemDict.values()):
-            for i in range(spawnPower):
-                self.itemSpawnTable.append(idx)
+        self.itemClassList = [globals()[eachItemName] for eachItemName in self.itemDict]
+        self.itemSampler = AliasTable(list(self.itemDict.values()))
 
     def resetEnemyPowerByLevel(self, enemy):
         """
@@ -604,17 +881,18 @@ class Stage:
             ----------
             enemy : BaseEnemy
         """
-        enemy.atk *= (1 + 0.44)**self.level
-        enemy.defen *= (1 + 0.15)**self.level
-        enemy.hp *= (1 + 0.67)**self.level
+        balance = self.balance
+        enemy.atk *= (1 + balance.atkGrowth)**self.level
+        enemy.defen *= (1 + balance.defenGrowth)**self.level
+        enemy.hp *= (1 + balance.hpGrowth)**self.level
         # 非最终BOSS情形
         if(enemy.__class__.__name__  != "DeathStar"):    
             if(enemy.fireInterv >= 50):
-                enemy.fireInterv *= (1 - 0.1)**self.level
+                enemy.fireInterv *= (1 - balance.fireIntervDecay)**self.level
         # 最终BOSS情形
         else:
             if(enemy.fireInterv_blaster >= 50):
-                enemy.fireInterv_blaster *= (1 - 0.15)**self.level
+                enemy.fireInterv_blaster *= (1 - balance.blasterIntervDecay)**self.level
         # 所有BOSS情形
-        if(enemy.__class__.__name__  in self.bossName):    
+        if(enemy.isBoss):
             enemy.maxHp = enemy.hp
@@ -0,0 +1,130 @@
+from collections import OrderedDict
+import time
+import pygame
+
+class SurfaceCache:
+    """
+        图像缓存，按(素材路径, 拉伸比例)缓存已经读取并缩放好的图像
+        超出容量时淘汰最久未使用的图像，稳定运行时绘制不再读盘也不再缩放
+        窗口创建后读取的图像会转换为窗口的像素格式，贴图时不再逐次转换
+
+        Attributes
+        ----------
+        maxSize : int
+            最多缓存的图像数量
+        surfaces : OrderedDict
+            {(imgSrc, scale) : Surface}，按最近使用的顺序排列
+        hits : int
+            命中次数
+        misses : int
+            未命中次数
+        loadTimes : dict
+            {(imgSrc, scale) : 读取耗时}，单位：ms，包括解码、缩放和像素格式转换
+    """
+    def __init__(self, maxSize=256):
+        self.maxSize = maxSize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.loadTimes = {}
+
+    def get(self, imgSrc, scale):
+        """
+            获取缩放后的图像，未缓存时从磁盘读取
+
+            Parameters
+            ----------
+            imgSrc : string
+                素材图像名
+            scale : float / float[2]
+                素材拉伸比例，为二元组时分别表示x和y方向的比例
+
+            Returns
+            -------
+            img : Surface
+                缩放后的图像，由所有调用者共享，不可修改
+        """
+        key = (imgSrc, scale)
+        img = self.surfaces.get(key)
+        if(img is not None):
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return img
+        self.misses += 1
+        startTime = time.perf_counter()
+        img = self.load(imgSrc, scale)
+        self.loadTimes[key] = (time.perf_counter() - startTime) * 1e3
+        self.put(key, img)
+        return img
+
+    def put(self, key, img):
+        """
+            放入缓存，超出容量时淘汰最久未使用的图像
+
+            Parameters
+            ----------
+            key : (string, float)
+                (素材路径, 拉伸比例)
+            img : Surface
+                缩放后的图像
+        """
+        self.surfaces[key] = img
+        self.surfaces.move_to_end(key)
+        while(len(self.surfaces) > self.maxSize):
+            self.surfaces.popitem(last=False)
+
+    def load(self, imgSrc, scale):
+        """
+            从磁盘读取并缩放图像，再转换为窗口的像素格式
+
+            Parameters
+            ----------
+            imgSrc : string
+                素材图像名
+            scale : float / float[2]
+                素材拉伸比例
+        """
+        return SurfaceCache.convert(SurfaceCache.decode(imgSrc, scale))
+
+    @staticmethod
+    def decode(imgSrc, scale):
+        """
+            从磁盘读取并缩放图像，不涉及窗口，可以在其他线程中调用
+
+            Parameters
+            ----------
+            imgSrc : string
+                素材图像名
+            scale : float / float[2]
+                素材拉伸比例
+        """
+        img = pygame.image.load(imgSrc)
+        rect_org = img.get_rect()
+        if(isinstance(scale, tuple)):
+            size = (round(rect_org.size[0] * scale[0]), round(rect_org.size[1] * scale[1]))
+        else:
+            size = (rect_org.size[0] * scale, rect_org.size[1] * scale)
+        return pygame.transform.scale(img, size)
+
+    @staticmethod
+    def convert(img):
+        """
+            转换为窗口的像素格式，带透明通道的图像保留透明通道，窗口尚未创建时原样返回
+            需要在主线程中调用
+
+            Parameters
+            ----------
+            img : Surface
+                解码后的图像
+        """
+        if(pygame.display.get_surface() is None):
+            return img
+        if(img.get_flags() & pygame.SRCALPHA):
+            return img.convert_alpha()
+        return img.convert()
+
+    def stats(self) -> dict:
+        """
+            缓存统计信息
+        """
+        return {"size" : len(self.surfaces), "maxSize" : self.maxSize, "hits" : self.hits, "misses" : self.misses}
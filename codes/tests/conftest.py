@@ -0,0 +1,8 @@
+import os
+import sys
+
+# 素材和配置文件均按codes目录的相对路径读取，测试在codes目录下运行
+codesDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(codesDir)
+if(codesDir not in sys.path):
+    sys.path.insert(0, codesDir)
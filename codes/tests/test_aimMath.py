@@ -0,0 +1,24 @@
+import math
+import numpy as np
+from aimMath import aimDirection, aimDirections, rotationMatrix
+
+def test_batchMatchesSingle():
+    rng = np.random.default_rng(0)
+    origin = rng.uniform(0, 400, (50, 2))
+    target = (123.0, 321.0)
+    direction = aimDirections(origin, target)
+    for (eachOrigin, eachDirection) in zip(origin, direction):
+        assert np.allclose(eachDirection, aimDirection(eachOrigin, target))
+    assert np.allclose(np.hypot(direction[:, 0], direction[:, 1]), 1)
+
+def test_zeroLengthGivesZeroVector():
+    # 与目标重合的点得到零向量，不产生NaN
+    direction = aimDirections(np.array([[5.0, 5.0], [0.0, 5.0]]), (5, 5))
+    assert direction.tolist() == [[0, 0], [1, 0]]
+    assert aimDirection((5, 5), (5, 5)) == (0.0, 0.0)
+
+def test_rotationMatrix():
+    # 屏幕坐标系中角度增大为顺时针：向右旋转四分之一圈后向下
+    assert np.allclose(np.array([1.0, 0.0]) @ rotationMatrix(0.25), (0, 1))
+    assert np.allclose(rotationMatrix(1.25), rotationMatrix(0.25))
+    assert np.allclose(np.array([0.0, 300.0]) @ rotationMatrix(-1 / 8), (300 * math.sqrt(0.5), 300 * math.sqrt(0.5)))
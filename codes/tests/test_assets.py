@@ -0,0 +1,31 @@
+import pygame
+from assets import AssetLoader, assetKeyList
+from atlas import buildAtlas
+from surfaceCache import SurfaceCache
+from snapshot import itemClassList
+
+def test_preloadFillsCache():
+    # 线程池并行读取全部图像，之后绘制时缓存全部命中
+    keyList = assetKeyList(itemClassList)
+    assert len(keyList) == len(set(keyList))
+    cache = SurfaceCache(maxSize=len(keyList))
+    loader = AssetLoader(cache, maxWorkers=4, atlasPath=None)
+    loadTimes = loader.preload(keyList)
+    assert set(loadTimes) == set(keyList)
+    assert loader.atlasCount == 0
+    for eachKey in keyList:
+        assert cache.get(*eachKey).get_size() == SurfaceCache.decode(*eachKey).get_size()
+    assert cache.misses == 0
+    # 已在缓存中的图像不再读取
+    assert loader.preload(keyList) == {}
+
+def test_preloadPrefersAtlas(tmp_path):
+    keyList = [("img/oneHpEnemy.png", 5), ("img/Tie.png", 2)]
+    path = str(tmp_path / "atlas.bin")
+    buildAtlas(keyList[:1], path)
+    cache = SurfaceCache()
+    loader = AssetLoader(cache, maxWorkers=2, atlasPath=path)
+    loader.preload(keyList)
+    assert loader.atlasCount == 1
+    assert set(cache.surfaces) == set(keyList)
+    assert pygame.image.tobytes(cache.get(*keyList[0]), "RGBA") == pygame.image.tobytes(SurfaceCache.decode(*keyList[0]), "RGBA")
@@ -0,0 +1,38 @@
+import os
+import pygame
+import pytest
+from atlas import packShelves, buildAtlas, SpriteAtlas
+from surfaceCache import SurfaceCache
+
+def test_packShelvesNoOverlap():
+    sizeList = [(30, 10), (50, 40), (20, 25), (64, 8), (10, 40), (33, 33)]
+    (posList, height) = packShelves(sizeList, 64)
+    rectList = [pygame.Rect(eachPos, eachSize) for (eachPos, eachSize) in zip(posList, sizeList)]
+    for (i, eachRect) in enumerate(rectList):
+        assert eachRect.right <= 64 and eachRect.bottom <= height
+        assert eachRect.collidelist(rectList[:i]) == -1
+
+def test_atlasMatchesDecodedImages(tmp_path):
+    # 图集中取出的子图与直接读取缩放的图像逐像素相同
+    keyList = [("img/oneHpEnemy.png", 5), ("img/Tie.png", 2), ("img/ItemBasic.png", (1.5, 2))]
+    path = str(tmp_path / "atlas.bin")
+    buildAtlas(keyList, path, width=64)
+    atlas = SpriteAtlas(path)
+    try:
+        for key in keyList:
+            assert key in atlas
+            img = atlas.get(key)
+            expected = SurfaceCache.decode(*key)
+            assert img.get_size() == expected.get_size()
+            assert pygame.image.tobytes(img, "RGBA") == pygame.image.tobytes(expected, "RGBA")
+            # 取出的子图引用映射内存，关闭图集前需要释放
+            del img
+        assert ("img/Tie.png", 3) not in atlas
+    finally:
+        atlas.close()
+
+def test_rejectsOtherFiles(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"NOTATLAS" + bytes(16))
+    with pytest.raises(ValueError):
+        SpriteAtlas(str(path))
@@ -0,0 +1,20 @@
+import pytest
+from batchSim import runGame, runBatch, aggregate, parseSweep
+
+def test_parseSweep():
+    assert parseSweep(["atkGrowth=1,2", "hpGrowth=3"]) == [{"atkGrowth" : 1, "hpGrowth" : 3}, {"atkGrowth" : 2, "hpGrowth" : 3}]
+    with pytest.raises(ValueError):
+        parseSweep(["noSuchParam=1"])
+
+def test_poolMatchesSerialRuns():
+    # 进程池中的结果与逐局运行相同，按参数组合和种子的顺序排列
+    paramSetList = [{}, {"atkGrowth" : 2.0}]
+    rowList = runBatch(paramSetList, [0, 1], 0.2, processes=2)
+    assert rowList == [runGame((params, seed, 0.2, 1)) for params in paramSetList for seed in [0, 1]]
+    table = aggregate(rowList)
+    assert [line["games"] for line in table] == [2, 2]
+    assert table[1]["atkGrowth"] == 2.0
+
+def test_rejectsUnsupportedStepScale():
+    with pytest.raises(ValueError):
+        runBatch([{}], [0], 0.1, processes=1, stepScale=3)
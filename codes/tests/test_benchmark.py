@@ -0,0 +1,15 @@
+import pytest
+from stage import Stage
+from benchmark import scenarioList, runScenario
+
+@pytest.mark.parametrize("scenario", scenarioList, ids=[eachScenario.name for eachScenario in scenarioList])
+def test_scenarioRunsDeterministically(scenario):
+    # 每个场景都能跑完，各阶段都有计时，同一种子的得分和实体数量可复现
+    first = runScenario(scenario, ticks=300)
+    second = runScenario(scenario, ticks=300)
+    assert set(first["phases"]) == set(Stage.phaseList)
+    assert first["ticks"] == 300
+    assert first["score"] == second["score"]
+    assert first["entities"] == second["entities"]
+    if(scenario.bossClass is not None):
+        assert first["entities"]["maxEnemies"] >= 1
@@ -0,0 +1,22 @@
+from stage import Stage
+from enemy import Windmiller
+from bullet import PlayerBullet
+
+def test_bossKillResetsTimeAndLevel():
+    # 击败BOSS后清除BOSS记录，时间戳回到BOSS出场时，level提升并记录击杀
+    stage = Stage(0)
+    stage.timeStamp = stage.lastTimeStamp = 100e3
+    boss = Windmiller([200, 100], stage.rng)
+    stage.addEnemy(boss)
+    assert stage.boss is boss and stage.isBossOnstage()
+    assert stage.bossTS == 100e3
+    for i in range(60):
+        stage.tick(0)
+    boss.hp = 1
+    stage.bulletContainer.extend(PlayerBullet, [list(boss.pos)], (0, 0), 100)
+    stage.enemyStateUpdate()
+    assert stage.boss is None and not stage.isBossOnstage()
+    assert stage.level == 1
+    assert stage.timeStamp == 100e3
+    assert [bossName for (bossName, gameTime, fightTime) in stage.bossKillList] == ["Windmiller"]
+    assert stage.bossKillList[0][2] > 0
@@ -0,0 +1,24 @@
+import numpy as np
+from bulletPattern import Volley, Ring, Rotating
+from stage import Stage
+
+def test_emitSingleOrigin():
+    # 一个炮口时每颗子弹都从该炮口射出，速度与模式给出的一致
+    pattern = Volley([[0, 300], [-60, 300], [60, 300]])
+    (pos, velocity) = pattern.emit(None, Stage(0), [[10, 20]], 0)
+    assert pos.tolist() == [[10, 20]] * 3
+    assert velocity.tolist() == [[0, 300], [-60, 300], [60, 300]]
+
+def test_emitOrderedByOrigin():
+    # 多个炮口时按炮口依次排列，每个炮口射出全部子弹
+    pattern = Volley([[0, 300], [60, 300]])
+    (pos, velocity) = pattern.emit(None, Stage(0), [[1, 2], [3, 4]], 0)
+    assert pos.tolist() == [[1, 2], [1, 2], [3, 4], [3, 4]]
+    assert velocity.tolist() == [[0, 300], [60, 300], [0, 300], [60, 300]]
+
+def test_rotatingKeepsSpeed():
+    # 旋转只改变方向，不改变速率
+    pattern = Rotating(Ring(4, 300), 5)
+    (pos, velocity) = pattern.emit(None, Stage(0), [[0, 0]], 1234)
+    assert np.allclose(np.hypot(velocity[:, 0], velocity[:, 1]), 300)
+    assert not np.allclose(velocity, Ring(4, 300).velocity)
@@ -0,0 +1,18 @@
+import os
+from bullet import bulletTypeRegistry, PlayerBullet, NormalEnemyBullet, EnemyBlasterBullet, PlayerBlasterBullet, DeathStarBeamBullet
+
+def test_registryIndexedByTypeId():
+    assert [eachType.typeId for eachType in bulletTypeRegistry] == list(range(len(bulletTypeRegistry)))
+    for eachClass in [PlayerBullet, NormalEnemyBullet, EnemyBlasterBullet, PlayerBlasterBullet, DeathStarBeamBullet]:
+        assert bulletTypeRegistry[eachClass.typeId].bulletClass is eachClass
+
+def test_explosionSequenceShared():
+    # 同一类型的子弹共用启动时读好的爆炸动画序列，第0帧为子弹本身
+    for eachType in bulletTypeRegistry:
+        assert eachType.explosionImgSeq[0] == eachType.srcImg
+        assert len(eachType.explosionImgSeq) > 1
+        assert all(os.path.exists(eachPath) for eachPath in eachType.explosionImgSeq)
+    first = PlayerBullet([0, 0], [0, -600])
+    second = PlayerBullet([10, 0], [0, -600])
+    assert first.explosionImgSeq is second.explosionImgSeq
+    assert first.bulletOwner == 'P' and NormalEnemyBullet([0, 0], [0, 300]).bulletOwner == 'E'
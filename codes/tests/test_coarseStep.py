@@ -0,0 +1,58 @@
+import random
+import pytest
+from stage import Stage, PlayerInput
+from item import EnhanceAtkItem
+from headless import AutoPilot, STEP_SCALE_CHOICES
+
+def createEmptyStage(stepScale, seed=0) -> Stage:
+    """
+        不会刷出敌人的场景，时间步长放大stepScale倍
+    """
+    stage = Stage(seed)
+    stage.frameInterv = Stage.baseFrameInterv * stepScale
+    stage.spawnScheduler.ruleList = []
+    stage.spawnScheduler.queue = []
+    return stage
+
+@pytest.mark.parametrize("stepScale", STEP_SCALE_CHOICES)
+def test_playerNotHitWithoutEnemies(stepScale):
+    # 一边开火一边上下往返，玩家不会被自己的子弹命中
+    stage = createEmptyStage(stepScale)
+    for i in range(2400 // stepScale):
+        direction = PlayerInput.UP if (i * stepScale // 60) % 2 == 0 else PlayerInput.DOWN
+        stage.tick(direction | PlayerInput.FIRE)
+        assert len(stage.enemyContainer) == 0
+    assert stage.player.hp == stage.player.hpMax
+    assert not stage.isGameOver
+
+def countPickups(stepScale, dropList) -> int:
+    """
+        AutoPilot左右往返时，在各处放下一个下落最快的道具，统计捡到的个数
+
+        Parameters
+        ----------
+        stepScale : int
+            时间步长放大的倍数
+        dropList : (float, float, int)[]
+            (x, y, 放下道具前经过的60Hz帧数)
+    """
+    count = 0
+    for (x, y, frames) in dropList:
+        stage = createEmptyStage(stepScale)
+        pilot = AutoPilot()
+        for i in range(frames // stepScale):
+            stage.tick(pilot(stage))
+        stage.itemContainer.append(EnhanceAtkItem([x, y]))
+        for i in range(240 // stepScale):
+            stage.tick(pilot(stage))
+        count += stage.itemPickupCount.get("EnhanceAtkItem", 0)
+    return count
+
+def test_itemPickupMatchesBaseStep():
+    # 放大时间步长后道具不会从玩家身边穿过去，捡到的个数与逐帧推进基本一致
+    rng = random.Random(1)
+    dropList = [(rng.uniform(20, 380), rng.uniform(0, 300), rng.randrange(0, 15) * 8) for i in range(60)]
+    baseCount = countPickups(1, dropList)
+    assert baseCount > 10
+    for stepScale in STEP_SCALE_CHOICES[1:]:
+        assert abs(countPickups(stepScale, dropList) - baseCount) <= 2
@@ -0,0 +1,51 @@
+import numpy as np
+from collision import segmentsHitBox, segmentHitsBox
+from stage import Stage
+from bullet import PlayerBullet
+from enemy import OneHpEnemy
+
+def test_segmentCases():
+    box = (0, 0, 10, 10)
+    # 穿过、擦过角点、点在内部、点在边界上
+    assert segmentHitsBox((-5, 5), (15, 5), *box)
+    assert segmentHitsBox((-5, 15), (15, -5), *box)
+    assert segmentHitsBox((-1, 9), (1, 11), *box)
+    assert segmentHitsBox((3, 3), (3, 3), *box)
+    assert segmentHitsBox((10, 10), (10, 10), *box)
+    # 外接矩形相交但线段从角外掠过、在矩形之外停下、远离矩形
+    assert not segmentHitsBox((-5, 8), (8, 21), *box)
+    assert not segmentHitsBox((-20, 5), (-1, 5), *box)
+    assert not segmentHitsBox((20, 20), (30, 40), *box)
+
+def test_batchMatchesSampling():
+    # 整批判定与沿线段密集采样的结果一致（采样只会漏判，不会误判）
+    rng = np.random.default_rng(0)
+    start = rng.uniform(-20, 30, (2000, 2))
+    end = rng.uniform(-20, 30, (2000, 2))
+    isHit = segmentsHitBox(start, end, 0, 0, 10, 10)
+    t = np.linspace(0, 1, 2001)[:, None, None]
+    samples = start + (end - start) * t
+    isSampledHit = ((samples >= 0) & (samples <= 10)).all(axis=2).any(axis=0)
+    assert (isHit | ~isSampledHit).all()
+    assert (isHit == isSampledHit).mean() > 0.99
+
+def test_perSegmentBoxes():
+    start = np.array([[0.0, 0.0], [0.0, 0.0]])
+    end = np.array([[20.0, 20.0], [20.0, 20.0]])
+    isHit = segmentsHitBox(start, end, np.array([5, 30]), np.array([5, 30]), np.array([6, 40]), np.array([6, 40]))
+    assert isHit.tolist() == [True, False]
+
+def test_fastBulletHitsThinEnemyAtCoarseStep():
+    # 步长放大8倍时子弹一步移动80像素，仍然命中较薄的敌人
+    stage = Stage(0)
+    stage.frameInterv = Stage.baseFrameInterv * 8
+    stage.spawnScheduler.ruleList = []
+    stage.spawnScheduler.queue = []
+    enemy = OneHpEnemy([200.0, 300.0])
+    enemy.velocity = [0, 0]
+    stage.enemyContainer.append(enemy)
+    stage.bulletContainer.extend(PlayerBullet, [[200.0, 345.0]], (0, -600), 100)
+    stage.updateFire()
+    assert stage.bulletContainer.pos[0, 1] < 300 - enemy.crashBox[1]
+    stage.enemyStateUpdate()
+    assert len(stage.enemyContainer) == 0
@@ -0,0 +1,80 @@
+import numpy as np
+from bullet import BulletPool, PlayerBullet, NormalEnemyBullet
+from container import EntityContainer, KinematicContainer
+from enemy import OneHpEnemy
+from item import RecoverItem
+
+SCREEN_SIZE = (400, 400)
+
+def test_bulletHandlesAfterCompaction():
+    # 删除后紧凑排列保持原有顺序，句柄不变，删除过的句柄不能再取到
+    pool = BulletPool(capacity=4)
+    handleList = pool.extend(NormalEnemyBullet, [[x, 100.0] for x in range(10)], (0, 0), 1).tolist()
+    assert handleList == list(range(10))
+    assert pool.remove(handleList[3])
+    assert not pool.remove(handleList[3])
+    assert pool.remove(handleList[7])
+    assert len(pool) == 8
+    pool.update(SCREEN_SIZE, 1 / 60, False)
+    assert pool.size == 8
+    assert pool.handle[:pool.size].tolist() == [0, 1, 2, 4, 5, 6, 8, 9]
+    assert pool.pos[:pool.size, 0].tolist() == [0, 1, 2, 4, 5, 6, 8, 9]
+    assert pool.get(handleList[3]) is None
+    assert pool.get(handleList[8]).pos[0] == 8
+    # 新的子弹不会复用旧句柄
+    assert pool.append(PlayerBullet([1, 1], [0, -600])) == 10
+
+def test_bulletLeavesScreen():
+    pool = BulletPool()
+    pool.extend(NormalEnemyBullet, [[10, 395], [10, 200], [10, 5]], [[0, 600], [0, 600], [0, -600]], 1)
+    pool.update(SCREEN_SIZE, 1 / 60, False)
+    assert pool.handle[:pool.size].tolist() == [1]
+
+def test_explosionFinishes():
+    # 命中后停止移动，爆炸动画播放完毕后被删除
+    pool = BulletPool()
+    pool.extend(NormalEnemyBullet, [[100, 100], [200, 100]], (0, 300), 1)
+    pool.explode(0)
+    frameCount = int(pool.typeSeqLen[NormalEnemyBullet.typeId])
+    for frame in range(2, frameCount):
+        pool.update(SCREEN_SIZE, 1 / 60, False)
+        assert pool.explosionFrame[0] == frame
+        assert pool.pos[0].tolist() == [100, 100]
+    pool.update(SCREEN_SIZE, 1 / 60, False)
+    assert pool.handle[:pool.size].tolist() == [1]
+    assert pool.explosionFrame[0] == 0
+
+def test_entityContainerHandles():
+    container = EntityContainer()
+    itemList = [RecoverItem([x, 0]) for x in range(5)]
+    for eachItem in itemList:
+        container.append(eachItem)
+    assert container.remove(itemList[1].handle)
+    assert not container.remove(itemList[1].handle)
+    # 遍历中加入的实体也会被遍历到，已删除的实体被跳过
+    visited = []
+    for eachItem in container:
+        visited.append(eachItem)
+        if(eachItem is itemList[4]):
+            container.append(RecoverItem([9, 0]))
+    assert [eachItem.pos[0] for eachItem in visited] == [0, 2, 3, 4, 9]
+    container.compact()
+    assert [eachItem.pos[0] for eachItem in container.entities] == [0, 2, 3, 4, 9]
+    assert container.get(itemList[1].handle) is None
+    assert container.get(itemList[3].handle) is itemList[3]
+    assert len(container) == 5
+
+def test_kinematicRowsFollowCompaction():
+    # 紧凑排列后实体的位置视图仍指向自己的行，被移除的实体取回自己的位置
+    container = KinematicContainer(capacity=2)
+    enemyList = [OneHpEnemy([x * 10.0, 0]) for x in range(5)]
+    for eachEnemy in enemyList:
+        container.append(eachEnemy)
+    container.remove(enemyList[0].handle)
+    container.compact()
+    assert [eachEnemy.row for eachEnemy in container.entities] == [0, 1, 2, 3]
+    enemyList[2].pos[0] = 123
+    assert container.pos[1, 0] == 123
+    assert enemyList[0].container is None
+    assert list(enemyList[0].pos) == [0, 0]
+    assert np.array_equal(container.pos[:4, 0], [10, 123, 30, 40])
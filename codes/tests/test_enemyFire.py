@@ -0,0 +1,20 @@
+import random
+import pytest
+from stage import Stage
+from enemy import enemyClassDict
+from bullet import BulletPool
+
+@pytest.mark.parametrize("className", list(enemyClassDict))
+def test_fireOncePerInterval(className):
+    # 每类敌人按自己的发射方式开火：只发射敌人子弹，间隔不够时不再发射
+    stage = Stage(0)
+    stage.timeStamp = stage.lastTimeStamp = 60e3
+    enemy = enemyClassDict[className]([200, 100], random.Random(0))
+    stage.addEnemy(enemy)
+    stage.enemyFire()
+    n = len(stage.bulletContainer)
+    assert n > 0
+    assert (stage.bulletContainer.owner[:n] == BulletPool.ownerName.index('E')).all()
+    assert (stage.bulletContainer.atk[:n] == enemy.atk).all()
+    stage.enemyFire()
+    assert len(stage.bulletContainer) == n
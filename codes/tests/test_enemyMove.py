@@ -0,0 +1,34 @@
+import random
+import numpy as np
+from stage import Stage
+from container import KinematicContainer
+from enemy import OneHpEnemy, DoubleWarrior, TripleShooter
+
+def test_batchedMoveMatchesPerObject():
+    # 容器整块完成的直线运动和横向反弹，与逐个调用updateMove的结果相同
+    stage = Stage(0)
+    rng = random.Random(1)
+    container = KinematicContainer(capacity=4)
+    referenceList = []
+    initialVxList = []
+    for i in range(12):
+        enemyClass = [OneHpEnemy, DoubleWarrior, TripleShooter][i % 3]
+        pos = [rng.uniform(0, stage.screenSize[0]), rng.uniform(-50, 100)]
+        velocity = [rng.uniform(-400, 400), rng.uniform(0, 200)]
+        initialVxList.append(velocity[0])
+        for target in (None, referenceList):
+            enemy = enemyClass(list(pos), random.Random(0))
+            enemy.velocity = list(velocity)
+            if(target is None):
+                container.append(enemy)
+            else:
+                target.append(enemy)
+    dt = Stage.baseFrameInterv / 1e3
+    for step in range(300):
+        container.moveLinear(0, len(container.entities), stage.screenSize, dt)
+        for eachEnemy in referenceList:
+            eachEnemy.updateMove(stage, dt)
+    assert np.allclose(container.pos[:12], [eachEnemy.pos for eachEnemy in referenceList])
+    assert np.allclose(container.velocity[:12], [eachEnemy.velocity for eachEnemy in referenceList])
+    # 确实发生过反弹
+    assert (container.velocity[:12, 0] * initialVxList < 0).any()
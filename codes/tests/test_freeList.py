@@ -0,0 +1,34 @@
+from freeList import FreeList
+from container import EntityContainer
+from item import RecoverItem, EnhanceAtkItem
+
+def test_reuseReinitializes():
+    # 回收的实体按类型重新利用，并按新的参数重新初始化
+    freeList = FreeList()
+    item = freeList.acquire(RecoverItem, [10, 20])
+    item.pos[0] = 99
+    item.handle = 7
+    freeList.release(item)
+    assert freeList.acquire(EnhanceAtkItem, [0, 0]) is not item
+    reused = freeList.acquire(RecoverItem, [30, 40])
+    assert reused is item
+    assert list(reused.pos) == [30, 40]
+    assert (freeList.created, freeList.reused) == (2, 1)
+
+def test_maxSize():
+    freeList = FreeList(maxSize=2)
+    for i in range(5):
+        freeList.release(RecoverItem([0, 0]))
+    assert len(freeList.freeLists[RecoverItem]) == 2
+
+def test_containerRecyclesOnCompact():
+    # 容器紧凑排列时才回收被删除的实体，遍历中删除的实体不会被提前复用
+    freeList = FreeList()
+    container = EntityContainer(freeList)
+    itemList = [freeList.acquire(RecoverItem, [x, 0]) for x in range(3)]
+    for eachItem in itemList:
+        container.append(eachItem)
+    container.remove(itemList[1].handle)
+    assert freeList.acquire(RecoverItem, [5, 5]) not in itemList
+    container.compact()
+    assert freeList.acquire(RecoverItem, [6, 6]) is itemList[1]
@@ -0,0 +1,33 @@
+import pygame
+import pytest
+from hud import Hud
+from player import Player
+from surfaceCache import SurfaceCache
+
+@pytest.fixture
+def hud():
+    pygame.font.init()
+    return Hud((400, 600), 60, SurfaceCache())
+
+def test_playerPanelRedrawnOnlyOnChange(hud, monkeypatch):
+    # 血量和显示选项不变时直接返回缓存的面板，不再绘制
+    player = Player([200, 570])
+    drawCount = []
+    renderHpText = hud.renderHpText
+    monkeypatch.setattr(hud, "renderHpText", lambda hp, hpMax: drawCount.append(hp) or renderHpText(hp, hpMax))
+    first = hud.getPlayerPanel(player, True)
+    before = pygame.image.tobytes(first, "RGB")
+    assert hud.getPlayerPanel(player, True) is first
+    assert len(drawCount) == 1
+    player.hp = player.hpMax / 2
+    after = pygame.image.tobytes(hud.getPlayerPanel(player, True), "RGB")
+    assert len(drawCount) == 2
+    assert after != before
+    hud.getPlayerPanel(player, False)
+    assert len(drawCount) == 2
+    assert hud.playerPanelKey == (player.hp, player.hpMax, False)
+
+def test_hpTextFormat(hud):
+    # 数值过大时用科学计数法，文字宽度不会超出面板
+    assert hud.renderHpText(1e12, 1e12).get_width() < 400
+    assert hud.renderHpText(50, 100).get_width() < hud.renderHpText(1e12, 1e12).get_width()
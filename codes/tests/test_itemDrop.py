@@ -0,0 +1,46 @@
+import random
+import numpy as np
+import pytest
+from aliasTable import AliasTable
+from stage import Stage
+
+def test_aliasTableFrequency():
+    # 抽取频率与权重成正比，权重为0的下标不会被抽到
+    weights = [5, 0, 1, 2, 12]
+    table = AliasTable(weights)
+    rng = random.Random(0)
+    countList = np.bincount([table.sample(rng) for i in range(40000)], minlength=len(weights))
+    assert countList[1] == 0
+    assert np.allclose(countList / 40000, np.array(weights) / sum(weights), atol=0.01)
+
+def test_aliasTableSingleWeight():
+    table = AliasTable([3])
+    assert len(table) == 1
+    assert table.sample(random.Random(0)) == 0
+
+def test_aliasTableRejectsEmpty():
+    with pytest.raises(ValueError):
+        AliasTable([0, 0])
+
+@pytest.mark.parametrize("count", [1, Stage.scatterBatchLimit])
+def test_scatterPosDistribution(count):
+    # 逐个生成和整批生成的散开位置都以爆点为中心，标准差与std一致
+    stage = Stage(0)
+    posList = []
+    for i in range(8000 // count):
+        posList += stage.getScatterPosList(count, (200, 100), (17, 10))
+    pos = np.array(posList)
+    assert pos.shape == (8000 // count * count, 2)
+    assert np.allclose(pos.mean(axis=0), (200, 100), atol=1)
+    assert np.allclose(pos.std(axis=0), (17, 10), rtol=0.05)
+
+def test_spawnItemsDeterministic():
+    # 相同种子掉落的道具种类和位置完全相同
+    result = []
+    for i in range(2):
+        stage = Stage(7)
+        stage.spawnItems(20, 1, (150, -150))
+        stage.spawnItems(3, 0.5, (80, 60))
+        result.append([(eachItem.__class__.__name__, list(eachItem.pos)) for eachItem in stage.itemContainer])
+    assert result[0] == result[1]
+    assert len(result[0]) >= 20
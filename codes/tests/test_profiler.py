@@ -0,0 +1,22 @@
+import pytest
+from profiler import FrameProfiler
+
+def test_ringBufferSummary(monkeypatch):
+    # 环形缓冲区只保留最近capacity帧，各阶段耗时按lap之间的时间计入
+    clock = iter(range(0, 10000))
+    monkeypatch.setattr("profiler.time.perf_counter", lambda: next(clock) * 1e-3)
+    profiler = FrameProfiler(["a", "b"], capacity=4)
+    assert profiler.summary()["frames"] == 0
+    for frame in range(6):
+        profiler.startFrame()
+        profiler.lap("a")
+        profiler.lap("b")
+        profiler.lap("b")
+        profiler.endFrame(frame, 1, 0)
+    result = profiler.summary()
+    assert result["frames"] == 4
+    assert result["phases"]["a"] == pytest.approx({"p50" : 1.0, "p99" : 1.0})
+    assert result["phases"]["b"] == pytest.approx({"p50" : 2.0, "p99" : 2.0})
+    assert result["frame"]["p50"] == pytest.approx(3.0)
+    assert result["counts"]["bullets"] == {"last" : 5, "max" : 5}
+    assert sorted(profiler.counts[:, 0].tolist()) == [2, 3, 4, 5]
@@ -0,0 +1,41 @@
+import random
+import pytest
+from stage import Stage, PlayerInput
+from replay import ReplayRecorder, ReplayPlayer
+from snapshot import dumpSnapshot
+
+@pytest.mark.parametrize("stepScale", [1, 4])
+def test_replayReproducesGame(tmp_path, stepScale):
+    # 按录制的种子、帧间隔和按键重放，结束时的场景与录制时完全相同
+    path = str(tmp_path / "game.rep")
+    stage = Stage(11)
+    stage.frameInterv = Stage.baseFrameInterv * stepScale
+    recorder = ReplayRecorder(path, stage)
+    inputRng = random.Random(5)
+    for i in range(3600 // stepScale):
+        playerInput = PlayerInput.FIRE | inputRng.choice([0, PlayerInput.LEFT, PlayerInput.RIGHT, PlayerInput.UP, PlayerInput.DOWN])
+        recorder.record(playerInput)
+        stage.tick(playerInput)
+    recorder.close()
+    player = ReplayPlayer(path)
+    assert len(player) == 3600 // stepScale
+    result = player.run()
+    assert result["stage"].score == stage.score
+    assert dumpSnapshot(result["stage"]) == dumpSnapshot(stage)
+
+def test_sameSeedSameGame():
+    # 同一种子、同样的按键，两局完全相同；种子不同则出场不同
+    dumpList = []
+    for seed in (3, 3, 4):
+        stage = Stage(seed)
+        for i in range(1800):
+            stage.tick(PlayerInput.FIRE | (PlayerInput.LEFT if (i // 120) % 2 == 0 else PlayerInput.RIGHT))
+        dumpList.append(dumpSnapshot(stage))
+    assert dumpList[0] == dumpList[1]
+    assert dumpList[0] != dumpList[2]
+
+def test_rejectsOtherFiles(tmp_path):
+    path = tmp_path / "other.rep"
+    path.write_bytes(b"RIFF" + bytes(32))
+    with pytest.raises(ValueError):
+        ReplayPlayer(str(path))
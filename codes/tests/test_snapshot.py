@@ -0,0 +1,35 @@
+import pytest
+from stage import Stage
+from headless import AutoPilot
+from benchmark import scenarioList
+from snapshot import dumpSnapshot, loadSnapshot, SNAPSHOT_MAGIC
+
+def runTicks(stage, ticks):
+    pilot = AutoPilot()
+    for i in range(ticks):
+        stage.tick(pilot(stage))
+
+@pytest.mark.parametrize("scenarioName", ["starDestroyerTies", "deathStarFight"])
+@pytest.mark.parametrize("stepScale", [1, 4])
+def test_roundTripContinuesIdentically(scenarioName, stepScale):
+    # 读档后继续模拟，与不读档一直模拟的场景状态完全相同
+    scenario = [eachScenario for eachScenario in scenarioList if eachScenario.name == scenarioName][0]
+    stage = scenario.createStage(0)
+    stage.frameInterv = Stage.baseFrameInterv * stepScale
+    runTicks(stage, 600 // stepScale)
+    data = dumpSnapshot(stage)
+    restored = loadSnapshot(data)
+    assert restored.frameInterv == stage.frameInterv
+    assert dumpSnapshot(restored) == data
+    runTicks(stage, 600 // stepScale)
+    runTicks(restored, 600 // stepScale)
+    assert dumpSnapshot(restored) == dumpSnapshot(stage)
+    assert restored.score == stage.score
+
+def test_rejectsOtherData():
+    with pytest.raises(ValueError):
+        loadSnapshot(b"")
+    with pytest.raises(ValueError):
+        loadSnapshot(b"RIFF" + bytes(64))
+    with pytest.raises(ValueError):
+        loadSnapshot(SNAPSHOT_MAGIC + b"\xff\xff")
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from spatialHash import SpatialHash
+from stage import Stage
+from bullet import PlayerBullet, NormalEnemyBullet
+
+def test_queryFindsEveryBulletInBox():
+    # 粗筛结果包含矩形内的全部子弹，按升序排列
+    rng = np.random.default_rng(0)
+    pos = rng.uniform(-50, 500, (400, 2))
+    index = SpatialHash((400, 400), 40)
+    index.build(pos, 3)
+    assert index.version == 3
+    for (xMin, yMin, xMax, yMax) in [(0, 0, 10, 10), (35, 35, 125, 90), (-30, 380, 10, 520), (150, 150, 150, 150)]:
+        idx = index.query(xMin, yMin, xMax, yMax)
+        assert (np.diff(idx) > 0).all()
+        inBox = np.flatnonzero((pos[:, 0] >= xMin) & (pos[:, 0] <= xMax) & (pos[:, 1] >= yMin) & (pos[:, 1] <= yMax))
+        assert set(inBox.tolist()) <= set(idx.tolist())
+
+def test_outsidePointsGoToEdgeCells():
+    index = SpatialHash((400, 400), 40)
+    index.build(np.array([[-100.0, -100.0], [1000.0, 1000.0]]))
+    assert index.query(0, 0, 1, 1).tolist() == [0]
+    assert index.query(399, 399, 399, 399).tolist() == [1]
+
+def test_emptyQuery():
+    index = SpatialHash((400, 400), 40)
+    index.build(np.zeros((0, 2)))
+    assert len(index.query(0, 0, 400, 400)) == 0
+
+def createStageWithBullets(seed):
+    stage = Stage(seed)
+    rng = np.random.default_rng(seed)
+    stage.bulletContainer.extend(PlayerBullet, rng.uniform(0, stage.screenSize, (300, 2)), (0, -600), 1)
+    stage.bulletContainer.extend(NormalEnemyBullet, rng.uniform(0, stage.screenSize, (300, 2)), (0, 300), 1)
+    return stage
+
+@pytest.mark.parametrize("owner", ["P", "E", None])
+def test_hashMatchesDenseTest(owner, monkeypatch):
+    # 子弹很多时经空间索引粗筛、整块判定和逐个比较所有组合的结果相同
+    stage = createStageWithBullets(1)
+    center = np.random.default_rng(2).uniform(0, stage.screenSize, (12, 2))
+    boxes = np.concatenate((center - 30, center + 30), axis=1)
+    steps = np.zeros((12, 2))
+    monkeypatch.setattr(Stage, "denseCrashLimit", 1 << 30)
+    dense = stage.getCrashBulletPairs(boxes, steps, owner)
+    monkeypatch.setattr(Stage, "denseCrashLimit", 0)
+    hashed = stage.getCrashBulletPairs(boxes, steps, owner)
+    monkeypatch.setattr(Stage, "denseCrashLimit", 1 << 30)
+    monkeypatch.setattr(Stage, "scalarCrashLimit", 1 << 30)
+    scalar = stage.getCrashBulletPairs(boxes, steps, owner)
+    assert len(dense[0]) > 0
+    for result in (hashed, scalar):
+        assert dense[0].tolist() == result[0].tolist()
+        assert dense[1].tolist() == result[1].tolist()
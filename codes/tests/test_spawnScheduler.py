@@ -0,0 +1,66 @@
+import json
+import os
+import random
+from spawnScheduler import SpawnScheduler
+from enemy import enemyClassDict
+
+def writeConfig(path, enemyList):
+    with open(path, "w") as configFile:
+        json.dump({"enemies" : enemyList}, configFile)
+
+def createScheduler(tmp_path, enemyList, timeStamp=0):
+    path = str(tmp_path / "enemySpanConfig.json")
+    writeConfig(path, enemyList)
+    return SpawnScheduler(path, enemyClassDict, timeStamp, random.Random(0))
+
+def collectSpawns(scheduler, start, end, frameInterv=1e3 / 60):
+    """
+        逐帧推进，记录每次出场的(帧末时间戳, 类名)
+    """
+    spawnList = []
+    timeStamp = start
+    while(timeStamp < end):
+        lastTimeStamp = timeStamp
+        timeStamp += frameInterv
+        spawnList += [(timeStamp, eachRule.className) for eachRule in scheduler.popDue(lastTimeStamp, timeStamp)]
+    return spawnList
+
+def test_periodicAndFixedTimes(tmp_path):
+    scheduler = createScheduler(tmp_path, [
+        {"className" : "OneHpEnemy", "appearBy" : "time", "appearMode" : "random", "mu" : 2e3, "std" : 0},
+        {"className" : "Windmiller", "appearBy" : "immediately", "appearMode" : "fix", "spawnAt" : [5e3], "posX" : 200, "posY" : 0},
+    ])
+    spawnList = collectSpawns(scheduler, 0, 9e3)
+    assert [name for (t, name) in spawnList] == ["OneHpEnemy", "OneHpEnemy", "Windmiller", "OneHpEnemy", "OneHpEnemy"]
+    # 出场发生在跨过出场时间的那一帧
+    for (t, name) in spawnList:
+        spawnTime = 5e3 if name == "Windmiller" else round(t / 2e3) * 2e3
+        assert spawnTime <= t < spawnTime + 1e3 / 60
+
+def test_rescheduleAfterTimeRollback(tmp_path):
+    # BOSS死亡时时间戳回退，回退后的出场与第一次经过这段时间时相同
+    scheduler = createScheduler(tmp_path, [
+        {"className" : "OneHpEnemy", "appearBy" : "time", "appearMode" : "random", "mu" : 2e3, "std" : 0},
+        {"className" : "Windmiller", "appearBy" : "immediately", "appearMode" : "fix", "spawnAt" : [5e3], "posX" : 200, "posY" : 0},
+    ])
+    first = collectSpawns(scheduler, 0, 9e3)
+    scheduler.reschedule(0)
+    assert collectSpawns(scheduler, 0, 9e3) == first
+
+def test_sameFrameOrderedByRule(tmp_path):
+    scheduler = createScheduler(tmp_path, [
+        {"className" : "Tracker", "appearBy" : "immediately", "appearMode" : "random", "spawnAt" : [1e3]},
+        {"className" : "Sticker", "appearBy" : "immediately", "appearMode" : "random", "spawnAt" : [1e3]},
+    ])
+    assert [eachRule.className for eachRule in scheduler.popDue(990, 1010)] == ["Tracker", "Sticker"]
+
+def test_reloadAfterConfigChange(tmp_path):
+    scheduler = createScheduler(tmp_path, [{"className" : "OneHpEnemy", "appearBy" : "time", "appearMode" : "random", "mu" : 2e3, "std" : 0}])
+    assert not scheduler.checkReload(0)
+    writeConfig(scheduler.configPath, [{"className" : "Tie", "appearBy" : "time", "appearMode" : "random", "mu" : 1e3, "std" : 0}])
+    os.utime(scheduler.configPath, (scheduler.configMTime + 10, scheduler.configMTime + 10))
+    # 两次检查之间不读取文件
+    assert not scheduler.checkReload(500)
+    assert scheduler.checkReload(1500)
+    assert [eachRule.className for eachRule in scheduler.ruleList] == ["Tie"]
+    assert set(name for (t, name) in collectSpawns(scheduler, 1500, 6e3)) == {"Tie"}
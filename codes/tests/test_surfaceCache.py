@@ -0,0 +1,17 @@
+from surfaceCache import SurfaceCache
+
+def test_cacheHitAndLeastRecentlyUsed():
+    # 同一(素材, 比例)只读取一次，超出容量时淘汰最久未使用的图像
+    cache = SurfaceCache(maxSize=2)
+    first = cache.get("img/oneHpEnemy.png", 5)
+    assert cache.get("img/oneHpEnemy.png", 5) is first
+    cache.get("img/oneHpEnemy.png", 2)
+    cache.get("img/oneHpEnemy.png", 5)
+    cache.get("img/oneHpEnemy.png", 3)
+    assert set(cache.surfaces) == {("img/oneHpEnemy.png", 5), ("img/oneHpEnemy.png", 3)}
+    assert cache.stats() == {"size" : 2, "maxSize" : 2, "hits" : 2, "misses" : 3}
+
+def test_decodeScale():
+    (w, h) = SurfaceCache.decode("img/oneHpEnemy.png", 1).get_size()
+    assert SurfaceCache.decode("img/oneHpEnemy.png", 3).get_size() == (3 * w, 3 * h)
+    assert SurfaceCache.decode("img/oneHpEnemy.png", (2, 0.5)).get_size() == (2 * w, round(0.5 * h))
@@ -0,0 +1,32 @@
+import numpy as np
+from stage import Stage
+from bullet import NormalEnemyBullet
+from enemy import OneHpEnemy
+from item import RecoverItem
+
+def createStage(stepScale):
+    stage = Stage(0)
+    stage.frameInterv = Stage.baseFrameInterv * stepScale
+    stage.spawnScheduler.ruleList = []
+    stage.spawnScheduler.queue = []
+    return stage
+
+def test_motionFollowsGameTime():
+    # 运动按时间步长计算：同样经过1秒游戏时间，无论每帧多长，子弹、敌人和道具移动的距离都相同
+    posList = []
+    for stepScale in (1, 2, 4):
+        stage = createStage(stepScale)
+        stage.bulletContainer.extend(NormalEnemyBullet, [[100.0, 0.0]], (30, 300), 1)
+        enemy = OneHpEnemy([300.0, 0.0])
+        enemy.fireInterv = 1e9
+        stage.addEnemy(enemy)
+        item = RecoverItem([200.0, 0.0])
+        stage.itemContainer.append(item)
+        for i in range(60 // stepScale):
+            stage.tick(0)
+        assert abs(stage.timeStamp - 1e3) < 1e-6
+        posList.append(np.concatenate([stage.bulletContainer.pos[0], enemy.pos, item.pos]))
+    assert np.allclose(posList[0][:2], (130, 300))
+    assert np.allclose(posList[0][2:4], (300, 180))
+    for pos in posList[1:]:
+        assert np.allclose(pos, posList[0])